@@ -6,7 +6,12 @@ from config import (
     APP_TITLE,
     APP_TAGLINE,
     SESSION_DF_KEY,
+    PERF_VIEW_QUERY_PARAM,
+    ENABLE_PRECOMPUTE_WORKER,
 )
+from engine.precompute import artifact_status, start_worker
+from utils.dataset_cache import dataset_fingerprint
+from utils.frame_compaction import compaction_stats, frame_memory
 
 # -------------------------------------------------
 # PAGE CONFIG (DS GROUP BRANDING)
@@ -22,6 +27,9 @@ st.set_page_config(
 # -------------------------------------------------
 df = st.session_state.get(SESSION_DF_KEY)
 
+if ENABLE_PRECOMPUTE_WORKER:
+    start_worker()
+
 # -------------------------------------------------
 # SIDEBAR (ENTERPRISE NAV)
 # -------------------------------------------------
@@ -46,6 +54,34 @@ with st.sidebar:
             **Metrics:** `{df.shape[1]}`
             """
         )
+
+        memory = compaction_stats(df)
+        if memory:
+            st.caption(
+                f"🗜 Memory: {memory['before'] / 1e6:,.1f} MB → {memory['after'] / 1e6:,.1f} MB "
+                f"({1 - memory['after'] / max(memory['before'], 1):.0%} saved)"
+            )
+        else:
+            st.caption(f"🗜 Memory: {frame_memory(df) / 1e6:,.1f} MB")
+
+        if ENABLE_PRECOMPUTE_WORKER:
+            status = artifact_status(dataset_fingerprint(df))
+
+            if status["state"] == "ready":
+                st.caption(
+                    f"⚡ Precomputed • {status['materialized_at']:%d %b %H:%M} UTC "
+                    f"({status['age_hours']:.1f}h old)"
+                )
+            elif status["state"] == "partial":
+                st.caption("🟡 New orders merged – remaining reports refreshing")
+            elif status["state"] == "running":
+                st.caption("⏳ Precompute running – pages compute on demand")
+            elif status["state"] == "stale":
+                st.caption("🟠 Precomputed artifacts are stale – refresh queued")
+            elif status["state"] == "failed":
+                st.caption("🔴 Precompute failed – pages compute on demand")
+            else:
+                st.caption("⚪ Not precomputed – pages compute on demand")
     else:
         st.warning("⚠ No Active Dataset")
 
@@ -57,6 +93,15 @@ with st.sidebar:
 
     st.caption("© DS Group | Confidential")
 
+# -------------------------------------------------
+# HIDDEN PERFORMANCE VIEW (?view=performance)
+# -------------------------------------------------
+if st.query_params.get("view") == PERF_VIEW_QUERY_PARAM:
+    from utils.performance_view import render_performance_view
+
+    render_performance_view()
+    st.stop()
+
 # -------------------------------------------------
 # HEADER (EXECUTIVE HERO)
 # -------------------------------------------------
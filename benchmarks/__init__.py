@@ -0,0 +1,4 @@
+"""
+Headless benchmark harness for the FMCG Executive Intelligence Platform.
+Synthetic data generation + timing of shared utility hot paths.
+"""
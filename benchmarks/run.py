@@ -0,0 +1,336 @@
+# benchmarks/run.py
+# -------------------------------------------------
+# Headless Hot-Path Benchmark Suite
+# -------------------------------------------------
+#
+# Usage:
+#   python -m benchmarks.run --scales 1M,10M --output benchmarks/results/baseline.json
+#   python -m benchmarks.run --scales 1M --compare benchmarks/results/baseline.json
+#
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_CLUSTERS, DEFAULT_DATE_FORMAT, DEFAULT_FORECAST_MONTHS
+from core.metric_engine import compute_metrics
+from utils import charts, visualizations
+from utils.churn_analysis import churn_risk
+from utils.column_detector import auto_detect_columns, clear_schema_cache
+from utils.dataset_cache import clear_memos
+from utils.forecasting import PROPHET_AVAILABLE, forecast_sales, prepare_time_series
+from utils.safe_dataframe import prepare_daily_sales_df
+from utils.segmentation import prepare_outlet_features, segment_outlets
+
+from benchmarks.synthetic_data import DEFAULT_SEED, generate_orders, parse_scale
+
+DEFAULT_SCALES = "1M"
+REGRESSION_THRESHOLD = 1.20
+
+METRIC_INTENTS = [
+    "TOTAL_SALES", "TOTAL_ORDERS", "PERFORMANCE", "SKU_ANALYSIS",
+    "OUTLET_ANALYSIS", "DISCOUNT_ANALYSIS", "REJECTION_ANALYSIS",
+    "FIELD_FORCE", "RISK_ANALYSIS",
+]
+
+
+# -------------------------------------------------
+# Benchmark Cases
+# -------------------------------------------------
+# Each case receives the shared context and returns a zero-argument
+# callable. Setup work (inputs the page would already have) happens
+# outside the measured call.
+# -------------------------------------------------
+def _parsed(ctx):
+    if "parsed" not in ctx:
+        parsed = ctx["df"].copy()
+        parsed["ORDER_DATE"] = pd.to_datetime(
+            parsed["ORDER_DATE"], format=DEFAULT_DATE_FORMAT, errors="coerce"
+        )
+        ctx["parsed"] = parsed
+    return ctx["parsed"]
+
+
+def _case_auto_detect(ctx):
+    def run():
+        clear_schema_cache()
+        return auto_detect_columns(ctx["df"])
+    return run
+
+
+def _case_daily_sales(ctx):
+    return lambda: prepare_daily_sales_df(ctx["df"], "ORDER_DATE", "AMOUNT")
+
+
+def _case_churn(ctx):
+    return lambda: churn_risk(ctx["df"], "OUTLET_ID", "ORDER_DATE")
+
+
+def _case_outlet_features(ctx):
+    return lambda: prepare_outlet_features(
+        ctx["df"], "OUTLET_ID", "AMOUNT", "TOTAL_QUANTITY"
+    )
+
+
+def _case_segment(ctx):
+    outlet_df = prepare_outlet_features(
+        ctx["df"], "OUTLET_ID", "AMOUNT", "TOTAL_QUANTITY"
+    ).drop(columns=["OUTLET_ID"])
+    return lambda: segment_outlets(outlet_df.copy(), DEFAULT_CLUSTERS)
+
+
+def _case_time_series(ctx):
+    return lambda: prepare_time_series(ctx["df"], "ORDER_DATE", "AMOUNT")
+
+
+def _case_forecast(ctx):
+    ts = prepare_time_series(ctx["df"], "ORDER_DATE", "AMOUNT")
+    return lambda: forecast_sales(ts, periods=DEFAULT_FORECAST_MONTHS)
+
+
+def _case_viz_line(ctx):
+    parsed = _parsed(ctx)
+    return lambda: visualizations.line_sales_trend(parsed, "ORDER_DATE", "AMOUNT")
+
+
+def _case_viz_bar_brand(ctx):
+    parsed = _parsed(ctx)
+    return lambda: visualizations.bar_top(parsed, "BRAND", "AMOUNT", top_n=10)
+
+
+def _case_viz_bar_outlet(ctx):
+    parsed = _parsed(ctx)
+    return lambda: visualizations.bar_top(parsed, "OUTLET_ID", "AMOUNT", top_n=20)
+
+
+def _case_viz_heatmap(ctx):
+    parsed = _parsed(ctx)
+    return lambda: visualizations.heatmap(parsed, "STATE", "BRAND", "AMOUNT")
+
+
+def _case_charts_line(ctx):
+    return lambda: charts.line_sales_trend(ctx["df"], "ORDER_DATE", "AMOUNT")
+
+
+def _case_charts_bar(ctx):
+    return lambda: charts.bar_top(ctx["df"], "BRAND", "AMOUNT", top_n=10)
+
+
+def _metric_case(intent):
+    def _case(ctx):
+        return lambda: compute_metrics(ctx["df"], intent)
+    return _case
+
+
+CASES = [
+    ("auto_detect_columns", _case_auto_detect),
+    ("prepare_daily_sales_df", _case_daily_sales),
+    ("churn_risk", _case_churn),
+    ("prepare_outlet_features", _case_outlet_features),
+    ("segment_outlets", _case_segment),
+    ("prepare_time_series", _case_time_series),
+    ("forecast_sales", _case_forecast),
+    ("visualizations.line_sales_trend", _case_viz_line),
+    ("visualizations.bar_top[brand]", _case_viz_bar_brand),
+    ("visualizations.bar_top[outlet]", _case_viz_bar_outlet),
+    ("visualizations.heatmap", _case_viz_heatmap),
+    ("charts.line_sales_trend", _case_charts_line),
+    ("charts.bar_top", _case_charts_bar),
+] + [
+    (f"compute_metrics[{intent}]", _metric_case(intent))
+    for intent in METRIC_INTENTS
+]
+
+
+# -------------------------------------------------
+# Measurement
+# -------------------------------------------------
+def measure(fn, repeat: int = 1, trace_memory: bool = True) -> dict:
+    """
+    Best-of-N cold wall time (every per-dataset memo cleared first), the
+    best-of-N warm time (memos populated by the preceding run), plus peak
+    traced allocation from one extra cold run.
+    """
+    cold, warm = [], []
+    for _ in range(max(1, repeat)):
+        clear_memos()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        cold.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        fn()
+        warm.append(time.perf_counter() - start)
+
+    result = {
+        "seconds": round(min(cold), 6),
+        "mean_seconds": round(float(np.mean(cold)), 6),
+        "warm_seconds": round(min(warm), 6),
+    }
+
+    if trace_memory:
+        clear_memos()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_mb"] = round(peak / 1024 ** 2, 2)
+
+    return result
+
+
+def run_scale(n_rows: int, seed: int, repeat: int, trace_memory: bool, only=None) -> dict:
+    start = time.perf_counter()
+    df = generate_orders(n_rows, seed=seed)
+    generate_seconds = time.perf_counter() - start
+
+    ctx = {"df": df}
+    cases = {}
+
+    for name, builder in CASES:
+        if only and not any(token in name for token in only):
+            continue
+
+        try:
+            fn = builder(ctx)
+            cases[name] = measure(fn, repeat=repeat, trace_memory=trace_memory)
+        except Exception as e:
+            cases[name] = {"error": f"{type(e).__name__}: {e}"}
+
+        print(f"  {name:<42} {_describe(cases[name])}", flush=True)
+
+    return {
+        "rows": int(len(df)),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 1024 ** 2, 2),
+        "generate_seconds": round(generate_seconds, 3),
+        "cases": cases,
+    }
+
+
+def _describe(result: dict) -> str:
+    if "error" in result:
+        return f"ERROR {result['error']}"
+    peak = f"  peak {result['peak_mb']:>9.2f} MB" if "peak_mb" in result else ""
+    warm = f"  warm {result['warm_seconds']:>9.4f} s" if "warm_seconds" in result else ""
+    return f"{result['seconds']:>9.4f} s{warm}{peak}"
+
+
+# -------------------------------------------------
+# Metadata (makes runs comparable across commits)
+# -------------------------------------------------
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def environment_metadata(seed: int, repeat: int) -> dict:
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "prophet": PROPHET_AVAILABLE,
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Compare two result files case by case.
+    Returns rows of (scale, case, baseline_s, current_s, ratio, regressed).
+    """
+    rows = []
+
+    for scale, result in current.get("results", {}).items():
+        base_cases = baseline.get("results", {}).get(scale, {}).get("cases", {})
+
+        for name, cur in result["cases"].items():
+            base = base_cases.get(name)
+            if not base or "seconds" not in base or "seconds" not in cur:
+                continue
+
+            ratio = cur["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            rows.append((scale, name, base["seconds"], cur["seconds"], ratio, ratio > threshold))
+
+    return rows
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FMCG dashboard hot-path benchmarks")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma separated, e.g. 1M,10M,50M")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=1, help="Cold + warm timed runs per case (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak measurement")
+    parser.add_argument("--only", default="", help="Comma separated case-name filters")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    only = [token for token in args.only.split(",") if token]
+
+    report = {
+        "meta": environment_metadata(args.seed, args.repeat),
+        "results": {},
+    }
+
+    for label in [s.strip() for s in args.scales.split(",") if s.strip()]:
+        n_rows = parse_scale(label)
+        print(f"\n▶ {label} ({n_rows:,} rows)", flush=True)
+        report["results"][label] = run_scale(
+            n_rows,
+            seed=args.seed,
+            repeat=args.repeat,
+            trace_memory=not args.no_memory,
+            only=only,
+        )
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+        print(f"\nComparison vs {baseline.get('meta', {}).get('commit')}")
+        regressions = 0
+        for scale, name, base_s, cur_s, ratio, regressed in compare(report, baseline):
+            flag = "  ⚠ REGRESSION" if regressed else ""
+            regressions += regressed
+            print(f"  [{scale}] {name:<42} {base_s:>9.4f} → {cur_s:>9.4f} s  x{ratio:5.2f}{flag}")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,267 @@
+# benchmarks/synthetic_data.py
+# -------------------------------------------------
+# Deterministic Synthetic FMCG Order Generator
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_DATE_FORMAT
+from core.data_registry import REQUIRED_COLUMNS
+
+# -------------------------------------------------
+# Scale Labels
+# -------------------------------------------------
+SCALES = {
+    "100K": 100_000,
+    "1M": 1_000_000,
+    "10M": 10_000_000,
+    "50M": 50_000_000,
+}
+
+DEFAULT_SEED = 42
+DEFAULT_START_DATE = "2023-01-01"
+DEFAULT_DAYS = 730
+
+EXTRA_COLUMNS = ["TOTAL_QUANTITY", "WAREHOUSE"]
+
+ZONES = ["North", "South", "East", "West", "Central"]
+
+STATES = [
+    "Delhi", "Haryana", "Punjab", "Uttar Pradesh", "Rajasthan", "Uttarakhand",
+    "Himachal Pradesh", "Karnataka", "Tamil Nadu", "Kerala", "Telangana",
+    "Andhra Pradesh", "West Bengal", "Odisha", "Bihar", "Jharkhand", "Assam",
+    "Maharashtra", "Gujarat", "Goa", "Madhya Pradesh", "Chhattisgarh",
+]
+
+STATE_ZONE = [
+    0, 0, 0, 0, 0, 0,
+    0, 1, 1, 1, 1,
+    1, 2, 2, 2, 2, 2,
+    3, 3, 3, 4, 4,
+]
+
+CATEGORIES = [
+    "Confectionery", "Mouth Freshener", "Beverages", "Dairy", "Spices",
+    "Snacks", "Bakery", "Personal Care", "Home Care", "Staples",
+    "Frozen", "Tobacco Alternatives",
+]
+
+ORDER_STATES = ["Delivered", "Approved", "Pending", "Rejected", "Cancelled"]
+ORDER_STATE_P = [0.82, 0.06, 0.04, 0.05, 0.03]
+
+ORDER_TYPES = ["Regular", "Scheme", "Urgent"]
+ORDER_TYPE_P = [0.78, 0.17, 0.05]
+
+DESIGNATIONS = ["Sales Officer", "Territory Sales Incharge", "Area Sales Manager"]
+DESIGNATION_P = [0.75, 0.2, 0.05]
+
+DISCOUNT_RATES = np.array([0.0, 0.02, 0.05, 0.10])
+DISCOUNT_P = [0.55, 0.2, 0.17, 0.08]
+
+
+def parse_scale(label) -> int:
+    """
+    Convert a scale label (1M, 10M, 250K or a plain integer)
+    into a row count.
+    """
+    if isinstance(label, int):
+        return label
+
+    text = str(label).strip().upper().replace("_", "")
+
+    if text in SCALES:
+        return SCALES[text]
+
+    multiplier = 1
+    if text.endswith("K"):
+        multiplier, text = 1_000, text[:-1]
+    elif text.endswith("M"):
+        multiplier, text = 1_000_000, text[:-1]
+
+    return int(float(text) * multiplier)
+
+
+def dimension_sizes(n_rows: int) -> dict:
+    """
+    Realistic FMCG cardinalities for a given number of order lines.
+    """
+    outlets = int(np.clip(n_rows // 40, 50, 500_000))
+
+    return {
+        "outlets": outlets,
+        "reps": int(np.clip(outlets // 60, 10, 20_000)),
+        "skus": int(np.clip(n_rows // 500, 50, 5_000)),
+        "brands": int(np.clip(n_rows // 25_000, 8, 60)),
+        "cities": int(np.clip(outlets // 150, 10, 400)),
+    }
+
+
+def _names(prefix: str, n: int, width: int) -> np.ndarray:
+    return np.array([f"{prefix}{i:0{width}d}" for i in range(1, n + 1)], dtype=object)
+
+
+def _popularity(rng, n: int, shape: float = 1.2) -> np.ndarray:
+    """Long-tailed (Pareto) selection weights – few big outlets / SKUs."""
+    weights = rng.pareto(shape, n) + 1.0
+    return weights / weights.sum()
+
+
+def _day_weights(days: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Weekly rhythm + annual festive peak (Oct/Nov) + steady growth.
+    """
+    weekday = np.array([1.05, 1.0, 1.0, 1.05, 1.1, 1.15, 0.45])[days.dayofweek]
+
+    doy = days.dayofyear.to_numpy()
+    annual = 1 + 0.15 * np.sin(2 * np.pi * (doy - 80) / 365.25)
+    festive = 1 + 0.45 * np.exp(-0.5 * ((doy - 300) / 12.0) ** 2)
+    month_end = np.where(days.day >= 26, 1.12, 1.0)
+
+    growth = 1 + 0.15 * np.arange(len(days)) / 365.25
+
+    weights = weekday * annual * festive * month_end * growth
+    return weights / weights.sum()
+
+
+def _labels(names, codes, as_category: bool):
+    if as_category:
+        return pd.Categorical.from_codes(codes, categories=pd.Index(names))
+    return np.asarray(names, dtype=object)[codes]
+
+
+def generate_orders(
+    n_rows,
+    seed: int = DEFAULT_SEED,
+    start_date: str = DEFAULT_START_DATE,
+    days: int = DEFAULT_DAYS,
+    date_format: str | None = DEFAULT_DATE_FORMAT,
+    as_category: bool = False,
+) -> pd.DataFrame:
+    """
+    Generate a deterministic FMCG order-line dataset.
+
+    - Same (n_rows, seed) always yields the same frame
+    - Columns follow core.data_registry.REQUIRED_COLUMNS (+ TOTAL_QUANTITY,
+      WAREHOUSE)
+    - ORDER_DATE is returned as strings in `date_format` (as read from CSV);
+      pass date_format=None for datetime64
+    - as_category=True keeps text dimensions as categoricals (low memory)
+    """
+
+    n_rows = parse_scale(n_rows)
+    if n_rows <= 0:
+        raise ValueError("n_rows must be positive")
+
+    rng = np.random.default_rng(seed)
+    sizes = dimension_sizes(n_rows)
+
+    # -----------------------------
+    # DIMENSIONS
+    # -----------------------------
+    city_state = rng.integers(0, len(STATES), sizes["cities"])
+    city_names = _names("City ", sizes["cities"], 3)
+
+    outlet_city = rng.integers(0, sizes["cities"], sizes["outlets"])
+    outlet_rep = rng.integers(0, sizes["reps"], sizes["outlets"])
+    outlet_names = _names("Outlet ", sizes["outlets"], 6)
+    outlet_p = _popularity(rng, sizes["outlets"])
+
+    rep_designation = rng.choice(len(DESIGNATIONS), sizes["reps"], p=DESIGNATION_P)
+    rep_names = _names("Rep ", sizes["reps"], 5)
+
+    sku_brand = rng.integers(0, sizes["brands"], sizes["skus"])
+    brand_category = rng.integers(0, len(CATEGORIES), sizes["brands"])
+    sku_names = _names("SKU", sizes["skus"], 5)
+    brand_names = _names("Brand ", sizes["brands"], 2)
+    sku_price = np.round(rng.lognormal(np.log(120), 0.8, sizes["skus"]), 2)
+    sku_p = _popularity(rng, sizes["skus"], shape=1.5)
+
+    # Up to two warehouses per state; each city is served by one
+    # (derived, not drawn, so existing columns keep their values)
+    warehouse_names = np.array(
+        [f"WH-{s[:3].upper()}-{k + 1}" for s in STATES for k in range(2)], dtype=object
+    )
+    city_warehouse = city_state * 2 + np.arange(sizes["cities"]) % 2
+
+    # -----------------------------
+    # ORDERS (HEADER LEVEL)
+    # -----------------------------
+    n_orders = int(n_rows / 3.5 * 1.1) + 1
+    lines_per_order = rng.poisson(2.5, n_orders) + 1
+    while lines_per_order.sum() < n_rows:
+        lines_per_order = np.concatenate(
+            [lines_per_order, rng.poisson(2.5, n_orders // 10 + 1) + 1]
+        )
+
+    n_orders = int(np.searchsorted(np.cumsum(lines_per_order), n_rows) + 1)
+    order_idx = np.repeat(np.arange(n_orders), lines_per_order[:n_orders])[:n_rows]
+
+    calendar = pd.date_range(start_date, periods=days, freq="D")
+    order_day = np.sort(rng.choice(days, n_orders, p=_day_weights(calendar)))
+    order_outlet = rng.choice(sizes["outlets"], n_orders, p=outlet_p)
+    order_state = rng.choice(len(ORDER_STATES), n_orders, p=ORDER_STATE_P)
+    order_type = rng.choice(len(ORDER_TYPES), n_orders, p=ORDER_TYPE_P)
+    order_minutes = np.round(rng.gamma(2.0, 8.0, n_orders), 1)
+
+    # -----------------------------
+    # LINES
+    # -----------------------------
+    outlet = order_outlet[order_idx]
+    city = outlet_city[outlet]
+    state = city_state[city]
+    rep = outlet_rep[outlet]
+
+    sku = rng.choice(sizes["skus"], n_rows, p=sku_p)
+    brand = sku_brand[sku]
+
+    quantity = (rng.geometric(0.12, n_rows)).astype(np.int32)
+    gross = sku_price[sku] * quantity
+    discount = np.round(gross * DISCOUNT_RATES[rng.choice(4, n_rows, p=DISCOUNT_P)], 2)
+    amount = np.round(gross - discount, 2)
+
+    day = order_day[order_idx]
+    if date_format:
+        date_labels = calendar.strftime(date_format).to_numpy(dtype=object)
+        order_date = _labels(date_labels, day, as_category=False)
+    else:
+        order_date = calendar.to_numpy()[day]
+
+    df = pd.DataFrame({
+        "ORDER_ID": 10_000_000 + order_idx.astype(np.int64),
+        "ORDER_DATE": order_date,
+        "ORDERSTATE": _labels(ORDER_STATES, order_state[order_idx], as_category),
+        "ORDERTYPE": _labels(ORDER_TYPES, order_type[order_idx], as_category),
+        "AMOUNT": amount,
+        "SKU_ID": _labels(sku_names, sku, as_category),
+        "BRAND": _labels(brand_names, brand, as_category),
+        "CATEGORY": _labels(CATEGORIES, brand_category[brand], as_category),
+        "OUTLET_ID": 500_000 + outlet.astype(np.int64),
+        "OUTLET_NAME": _labels(outlet_names, outlet, as_category),
+        "CITY": _labels(city_names, city, as_category),
+        "ZONE": _labels(ZONES, np.asarray(STATE_ZONE)[state], as_category),
+        "STATE": _labels(STATES, state, as_category),
+        "USER_ID": 9_000 + rep.astype(np.int64),
+        "USERNAME": _labels(rep_names, rep, as_category),
+        "DESIGNATION": _labels(DESIGNATIONS, rep_designation[rep], as_category),
+        "DISCOUNT_AMOUNT": discount,
+        "TIME_SPENT_AT_OUTLET": order_minutes[order_idx],
+        "TOTAL_QUANTITY": quantity,
+        "WAREHOUSE": _labels(warehouse_names, city_warehouse[city], as_category),
+    })
+
+    return df[REQUIRED_COLUMNS + EXTRA_COLUMNS]
+
+
+def write_dataset(path: str, n_rows, seed: int = DEFAULT_SEED, **kwargs) -> str:
+    """
+    Generate and persist a synthetic dataset (CSV or Parquet by extension).
+    """
+    df = generate_orders(n_rows, seed=seed, **kwargs)
+
+    if str(path).lower().endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+    return path
@@ -84,3 +84,86 @@ ENABLE_AI_SUMMARY = True
 # -------------------------------------------------
 MAX_ROWS_PREVIEW = 50_000
 ENABLE_CACHING = True
+
+# -------------------------------------------------
+# Dataset Cache & Precompute Worker
+# -------------------------------------------------
+DATASET_CACHE_DIR = os.getenv("FMCG_CACHE_DIR", ".cache/fmcg")
+FINGERPRINT_CHUNK_ROWS = 500_000   # rows hashed per block to version a dataset
+ORDER_KEY_COLUMN = "ORDER_ID"      # de-duplication key for append uploads
+ENABLE_PRECOMPUTE_WORKER = True
+PRECOMPUTE_POLL_SECONDS = 30
+PRECOMPUTE_REFRESH_HOURS = 24      # artifacts older than this are stale
+
+# -------------------------------------------------
+# Excel Ingest
+# -------------------------------------------------
+EXCEL_CHUNK_ROWS = 50_000          # streamed rows per parsed block (progress step)
+
+# -------------------------------------------------
+# Performance Instrumentation
+# -------------------------------------------------
+ENABLE_PROFILING = True
+PERF_BUFFER_SIZE = 5_000           # step records kept in the ring buffer
+PERF_VIEW_QUERY_PARAM = "performance"   # app.py?view=performance
+
+# -------------------------------------------------
+# Data Quality Profiling
+# -------------------------------------------------
+PROFILE_CHUNK_ROWS = 1_000_000     # rows per pass chunk (bounds memory)
+PROFILE_SAMPLE_ROWS = 200_000      # fast-mode stratified sample size
+FAST_PROFILE_MIN_ROWS = 2_000_000  # fast mode is the default above this
+HLL_PRECISION = 12                 # 4096 registers, ~1.6% distinct-count error
+QUANTILE_SKETCH_SIZE = 4_096       # bottom-k sample kept per numeric column
+PROFILE_TOP_VALUES = 5
+DUPLICATE_EXAMPLE_GROUPS = 5       # largest duplicate groups shown
+DUPLICATE_HASH_BLOCK_ROWS = 250_000  # rows hashed per block for duplicate detection
+
+# -------------------------------------------------
+# Type Inference
+# -------------------------------------------------
+DATE_SAMPLE_SIZE = 300             # values tested per column
+DATE_MIN_HIT_RATE = 0.9            # share of sample that must parse
+UNIQUE_PARSE_MAX_RATIO = 0.5       # parse unique values when distinct/rows is below this
+SCHEMA_SAMPLE_ROWS = 1_000         # rows sampled per candidate column (role scoring)
+
+# -------------------------------------------------
+# Memory Compaction (ingest)
+# -------------------------------------------------
+CATEGORY_MAX_RATIO = 0.5           # text -> category when distinct/rows is at most this
+FLOAT32_TOLERANCE = 0.005          # max absolute error allowed for float64 -> float32
+MONETARY_ROLES = ["sales", "discount"]   # detected roles never compacted (dtype kept)
+COUNT_ROLES = ["quantity"]         # detected roles whose numbers keep full width
+MONETARY_TOKENS = ["amount", "sales", "revenue", "value", "price", "mrp", "discount", "cost", "tax"]
+
+# -------------------------------------------------
+# Time-Series Store
+# -------------------------------------------------
+SERIES_MATRIX_MAX_CELLS = 20_000_000   # member × day cells per dimension matrix
+TRADING_WEEKMASK = "Mon Tue Wed Thu Fri Sat"   # 6-day trade week (Sunday off)
+
+# -------------------------------------------------
+# Business Signals
+# -------------------------------------------------
+SIGNAL_WINDOW_DAYS = 28            # rolling window for CV / z-scores / trend
+SIGNAL_Z_THRESHOLD = 3.0           # |z| above this is an anomaly day
+SIGNAL_BREAK_T = 3.0               # |t| of window-over-window change = trend break
+
+# -------------------------------------------------
+# Pricing & Discounts
+# -------------------------------------------------
+PRICE_BAND_LABELS = ["Economy", "Mainstream", "Premium"]   # tertiles of median unit price
+DISCOUNT_BAND_EDGES = [2.5, 5, 10]  # discount % band upper edges
+ELASTICITY_PERIOD_DAYS = 7         # SKU × period cells the log-log fits run on
+ELASTICITY_MIN_PERIODS = 8         # priced periods required per SKU
+ELASTICITY_T_THRESHOLD = 2.0       # |t| below this is "No clear response"
+
+# -------------------------------------------------
+# Field Force
+# -------------------------------------------------
+BEAT_COVERAGE_DAYS = 28            # recent window for beat coverage per rep
+
+# -------------------------------------------------
+# Ranking & Concentration
+# -------------------------------------------------
+ABC_THRESHOLDS = (80, 95)          # cumulative share % closing the A and B classes
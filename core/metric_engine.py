@@ -1,17 +1,27 @@
 import pandas as pd
+from engine.field_force import rep_productivity
+from engine.operations import operations_summary
+from utils.column_detector import auto_detect_columns
 from utils.helpers import format_currency, safe_pct
+from utils.instrumentation import timed
+from utils.schema_normalizer import canonical_view
 
+@timed("aggregation")
 def compute_metrics(df, intent):
     result = {}
 
+    # Canonical names (SALES, ORDER_ID, OUTLET, ...) over the detected columns
+    cols = auto_detect_columns(df)
+    view = canonical_view(df, cols)
+
     if intent == "TOTAL_SALES":
-        total = df["AMOUNT"].sum()
+        total = view.numeric("SALES").sum()
         result["title"] = "📊 Total Sales Overview"
         result["value"] = format_currency(total)
-        result["why"] = "Sum of AMOUNT across all orders"
+        result["why"] = f"Sum of {view.source('SALES')} across all orders"
 
     elif intent == "TOTAL_ORDERS":
-        orders = df["ORDER_ID"].nunique()
+        orders = view["ORDER_ID"].nunique()
         result["title"] = "📦 Total Orders"
         result["value"] = f"{orders:,}"
         result["why"] = "Unique ORDER_ID count"
@@ -19,28 +29,28 @@ def compute_metrics(df, intent):
     elif intent == "PERFORMANCE":
         result["title"] = "📈 Business Performance Summary"
         result["value"] = (
-            f"Sales: {format_currency(df['AMOUNT'].sum())}\n"
-            f"Outlets: {df['OUTLET_ID'].nunique()}\n"
-            f"SKUs: {df['SKU_ID'].nunique()}"
+            f"Sales: {format_currency(view.numeric('SALES').sum())}\n"
+            f"Outlets: {view['OUTLET'].nunique()}\n"
+            f"SKUs: {view['SKU'].nunique()}"
         )
         result["why"] = "Scale, coverage and assortment indicators"
 
     elif intent == "SKU_ANALYSIS":
-        top_brand = df.groupby("BRAND")["AMOUNT"].sum().idxmax()
+        top_brand = view.numeric("SALES").groupby(view["BRAND"]).sum().idxmax()
         result["title"] = "🏷️ Product Performance"
         result["value"] = f"Top brand by revenue: {top_brand}"
         result["why"] = "Brand-wise revenue aggregation"
 
     elif intent == "OUTLET_ANALYSIS":
-        inactive = df.groupby("OUTLET_ID")["ORDER_ID"].count()
+        inactive = view["ORDER_ID"].groupby(view["OUTLET"]).count()
         inactive = inactive[inactive <= 1].count()
         result["title"] = "🏪 Outlet Health"
         result["value"] = f"Inactive outlets detected: {inactive}"
         result["why"] = "Outlets with ≤1 order"
 
     elif intent == "DISCOUNT_ANALYSIS":
-        discount = df["DISCOUNT_AMOUNT"].sum()
-        sales = df["AMOUNT"].sum()
+        discount = view.numeric("DISCOUNT").sum()
+        sales = view.numeric("SALES").sum()
         result["title"] = "💸 Discount Impact"
         result["value"] = (
             f"Total Discount: {format_currency(discount)}\n"
@@ -49,22 +59,37 @@ def compute_metrics(df, intent):
         result["why"] = "Discount leakage assessment"
 
     elif intent == "REJECTION_ANALYSIS":
-        rejected = df[df["ORDERSTATE"] == "Rejected"]
+        ops = operations_summary(df, cols)
         result["title"] = "❌ Order Rejection Analysis"
-        result["value"] = f"Rejected orders: {rejected['ORDER_ID'].nunique()}"
-        result["why"] = "ORDERSTATE-based filtering"
+        result["value"] = (
+            f"Rejected orders: {ops['rejected_orders']:,} ({ops['rejection_rate']:.2f}%)\n"
+            f"Revenue lost: {format_currency(ops['rejected_sales'])}"
+        )
+        result["why"] = "Final ORDERSTATE per order (encoded once per dataset)"
 
     elif intent == "FIELD_FORCE":
-        avg_time = df["TIME_SPENT_AT_OUTLET"].mean()
+        reps = rep_productivity(df, cols)
         result["title"] = "👥 Field Force Productivity"
-        result["value"] = f"Avg time per outlet: {round(avg_time,2)} mins"
-        result["why"] = "Visit efficiency proxy"
+
+        if reps.empty:
+            result["value"] = "Insufficient data: needs rep, outlet, date and sales columns with dated orders"
+            result["why"] = "No rep visits could be built from this dataset"
+        else:
+            visits = reps["Visits"].sum()
+            visit_time = (
+                f"Avg time per visit: {reps['Visit_Minutes'].sum() / visits:.2f} mins"
+                if "Visit_Minutes" in reps.columns
+                else "Avg time per visit: insufficient data (no visit-time column)"
+            )
+            result["value"] = (
+                f"{visit_time}\n"
+                f"Strike rate: {safe_pct(reps['Productive_Calls'].sum(), visits)}%"
+            )
+            result["why"] = "Visits = rep × outlet × day; visit time counted once per order"
 
     elif intent == "RISK_ANALYSIS":
-        top_share = (
-            df.groupby("SKU_ID")["AMOUNT"].sum().max()
-            / df["AMOUNT"].sum()
-        ) * 100
+        sales = view.numeric("SALES")
+        top_share = (sales.groupby(view["SKU"]).sum().max() / sales.sum()) * 100
         result["title"] = "⚠️ Business Risk Signals"
         result["value"] = f"Revenue concentration: {round(top_share,2)}%"
         result["why"] = "Top SKU dependency risk"
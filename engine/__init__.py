@@ -0,0 +1,36 @@
+"""
+Headless analytics engine for the FMCG Executive Intelligence Platform.
+
+Pure functions (no Streamlit) shared by the dashboard pages,
+the batch CLI (`python -m engine`) and background jobs.
+"""
+
+from engine.kpis import executive_kpis, with_valid_dates
+from engine.timeseries import daily_sales, monthly_sales
+from engine.insights import actionable_insights
+from engine.outlets import churn_table, outlet_profile, segment_profile
+from engine.field_force import productivity_distribution, rep_day_productivity, rep_productivity
+from engine.operations import operations_summary, order_funnel, rejection_breakdown, rejection_spikes
+from engine.forecast import sales_forecast
+from engine.reports import REPORTS, run_reports
+
+__all__ = [
+    "executive_kpis",
+    "with_valid_dates",
+    "daily_sales",
+    "monthly_sales",
+    "actionable_insights",
+    "churn_table",
+    "outlet_profile",
+    "segment_profile",
+    "rep_productivity",
+    "rep_day_productivity",
+    "productivity_distribution",
+    "operations_summary",
+    "order_funnel",
+    "rejection_breakdown",
+    "rejection_spikes",
+    "sales_forecast",
+    "REPORTS",
+    "run_reports",
+]
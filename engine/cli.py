@@ -0,0 +1,107 @@
+# engine/cli.py
+# -------------------------------------------------
+# Batch CLI: python -m engine <dataset> --output <dir>
+# -------------------------------------------------
+
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_CLUSTERS, DEFAULT_FORECAST_MONTHS
+from engine.reports import REPORTS, run_reports
+from utils.frame_compaction import prepare_dataset
+
+
+def read_dataset(path: str) -> pd.DataFrame:
+    """Load a Parquet / CSV / Excel dataset from disk."""
+    lower = path.lower()
+
+    if lower.endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    if lower.endswith(".csv"):
+        return pd.read_csv(path, encoding="latin1")
+    if lower.endswith((".xlsx", ".xls")):
+        return pd.read_excel(path)
+
+    raise ValueError(f"Unsupported file format: {path}")
+
+
+def to_jsonable(value):
+    """Convert numpy / pandas scalars and NaN into plain JSON values."""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def write_result(name: str, result, output_dir: str, fmt: str = "csv") -> str:
+    if isinstance(result, pd.DataFrame):
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        if fmt == "parquet":
+            result.to_parquet(path, index=False)
+        else:
+            result.to_csv(path, index=False)
+        return path
+
+    path = os.path.join(output_dir, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(to_jsonable(result), fh, indent=2, ensure_ascii=False)
+    return path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m engine",
+        description="Run FMCG dashboard analytics headlessly over a dataset file",
+    )
+    parser.add_argument("dataset", help="Parquet / CSV / Excel file")
+    parser.add_argument("--output", "-o", default="reports", help="Output directory")
+    parser.add_argument("--reports", default="all", help=f"Comma separated: {', '.join(REPORTS)}")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Table output format")
+    parser.add_argument("--months", type=int, default=DEFAULT_FORECAST_MONTHS, help="Forecast horizon")
+    parser.add_argument("--clusters", type=int, default=DEFAULT_CLUSTERS, help="Outlet segments")
+    args = parser.parse_args(argv)
+
+    names = None if args.reports == "all" else [n.strip() for n in args.reports.split(",") if n.strip()]
+
+    start = time.perf_counter()
+    df = prepare_dataset(read_dataset(args.dataset))
+    print(f"Loaded {len(df):,} rows × {df.shape[1]} columns from {args.dataset}")
+
+    results = run_reports(df, names, months=args.months, clusters=args.clusters)
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest = {"dataset": os.path.abspath(args.dataset), "rows": int(len(df)), "reports": {}}
+    failures = 0
+
+    for name, result in results.items():
+        if isinstance(result, dict) and set(result) == {"error"}:
+            failures += 1
+            manifest["reports"][name] = result
+            print(f"  ✗ {name}: {result['error']}")
+            continue
+
+        path = write_result(name, result, args.output, args.format)
+        manifest["reports"][name] = {"path": os.path.basename(path)}
+        print(f"  ✓ {name} → {path}")
+
+    manifest["seconds"] = round(time.perf_counter() - start, 3)
+    write_result("manifest", manifest, args.output)
+
+    return 1 if failures and failures == len(results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
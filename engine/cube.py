@@ -0,0 +1,175 @@
+# engine/cube.py
+# -------------------------------------------------
+# Shared Sales Cube (day × dimensions)
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from engine.operations import ORDER_STATES, encoded_orders
+from utils.dataset_cache import memoize_per_dataset
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+# Column roles (auto_detect_columns keys) used as cube dimensions
+CUBE_DIMENSIONS = ["brand", "sku", "state", "city"]
+
+
+@timed("aggregation")
+def sales_cube(df: pd.DataFrame, cols: dict, dimensions=None) -> pd.DataFrame:
+    """
+    Pre-aggregated fact table: one row per Date × dimension combination
+    with Sales, Quantity and Lines. Every page-level rollup over these
+    dimensions can be served from the cube instead of the raw rows.
+    """
+    date_col = cols.get("date")
+    sales_col = cols.get("sales")
+
+    if df is None or df.empty or not date_col or not sales_col:
+        return pd.DataFrame()
+
+    roles = dimensions or CUBE_DIMENSIONS
+    dims = [cols[r] for r in roles if cols.get(r) and cols[r] in df.columns]
+    dims = list(dict.fromkeys(dims))
+
+    qty_col = cols.get("quantity")
+    measures = [sales_col] + ([qty_col] if qty_col and qty_col in df.columns else [])
+
+    data = df[[date_col] + dims + measures].copy()
+    data["Date"] = to_datetime_fast(data[date_col]).dt.normalize()
+    data = data.dropna(subset=["Date"])
+
+    agg = {"Sales": (sales_col, "sum"), "Lines": (sales_col, "size")}
+    if len(measures) > 1:
+        agg["Quantity"] = (qty_col, "sum")
+
+    return (
+        data.groupby(["Date"] + dims, observed=True, dropna=False)
+        .agg(**agg)
+        .reset_index()
+    )
+
+
+# -------------------------------------------------
+# Order Operations Cube (day × dimensions, distinct orders)
+# -------------------------------------------------
+ORDER_CUBE_DIMENSIONS = ["warehouse", "sku"]
+
+# Measures that roll up by plain summation
+ORDER_CUBE_MEASURES = [
+    "Sales", "Quantity", "Lines", "Orders", "Orders_With_Item",
+    "Delivered_Quantity", "Rejected_Orders", "Rejected_Orders_With_Item", "Rejected_Sales",
+]
+
+_order_cubes = memoize_per_dataset("order_cubes", maxsize=8)
+
+
+def run_starts(keys: list) -> np.ndarray:
+    """True where any of the (already sorted) key arrays changes."""
+    first = np.zeros(len(keys[0]), dtype=bool)
+    if len(first):
+        first[0] = True
+    for key in keys:
+        first[1:] |= key[1:] != key[:-1]
+    return first
+
+
+@timed("aggregation")
+def order_cube(df: pd.DataFrame, cols: dict, dimensions=None) -> pd.DataFrame:
+    """
+    One row per Date × dimension cell (default warehouse × SKU) with
+    Sales, Quantity, Lines, Delivered_Quantity, Rejected_Sales and
+    distinct-order counts:
+
+        Orders            each order counted once, in the cell of its
+                          first line (sums to distinct orders at any
+                          Date × leading-dimension rollup)
+        Orders_With_Item  distinct orders present in the cell
+        Rejected_Orders   Orders whose final state is Rejected (and
+                          Rejected_Orders_With_Item likewise)
+
+    Distinct orders come from one lexsort over (day, dims, order) and
+    run-boundary flags, then a single named aggregation over categorical
+    keys – no per-group nunique. Cached per dataset fingerprint.
+    """
+    date_col = cols.get("date")
+    state_col = cols.get("order_state")
+
+    if df is None or df.empty or not date_col or not cols.get("sales") or not state_col:
+        return pd.DataFrame()
+
+    roles = dimensions or ORDER_CUBE_DIMENSIONS
+    dims = [cols[r] for r in roles if cols.get(r) and cols[r] in df.columns]
+    dims = list(dict.fromkeys(dims))
+
+    def build():
+        orders = encoded_orders(df, cols)
+
+        dates = to_datetime_fast(df[date_col])
+        valid = dates.notna().to_numpy()
+        day = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)[valid]
+
+        dim_codes, dim_values = [], []
+        for col in dims:
+            codes, values = pd.factorize(df[col])
+            dim_codes.append(codes[valid])
+            dim_values.append(values)
+
+        order = orders["row_order"][valid]
+        qty_col = cols.get("quantity")
+        qty = (
+            np.nan_to_num(numeric_column(df, qty_col).to_numpy(dtype=np.float64, na_value=np.nan))[valid]
+            if qty_col and qty_col in df.columns else np.zeros(int(valid.sum()))
+        )
+        state = orders["row_state"][valid]
+        rejected = state == ORDER_STATES.index("Rejected")
+        delivered = state == ORDER_STATES.index("Delivered")
+        sales = orders["row_sales"][valid]
+
+        # Sort by (day, leading dims, order, last dim): runs of one order are
+        # contiguous within a leading cell, and runs of one (order, item)
+        # within a full cell.
+        leading, last = dim_codes[:-1], dim_codes[-1:]
+        sort = np.lexsort(last + [order] + leading[::-1] + [day])   # last key = primary
+        s_day = day[sort]
+        s_leading = [c[sort] for c in leading]
+        s_order = order[sort]
+        s_last = [c[sort] for c in last]
+
+        first_order = run_starts([s_day] + s_leading + [s_order])
+        first_item = run_starts([s_day] + s_leading + [s_order] + s_last)
+
+        fact = {"Date": pd.to_datetime(s_day, unit="D")}
+        for col, codes, values in zip(dims, s_leading + s_last, dim_values):
+            fact[col] = pd.Categorical.from_codes(codes, categories=pd.Index(values))
+        fact.update({
+            "sales": sales[sort],
+            "qty": qty[sort],
+            "first_order": first_order,
+            "first_item": first_item,
+            "rejected_order": first_order & rejected[sort],
+            "rejected_item": first_item & rejected[sort],
+            "delivered_qty": np.where(delivered[sort], qty[sort], 0.0),
+            "rejected_sales": np.where(rejected[sort], sales[sort], 0.0),
+        })
+
+        return (
+            pd.DataFrame(fact)
+            .groupby(["Date"] + dims, observed=True, dropna=False, sort=False)
+            .agg(
+                Sales=("sales", "sum"),
+                Quantity=("qty", "sum"),
+                Lines=("sales", "size"),
+                Orders=("first_order", "sum"),
+                Orders_With_Item=("first_item", "sum"),
+                Delivered_Quantity=("delivered_qty", "sum"),
+                Rejected_Orders=("rejected_order", "sum"),
+                Rejected_Orders_With_Item=("rejected_item", "sum"),
+                Rejected_Sales=("rejected_sales", "sum"),
+            )
+            .reset_index()
+        )
+
+    key = (tuple(dims), date_col, state_col, cols.get("order_id"), cols.get("sales"), cols.get("quantity"))
+    return _order_cubes.get(df, key, build)
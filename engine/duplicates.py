@@ -0,0 +1,89 @@
+# engine/duplicates.py
+# -------------------------------------------------
+# Hash-Based Duplicate Detection (Data Quality Monitor)
+# -------------------------------------------------
+#
+# Rows are reduced to one vectorized 64-bit hash over a chosen key set
+# (all columns by default), built in row blocks so only one block's
+# temporaries are alive at a time. Duplicate groups are found by
+# sorting the hashes.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import DUPLICATE_EXAMPLE_GROUPS, DUPLICATE_HASH_BLOCK_ROWS
+from utils.dataset_cache import memoize_per_dataset
+from utils.instrumentation import timed
+
+_results = memoize_per_dataset("duplicates", maxsize=16)
+
+
+@timed("aggregation")
+def row_hashes(df: pd.DataFrame, keys=None) -> np.ndarray:
+    """
+    One 64-bit hash per row over `keys` (all columns when empty).
+
+    Rows are hashed DUPLICATE_HASH_BLOCK_ROWS at a time with
+    pandas' hash_pandas_object (values only, no index) and written into
+    one output array: beyond the 8-byte result per row, peak memory is
+    the per-column hash temporaries of a single block.
+    """
+    keys = list(keys) if keys else list(df.columns)
+    out = np.empty(len(df), dtype=np.uint64)
+
+    for start in range(0, len(df), DUPLICATE_HASH_BLOCK_ROWS):
+        block = df.iloc[start:start + DUPLICATE_HASH_BLOCK_ROWS][keys]
+        try:
+            hashed = pd.util.hash_pandas_object(block, index=False)
+        except TypeError:
+            # Unhashable cells (lists / dicts from JSON sources) -> text
+            hashed = pd.util.hash_pandas_object(block.astype(str), index=False)
+        out[start:start + len(block)] = hashed.to_numpy()
+
+    return out
+
+
+def _groups(hashes: np.ndarray):
+    """Sort-based grouping: (order, group start offsets, group sizes)."""
+    order = np.argsort(hashes)
+    ordered = hashes[order]
+
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    sizes = np.diff(np.r_[starts, len(ordered)])
+
+    return order, starts, sizes
+
+
+def duplicate_report(df: pd.DataFrame, keys=None, examples: int = DUPLICATE_EXAMPLE_GROUPS) -> dict:
+    """
+    Duplicate summary for `keys` (whole row when empty).
+
+    Returns rows, duplicate_rows (rows beyond the first of each group),
+    duplicate_groups, largest_group and `examples`: a DataFrame with the
+    rows of the largest duplicate groups plus a Duplicate_Group column.
+    Cached per dataset fingerprint and key set.
+    """
+    keys = tuple(keys or ())
+    if df is None or df.empty:
+        return {"rows": 0, "duplicate_rows": 0, "duplicate_groups": 0, "largest_group": 0, "examples": pd.DataFrame()}
+
+    def build():
+        order, starts, sizes = _groups(row_hashes(df, keys))
+        dup = sizes > 1
+
+        example_frames = []
+        for rank, g in enumerate(np.argsort(-sizes[dup], kind="stable")[:examples], start=1):
+            start = starts[dup][g]
+            rows = np.sort(order[start:start + sizes[dup][g]])
+            example_frames.append(df.iloc[rows].assign(Duplicate_Group=rank))
+
+        return {
+            "rows": int(len(df)),
+            "duplicate_rows": int((sizes[dup] - 1).sum()),
+            "duplicate_groups": int(dup.sum()),
+            "largest_group": int(sizes.max()) if len(sizes) else 0,
+            "examples": pd.concat(example_frames) if example_frames else pd.DataFrame(),
+        }
+
+    return _results.get(df, (keys, examples), build)
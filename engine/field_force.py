@@ -0,0 +1,265 @@
+# engine/field_force.py
+# -------------------------------------------------
+# Field-Force Productivity (per rep, per day)
+# -------------------------------------------------
+#
+# A visit is one rep at one outlet on one day. Lines are sorted once by
+# (rep, day, outlet, order); run boundaries of that sort give visits and
+# orders, and every measure is a np.*.reduceat over those runs:
+#
+#   Outlets_Visited     visits per rep-day
+#   Productive_Calls    visits with a non-rejected, non-cancelled order
+#   Strike_Rate_%       productive calls / visits
+#   Revenue_Per_Minute  sales / minutes at outlet (visit time counted
+#                       once per order, not once per line)
+#   Beat_Coverage_%     outlets visited / the rep's beat (every outlet
+#                       the rep has served in the dataset)
+#
+# Results are cached per dataset fingerprint.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import BEAT_COVERAGE_DAYS
+from engine.cube import run_starts
+from engine.operations import ORDER_STATES, encoded_orders
+from utils.dataset_cache import memoize_per_dataset
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+# Metrics offered by productivity_distribution()
+PRODUCTIVITY_METRICS = [
+    "Visits_Per_Day",
+    "Strike_Rate_%",
+    "Sales_Per_Day",
+    "Revenue_Per_Minute",
+    "Minutes_Per_Visit",
+    "Beat_Coverage_%",
+]
+
+_results = memoize_per_dataset("field_force", maxsize=16)
+
+
+
+def _key(cols: dict, name: str) -> tuple:
+    roles = ("rep", "outlet", "date", "sales", "visit_time", "order_id", "order_state", "designation")
+    return (name,) + tuple(cols.get(r) for r in roles)
+
+
+def _available(df: pd.DataFrame, cols: dict) -> bool:
+    return (
+        df is not None and not df.empty
+        and all(cols.get(r) and cols[r] in df.columns for r in ("rep", "outlet", "date", "sales"))
+    )
+
+
+# -------------------------------------------------
+# Visits (sorted once, shared by both tables)
+# -------------------------------------------------
+@timed("aggregation")
+def _visits(df: pd.DataFrame, cols: dict) -> dict:
+    def build():
+        dates = to_datetime_fast(df[cols["date"]])
+        rep, reps = pd.factorize(df[cols["rep"]])
+        outlet, _ = pd.factorize(df[cols["outlet"]])
+        valid = dates.notna().to_numpy() & (rep >= 0) & (outlet >= 0)
+
+        day = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+        state_col = cols.get("order_state")
+        if state_col and state_col in df.columns:
+            orders = encoded_orders(df, cols)
+            order = orders["row_order"]
+            lost = np.isin(orders["row_state"], [ORDER_STATES.index("Rejected"), ORDER_STATES.index("Cancelled")])
+            sales = orders["row_sales"]
+        else:
+            order_col = cols.get("order_id")
+            order = pd.factorize(df[order_col])[0] if order_col and order_col in df.columns else np.arange(len(df))
+            lost = np.zeros(len(df), dtype=bool)
+            sales = np.nan_to_num(numeric_column(df, cols["sales"]).to_numpy(dtype=np.float64, na_value=np.nan))
+
+        time_col = cols.get("visit_time")
+        minutes = (
+            np.nan_to_num(numeric_column(df, time_col).to_numpy(dtype=np.float64, na_value=np.nan))
+            if time_col and time_col in df.columns else None
+        )
+
+        # (rep, day, outlet, order) – lexsort takes the primary key last
+        idx = np.flatnonzero(valid)
+        idx = idx[np.lexsort((order[idx], outlet[idx], day[idx], rep[idx]))]
+        if not len(idx):
+            return {"rep": idx, "reps": reps}
+
+        s_rep, s_day, s_outlet, s_order = rep[idx], day[idx], outlet[idx], order[idx]
+        visit_start = np.flatnonzero(run_starts([s_rep, s_day, s_outlet]))
+        first_order = run_starts([s_rep, s_day, s_outlet, s_order])
+
+        productive_line = (~lost[idx]) & (sales[idx] > 0)
+
+        visits = {
+            "rep": s_rep[visit_start],
+            "day": s_day[visit_start],
+            "outlet": s_outlet[visit_start],
+            "sales": np.add.reduceat(sales[idx], visit_start),
+            "orders": np.add.reduceat(first_order.astype(np.int64), visit_start),
+            "productive": np.logical_or.reduceat(productive_line, visit_start),
+            "minutes": (
+                np.add.reduceat(np.where(first_order, minutes[idx], 0.0), visit_start)
+                if minutes is not None else None
+            ),
+            "reps": reps,
+        }
+
+        # Beat = every outlet the rep has served
+        n_outlets = int(outlet.max()) + 1
+        pairs = pd.unique(visits["rep"] * n_outlets + visits["outlet"])
+        visits["beat_size"] = np.bincount(pairs // n_outlets, minlength=len(reps))
+
+        # Designation of each rep's first line
+        designation_col = cols.get("designation")
+        if designation_col and designation_col in df.columns:
+            first_line = np.full(len(reps), -1)
+            first_line[rep[idx][::-1]] = idx[::-1]
+            visits["designation"] = df[designation_col].to_numpy()[first_line]
+
+        return visits
+
+    return _results.get(df, _key(cols, "visits"), build)
+
+
+# -------------------------------------------------
+# Rep × Day
+# -------------------------------------------------
+@timed("aggregation")
+def rep_day_productivity(df: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    """
+    One row per rep and active day: Outlets_Visited, Orders,
+    Productive_Calls, Strike_Rate_%, Sales, Visit_Minutes,
+    Revenue_Per_Minute and Beat_Coverage_% (day's outlets / beat size).
+    """
+    if not _available(df, cols):
+        return pd.DataFrame()
+
+    def build():
+        v = _visits(df, cols)
+        if not len(v["rep"]):
+            return pd.DataFrame()
+
+        start = np.flatnonzero(run_starts([v["rep"], v["day"]]))
+        visited = np.diff(np.append(start, len(v["rep"])))
+        productive = np.add.reduceat(v["productive"].astype(np.int64), start)
+        sales = np.add.reduceat(v["sales"], start)
+        rep = v["rep"][start]
+
+        table = pd.DataFrame({
+            cols["rep"]: v["reps"][rep],
+            "Date": pd.to_datetime(v["day"][start], unit="D"),
+            "Outlets_Visited": visited,
+            "Orders": np.add.reduceat(v["orders"], start),
+            "Productive_Calls": productive,
+            "Strike_Rate_%": productive / visited * 100,
+            "Sales": sales,
+        })
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if v["minutes"] is not None:
+                minutes = np.add.reduceat(v["minutes"], start)
+                table["Visit_Minutes"] = minutes
+                table["Revenue_Per_Minute"] = np.where(minutes > 0, sales / minutes, np.nan)
+            table["Beat_Coverage_%"] = visited / v["beat_size"][rep] * 100
+
+        return table
+
+    return _results.get(df, _key(cols, "rep_day"), build)
+
+
+# -------------------------------------------------
+# Rep Summary
+# -------------------------------------------------
+@timed("aggregation")
+def rep_productivity(df: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    """
+    One row per rep: Designation (when detected), Active_Days, Visits,
+    Visits_Per_Day, Productive_Calls, Strike_Rate_%, Sales, Sales_Per_Day,
+    Visit_Minutes, Minutes_Per_Visit, Revenue_Per_Minute, Beat_Size and
+    Beat_Coverage_% (beat outlets visited in the last BEAT_COVERAGE_DAYS).
+    Sorted by Sales.
+    """
+    if not _available(df, cols):
+        return pd.DataFrame()
+
+    def build():
+        v = _visits(df, cols)
+        n_reps = len(v["reps"])
+        if not len(v["rep"]):
+            return pd.DataFrame()
+
+        rep = v["rep"]
+        visits = np.bincount(rep, minlength=n_reps).astype(np.float64)
+        active_days = np.bincount(rep[run_starts([rep, v["day"]])], minlength=n_reps)
+        productive = np.bincount(rep, weights=v["productive"], minlength=n_reps)
+        sales = np.bincount(rep, weights=v["sales"], minlength=n_reps)
+
+        recent = v["day"] > v["day"].max() - BEAT_COVERAGE_DAYS
+        n_outlets = int(v["outlet"].max()) + 1
+        recent_pairs = pd.unique(rep[recent] * n_outlets + v["outlet"][recent])
+        covered = np.bincount(recent_pairs // n_outlets, minlength=n_reps)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table = pd.DataFrame({
+                cols["rep"]: v["reps"],
+                "Active_Days": active_days,
+                "Visits": visits.astype(np.int64),
+                "Visits_Per_Day": visits / active_days,
+                "Productive_Calls": productive.astype(np.int64),
+                "Strike_Rate_%": np.where(visits > 0, productive / visits * 100, np.nan),
+                "Sales": sales,
+                "Sales_Per_Day": sales / active_days,
+            })
+
+            if v["minutes"] is not None:
+                minutes = np.bincount(rep, weights=v["minutes"], minlength=n_reps)
+                table["Visit_Minutes"] = minutes
+                table["Minutes_Per_Visit"] = np.where(visits > 0, minutes / visits, np.nan)
+                table["Revenue_Per_Minute"] = np.where(minutes > 0, sales / minutes, np.nan)
+
+            table["Beat_Size"] = v["beat_size"]
+            table["Beat_Coverage_%"] = np.where(v["beat_size"] > 0, covered / v["beat_size"] * 100, np.nan)
+
+        if "designation" in v:
+            table.insert(1, "Designation", v["designation"])
+
+        table = table[table["Visits"] > 0]
+        return table.sort_values("Sales", ascending=False, ignore_index=True)
+
+    return _results.get(df, _key(cols, "reps"), build)
+
+
+# -------------------------------------------------
+# Distribution View
+# -------------------------------------------------
+def productivity_distribution(table: pd.DataFrame, metric: str, bins: int = 30) -> dict:
+    """
+    {"histogram": DataFrame(Bin, Reps), "percentiles": DataFrame(Percentile,
+    Value)} for one metric column of rep_productivity() – constant size
+    whatever the number of reps.
+    """
+    values = table[metric].to_numpy(dtype=np.float64) if metric in table.columns else np.zeros(0)
+    values = values[np.isfinite(values)]
+
+    if values.size == 0:
+        return {"histogram": pd.DataFrame(columns=["Bin", "Reps"]), "percentiles": pd.DataFrame()}
+
+    lo, hi = np.percentile(values, [1, 99])
+    counts, edges = np.histogram(np.clip(values, lo, hi), bins=bins, range=(lo, hi if hi > lo else lo + 1))
+
+    levels = [10, 25, 50, 75, 90]
+    return {
+        "histogram": pd.DataFrame({"Bin": np.round((edges[:-1] + edges[1:]) / 2, 2), "Reps": counts}),
+        "percentiles": pd.DataFrame({
+            "Percentile": [f"P{p}" for p in levels],
+            "Value": np.percentile(values, levels),
+        }),
+    }
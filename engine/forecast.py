@@ -0,0 +1,32 @@
+# engine/forecast.py
+# -------------------------------------------------
+# Monthly Sales Forecast
+# -------------------------------------------------
+
+import pandas as pd
+
+from config import DEFAULT_FORECAST_MONTHS
+from engine.timeseries import monthly_sales
+from utils.forecasting import forecast_sales
+
+MIN_HISTORY_MONTHS = 6
+
+
+def sales_forecast(
+    df: pd.DataFrame,
+    date_col: str,
+    sales_col: str,
+    months: int = DEFAULT_FORECAST_MONTHS,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns (monthly actuals [ds, y], forecast [ds, yhat, ...]).
+    Raises ValueError when fewer than MIN_HISTORY_MONTHS are available.
+    """
+    monthly = monthly_sales(df, date_col, sales_col)[["ds", "y"]]
+
+    if len(monthly) < MIN_HISTORY_MONTHS:
+        raise ValueError(
+            f"At least {MIN_HISTORY_MONTHS} months of data required for forecasting."
+        )
+
+    return monthly, forecast_sales(monthly, periods=months)
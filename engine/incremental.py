@@ -0,0 +1,154 @@
+# engine/incremental.py
+# -------------------------------------------------
+# Incremental Artifact Merge for Appended Orders
+# -------------------------------------------------
+#
+# When new daily orders are appended to a cached dataset, the additive
+# artifacts (daily / monthly series, sales cube, outlet profile) are
+# merged from the parent version's artifacts plus the new rows only.
+# The remaining reports are left to the precompute worker, which sees
+# the "partial" manifest and fills in just the missing ones.
+# -------------------------------------------------
+
+import pandas as pd
+
+from engine.cube import sales_cube
+from engine.outlets import outlet_profile, score_recency
+from engine.timeseries import add_daily_indicators, monthly_from_daily
+from utils.dataset_cache import (
+    artifact_manifest,
+    load_artifact,
+    save_artifact,
+    write_artifact_manifest,
+)
+from utils.instrumentation import timed
+from utils.safe_dataframe import prepare_daily_sales_df
+
+# Reports that can be merged from (parent artifact + new rows)
+INCREMENTAL_REPORTS = ["daily_sales", "monthly_sales", "cube", "outlet_profile"]
+
+
+def _merge_daily(base: pd.DataFrame, new_rows: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    try:
+        delta = prepare_daily_sales_df(new_rows, cols["date"], cols["sales"])
+    except (ValueError, KeyError):
+        return base
+
+    delta = delta.rename(columns={cols["date"]: "Date"})[["Date", "Daily_Sales"]]
+
+    merged = (
+        pd.concat([base[["Date", "Daily_Sales"]], delta], ignore_index=True)
+        .groupby("Date", as_index=False)["Daily_Sales"]
+        .sum()
+    )
+
+    return add_daily_indicators(merged)
+
+
+def _merge_cube(base: pd.DataFrame, new_rows: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    delta = sales_cube(new_rows, cols)
+    if delta.empty:
+        return base
+
+    keys = [c for c in delta.columns if c not in ("Sales", "Lines", "Quantity")]
+    measures = [c for c in ("Sales", "Lines", "Quantity") if c in delta.columns]
+
+    # Only the dates touched by the new rows are regrouped
+    touched = base["Date"].isin(delta["Date"].unique())
+    regrouped = (
+        pd.concat([base.loc[touched], delta], ignore_index=True)
+        .groupby(keys, observed=True, dropna=False)[measures]
+        .sum()
+        .reset_index()
+    )
+
+    return (
+        pd.concat([base.loc[~touched], regrouped], ignore_index=True)
+        .sort_values(keys)
+        .reset_index(drop=True)
+    )
+
+
+def _merge_outlets(base: pd.DataFrame, new_rows: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    outlet_col = cols["outlet"]
+    delta = outlet_profile(new_rows, outlet_col, cols.get("sales"), cols.get("quantity"), cols.get("date"))
+    if delta.empty:
+        return base
+
+    try:
+        delta[outlet_col] = delta[outlet_col].astype(base[outlet_col].dtype)
+    except (TypeError, ValueError):
+        pass
+
+    agg_map = {
+        c: f for c, f in (
+            ("Total_Sales", "sum"),
+            ("Total_Quantity", "sum"),
+            ("Last_Order_Date", "max"),
+        ) if c in base.columns
+    }
+
+    merged = (
+        pd.concat([base[[outlet_col] + list(agg_map)], delta[[outlet_col] + list(agg_map)]], ignore_index=True)
+        .groupby(outlet_col)
+        .agg(agg_map)
+        .reset_index()
+    )
+
+    return score_recency(merged)
+
+
+@timed("aggregation")
+def apply_append(base_version: str, version: str, new_rows: pd.DataFrame, cols: dict) -> dict | None:
+    """
+    Build `version`'s additive artifacts from `base_version`'s artifacts
+    plus `new_rows`. Returns the written ("partial") manifest, or None
+    when the parent has no usable artifacts for this column mapping.
+    """
+    base_manifest = artifact_manifest(base_version)
+
+    if (
+        not base_manifest
+        or base_manifest.get("state") not in ("ready", "partial")
+        or base_manifest.get("cols") != cols
+    ):
+        return None
+
+    base_reports = base_manifest.get("reports", {})
+    reports = {}
+
+    for name in INCREMENTAL_REPORTS:
+        if not base_reports.get(name, {}).get("ok"):
+            continue
+
+        base = load_artifact(base_version, name)
+        if not isinstance(base, pd.DataFrame):
+            continue
+
+        if name == "daily_sales":
+            result = _merge_daily(base, new_rows, cols)
+        elif name == "monthly_sales":
+            daily = load_artifact(version, "daily_sales") if reports.get("daily_sales") else None
+            if daily is None:
+                continue
+            result = monthly_from_daily(daily)
+        elif name == "cube":
+            result = _merge_cube(base, new_rows, cols)
+        else:
+            result = _merge_outlets(base, new_rows, cols)
+
+        save_artifact(version, name, result)
+        reports[name] = {"ok": True}
+
+    manifest = {
+        "version": version,
+        "state": "partial",
+        "parent": base_version,
+        "materialized_at": pd.Timestamp.now(tz="UTC").isoformat(timespec="seconds"),
+        "cols": cols,
+        "options": base_manifest.get("options", {}),
+        "reports": reports,
+    }
+
+    write_artifact_manifest(version, manifest)
+    return manifest
@@ -0,0 +1,452 @@
+# engine/insights.py
+# -------------------------------------------------
+# Actionable Business Insights (Risks / Opportunities / Actions)
+# -------------------------------------------------
+#
+# Rules are data: each names a metric, a window, a comparison and a
+# priority weight. All rules are evaluated in one pass over a shared set
+# of aggregates (monthly sales, SKU totals, outlet last-order days) that
+# are built once per dataset, so adding a rule never adds a table scan.
+#
+# Metrics are computed for every group of an optional dimension at once
+# (arrays of shape [groups]); the company-level view is a single group.
+# Results are memoized per dataset fingerprint, column mapping and
+# rule-set version.
+# -------------------------------------------------
+
+import hashlib
+import json
+import operator
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from config import HIGH_CHURN_DAYS
+from utils.calendar_growth import growth_pct
+from utils.dataset_cache import memoize_per_dataset
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+# -------------------------------------------------
+# Rule Set
+# -------------------------------------------------
+# kind       -> "risk" | "opportunity"
+# metric     -> key of METRICS
+# window     -> metric-specific (months, top-N SKUs, inactive days)
+# family     -> rules in one family are exclusive; the first match wins
+# message    -> formatted with value / window / threshold
+INSIGHT_RULES = [
+    {
+        "name": "sharp_decline",
+        "kind": "risk",
+        "family": "momentum",
+        "metric": "month_growth",
+        "window": 1,
+        "op": "<",
+        "threshold": -5.0,
+        "priority": "High",
+        "weight": 3,
+        "message": "📉 Sales momentum has declined sharply (>5%) in the most recent month.",
+        "action": "Conduct immediate review of pricing, stock availability, and distributor coverage.",
+    },
+    {
+        "name": "softening_demand",
+        "kind": "risk",
+        "family": "momentum",
+        "metric": "month_growth",
+        "window": 1,
+        "op": "<",
+        "threshold": 0.0,
+        "priority": "Medium",
+        "weight": 2,
+        "message": "⚠️ Sales growth has turned negative, indicating early demand softening.",
+        "action": "Monitor distributor orders and field execution closely.",
+    },
+    {
+        "name": "sku_concentration",
+        "kind": "risk",
+        "metric": "top_sku_share",
+        "window": 1,
+        "op": ">",
+        "threshold": 40.0,
+        "priority": "High",
+        "weight": 3,
+        "message": "🧩 Revenue concentration risk detected — top SKU contributes {value:.1f}% of sales.",
+        "action": "Reduce dependency by pushing secondary SKUs and bundle strategies.",
+    },
+    {
+        "name": "outlet_churn",
+        "kind": "risk",
+        "metric": "inactive_outlets",
+        "window": HIGH_CHURN_DAYS,
+        "op": ">",
+        "threshold": 0,
+        "priority": "High",
+        "weight": 3,
+        "message": "🚨 {value:,.0f} outlets inactive for over {window} days.",
+        "action": "Launch outlet reactivation schemes and optimize beat planning.",
+    },
+    {
+        "name": "consistent_growth",
+        "kind": "opportunity",
+        "metric": "avg_month_growth",
+        "window": None,
+        "op": ">",
+        "threshold": 3.0,
+        "priority": "Medium",
+        "weight": 1,
+        "message": "🚀 Consistent average monthly growth above 3%.",
+        "action": "Scale production and distributor allocation to capture momentum.",
+    },
+]
+
+PRIORITY_LEVELS = [(7, "🔴 HIGH PRIORITY"), (4, "🟠 MEDIUM PRIORITY")]
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_results = memoize_per_dataset("insights", maxsize=32)
+
+
+def ruleset_version(rules=None) -> str:
+    """Short content hash of a rule set (part of every cache key)."""
+    payload = json.dumps(rules or INSIGHT_RULES, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def priority_level(score: int) -> str:
+    for floor, label in PRIORITY_LEVELS:
+        if score >= floor:
+            return label
+    return "🟢 LOW PRIORITY"
+
+
+
+# -------------------------------------------------
+# Shared Aggregates
+# -------------------------------------------------
+def _row_days(df: pd.DataFrame, date_col: str) -> np.ndarray:
+    """Days since epoch per row (-1 where the date is missing); cached."""
+    def build():
+        dates = to_datetime_fast(df[date_col])
+        if getattr(dates.dt, "tz", None) is not None:
+            dates = dates.dt.tz_localize(None)
+        days = dates.to_numpy().astype("datetime64[D]")
+        return np.where(np.isnat(days), -1, days.astype(np.int64))
+
+    return _results.get(df, ("days", date_col), build)
+
+
+def _row_codes(df: pd.DataFrame, col: str):
+    """(factorized codes, number of members) of a member column; cached."""
+    def build():
+        codes, members = pd.factorize(df[col])
+        return codes.astype(np.int64), max(len(members), 1)
+
+    return _results.get(df, ("codes", col), build)
+
+
+class SharedAggregates:
+    """
+    Per-group aggregates built lazily, each at most once, from a single
+    set of factorized columns. `dim_col=None` means one group (company).
+    """
+
+    def __init__(self, df: pd.DataFrame, cols: dict, dim_col: str | None = None):
+        self.df = df
+        self.cols = cols
+        self.dim_col = dim_col
+
+    @cached_property
+    def _factorized(self):
+        if not self.dim_col:
+            return np.zeros(len(self.df), dtype=np.int64), pd.Index(["All"])
+        codes, groups = pd.factorize(self.df[self.dim_col], use_na_sentinel=False)
+        return codes.astype(np.int64), pd.Index(groups, name=self.dim_col)
+
+    @property
+    def group_codes(self) -> np.ndarray:
+        return self._factorized[0]
+
+    @property
+    def groups(self) -> pd.Index:
+        return self._factorized[1]
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.groups)
+
+    @cached_property
+    def sales(self) -> np.ndarray:
+        values = numeric_column(self.df, self.cols["sales"]).to_numpy(dtype=np.float64)
+        return np.nan_to_num(values)
+
+    @cached_property
+    def days(self) -> np.ndarray:
+        """Days since epoch per row (-1 where the date is missing)."""
+        return _row_days(self.df, self.cols["date"])
+
+    @cached_property
+    def total_sales(self) -> np.ndarray:
+        return np.bincount(self.group_codes, weights=self.sales, minlength=self.n_groups)
+
+    @cached_property
+    def monthly(self) -> np.ndarray:
+        """Sales per [group × calendar month], gap months included."""
+        valid = self.days >= 0
+        if not valid.any():
+            return np.zeros((self.n_groups, 0))
+
+        months = self.days[valid].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        months -= months.min()
+        n_months = int(months.max()) + 1
+
+        flat = np.bincount(
+            self.group_codes[valid] * n_months + months,
+            weights=self.sales[valid],
+            minlength=self.n_groups * n_months,
+        )
+        return flat.reshape(self.n_groups, n_months)
+
+    @cached_property
+    def monthly_growth(self) -> np.ndarray:
+        return growth_pct(self.monthly[:, 1:], self.monthly[:, :-1])
+
+    def _pairs(self, col: str, mask: np.ndarray):
+        """Factorized (group, member) keys for rows in `mask` with a member."""
+        codes, width = _row_codes(self.df, col)
+        mask = mask & (codes >= 0)
+        return self.group_codes[mask] * width + codes[mask], width, mask
+
+    @cached_property
+    def sku_totals(self):
+        """(group, sales) per group×SKU pair – sparse, any cardinality."""
+        keys, width, mask = self._pairs(self.cols["sku"], np.ones(len(self.df), dtype=bool))
+        pairs, pair_keys = pd.factorize(keys)
+        return pair_keys // width, np.bincount(pairs, weights=self.sales[mask])
+
+    @cached_property
+    def outlet_last_day(self):
+        """(group, last order day) per group×outlet pair."""
+        keys, width, mask = self._pairs(self.cols["outlet"], self.days >= 0)
+        last = pd.Series(self.days[mask]).groupby(keys, sort=False).max()
+        return last.index.to_numpy() // width, last.to_numpy()
+
+
+# -------------------------------------------------
+# Metrics: (aggregates, window) -> float array [groups]
+# -------------------------------------------------
+def _month_growth(agg: SharedAggregates, window):
+    monthly = agg.monthly
+    if monthly.shape[1] <= window:
+        return np.full(agg.n_groups, np.nan)
+    return growth_pct(monthly[:, -1], monthly[:, -1 - window])
+
+
+def _avg_month_growth(agg: SharedAggregates, window):
+    growth = agg.monthly_growth
+    if window:
+        growth = growth[:, -window:]
+    if growth.shape[1] == 0:
+        return np.full(agg.n_groups, np.nan)
+    with np.errstate(invalid="ignore"):
+        return np.nanmean(np.where(np.isfinite(growth), growth, np.nan), axis=1)
+
+
+def _per_member(agg: SharedAggregates, role: str) -> bool:
+    # Meaningless when grouping by the member column itself (SKU share per SKU)
+    return bool(agg.cols.get(role)) and agg.cols[role] != agg.dim_col
+
+
+def _top_sku_share(agg: SharedAggregates, window):
+    if not _per_member(agg, "sku"):
+        return np.full(agg.n_groups, np.nan)
+
+    group, totals = agg.sku_totals
+    # Rank SKUs within each group by sales (descending) and keep the top `window`
+    order = np.lexsort((-totals, group))
+    group, totals = group[order], totals[order]
+    starts = np.searchsorted(group, group, side="left")
+    rank = np.arange(len(group)) - starts
+    top = np.bincount(group, weights=np.where(rank < (window or 1), totals, 0), minlength=agg.n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(agg.total_sales > 0, top / agg.total_sales * 100, np.nan)
+
+
+def _inactive_outlets(agg: SharedAggregates, window):
+    if not _per_member(agg, "outlet"):
+        return np.full(agg.n_groups, np.nan)
+
+    group, last_day = agg.outlet_last_day
+    today = np.datetime64(pd.Timestamp.today().date(), "D").astype(np.int64)
+    inactive = (today - last_day) > window
+    return np.bincount(group, weights=inactive, minlength=agg.n_groups)
+
+
+METRICS = {
+    "month_growth": _month_growth,
+    "avg_month_growth": _avg_month_growth,
+    "top_sku_share": _top_sku_share,
+    "inactive_outlets": _inactive_outlets,
+}
+
+
+# -------------------------------------------------
+# Evaluation
+# -------------------------------------------------
+@timed("aggregation")
+def evaluate_rules(agg: SharedAggregates, rules=None) -> dict:
+    """
+    One pass over the rule set.
+
+    Returns {"values": {rule name: metric array}, "fired": bool array
+    [rules × groups]}; each (metric, window) is computed once.
+    """
+    rules = rules or INSIGHT_RULES
+    metric_values = {}
+    values = {}
+    fired = np.zeros((len(rules), agg.n_groups), dtype=bool)
+    claimed = {}
+
+    for i, rule in enumerate(rules):
+        key = (rule["metric"], rule.get("window"))
+        if key not in metric_values:
+            metric_values[key] = np.asarray(METRICS[rule["metric"]](agg, rule.get("window")), dtype=np.float64)
+
+        value = metric_values[key]
+        values[rule["name"]] = value
+
+        with np.errstate(invalid="ignore"):
+            hit = OPERATORS[rule["op"]](value, rule["threshold"]) & ~np.isnan(value)
+
+        family = rule.get("family")
+        if family:
+            taken = claimed.setdefault(family, np.zeros(agg.n_groups, dtype=bool))
+            hit &= ~taken
+            taken |= hit
+
+        fired[i] = hit
+
+    return {"values": values, "fired": fired}
+
+
+def _format(rule: dict, value: float) -> str:
+    return rule["message"].format(value=value, window=rule.get("window"), threshold=rule["threshold"])
+
+
+def actionable_insights(
+    df: pd.DataFrame,
+    date_col: str,
+    sales_col: str,
+    sku_col: str | None = None,
+    outlet_col: str | None = None,
+    rules=None,
+) -> dict:
+    """
+    Evaluate the executive risk / opportunity rules.
+
+    Returns a dict with KPI snapshot values, `risks` and `opportunities`
+    as (priority, message) tuples, de-duplicated `actions`,
+    `priority_score` and `priority_level`.
+    """
+    rules = rules or INSIGHT_RULES
+    cols = {"date": date_col, "sales": sales_col, "sku": sku_col, "outlet": outlet_col}
+
+    def build():
+        agg = SharedAggregates(df, cols)
+        result = evaluate_rules(agg, rules)
+
+        monthly = agg.monthly[0]
+        growth = _month_growth(agg, 1)[0]
+        top_sku_share = _top_sku_share(agg, 1)[0] if sku_col else np.nan
+        inactive = _inactive_outlets(agg, HIGH_CHURN_DAYS)[0] if outlet_col else 0
+
+        risks, opportunities, actions = [], [], []
+        priority_score = 0
+
+        for rule, hit in zip(rules, result["fired"][:, 0]):
+            if not hit:
+                continue
+
+            entry = (rule["priority"], _format(rule, result["values"][rule["name"]][0]))
+            (risks if rule["kind"] == "risk" else opportunities).append(entry)
+            actions.append(rule["action"])
+            priority_score += rule["weight"]
+
+        return {
+            "total_sales": float(agg.total_sales[0]),
+            "avg_monthly_sales": float(monthly.mean()) if len(monthly) else 0.0,
+            "latest_month_sales": float(monthly[-1]) if len(monthly) else 0.0,
+            "top_sku_share": None if np.isnan(top_sku_share) else float(top_sku_share),
+            "recent_growth": None if np.isnan(growth) else float(growth),
+            "high_risk_outlets": int(inactive),
+            "risks": risks,
+            "opportunities": opportunities,
+            "actions": list(dict.fromkeys(actions)),
+            "priority_score": priority_score,
+            "priority_level": priority_level(priority_score),
+        }
+
+    key = (tuple(cols.items()), ruleset_version(rules))
+    return _results.get(df, key, build)
+
+
+# -------------------------------------------------
+# Batch Drill-Down (every group of a dimension)
+# -------------------------------------------------
+@timed("aggregation")
+def insight_offenders(df: pd.DataFrame, cols: dict, dim_col: str, rules=None, top: int | None = None) -> pd.DataFrame:
+    """
+    Evaluate every rule for every member of `dim_col` (brand, zone,
+    outlet, ...) with grouped array operations.
+
+    Returns one row per member ranked worst first: Sales, Score (sum of
+    fired rule weights), Priority_Level, Rules_Fired, Triggered (rule
+    names) and one value column per rule. Cached like
+    actionable_insights.
+    """
+    rules = rules or INSIGHT_RULES
+
+    if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+    if dim_col not in df.columns:
+        raise KeyError(f"Column not found: {dim_col}")
+
+    def build():
+        agg = SharedAggregates(df, cols, dim_col)
+        result = evaluate_rules(agg, rules)
+        fired = result["fired"]
+
+        weights = np.array([rule["weight"] for rule in rules], dtype=np.int64)
+        score = weights @ fired
+
+        labels = np.full(agg.n_groups, "🟢 LOW PRIORITY", dtype=object)
+        for floor, label in reversed(PRIORITY_LEVELS):
+            labels[score >= floor] = label
+
+        names = np.array([rule["name"] + ", " for rule in rules], dtype=object)
+        triggered = (np.where(fired.T, names, "")).sum(axis=1) if len(rules) else np.full(agg.n_groups, "")
+
+        table = pd.DataFrame({
+            dim_col: agg.groups,
+            "Sales": agg.total_sales,
+            "Score": score,
+            "Priority_Level": labels,
+            "Rules_Fired": fired.sum(axis=0),
+            "Triggered": pd.Series(triggered, dtype=object).str.rstrip(", ").to_numpy(),
+        })
+        for rule in rules:
+            table[rule["name"]] = result["values"][rule["name"]]
+
+        return table.sort_values(["Score", "Sales"], ascending=False, ignore_index=True)
+
+    key = (tuple(sorted(cols.items(), key=str)), dim_col, ruleset_version(rules))
+    table = _results.get(df, key, build)
+    return table.head(top) if top else table
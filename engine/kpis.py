@@ -0,0 +1,41 @@
+# engine/kpis.py
+# -------------------------------------------------
+# Executive KPI Snapshot
+# -------------------------------------------------
+
+import pandas as pd
+
+from utils.dataset_cache import derive_fingerprint
+from utils.date_normalizer import to_datetime_fast
+from utils.metrics import kpi_aov, kpi_orders, kpi_total_sales
+
+
+def with_valid_dates(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    """
+    Return a frame whose `date_col` is parsed to datetime and
+    whose unparseable rows are dropped. The input is never mutated;
+    the result is versioned off the input's fingerprint, not re-hashed.
+    """
+    if df is None or df.empty or date_col not in df.columns:
+        return df
+
+    parsed = to_datetime_fast(df[date_col])
+    out = df.assign(**{date_col: parsed}).loc[parsed.notna()]
+    derive_fingerprint(out, df, "with_valid_dates", date_col)
+    return out
+
+
+def executive_kpis(df: pd.DataFrame, sales_col: str, outlet_col: str | None = None) -> dict:
+    """
+    Headline numbers shown on the Executive / Sales / Product / Outlet pages.
+    """
+    kpis = {
+        "total_sales": kpi_total_sales(df, sales_col),
+        "orders": kpi_orders(df),
+        "avg_order_value": kpi_aov(df, sales_col),
+    }
+
+    if outlet_col and df is not None and outlet_col in df.columns:
+        kpis["outlets"] = int(df[outlet_col].nunique())
+
+    return kpis
@@ -0,0 +1,377 @@
+# engine/operations.py
+# -------------------------------------------------
+# Order Operations: State Funnel, Rejections & Spikes
+# -------------------------------------------------
+#
+# ORDERSTATE is encoded once per dataset: the distinct labels (a handful)
+# are classified into canonical states by whole-word pattern, then every row maps
+# through that small lookup as an integer code – no per-row string
+# matching. Orders are factorized once as well, and every breakdown is a
+# grouped np.bincount over those codes:
+#
+#   funnel      Placed -> Approved -> Delivered, with Rejected /
+#               Cancelled / Pending exits (final state per order)
+#   breakdown   rejection rate and revenue lost per outlet / SKU /
+#               rep / warehouse (distinct orders per member)
+#   spikes      daily rejection rate vs a trailing baseline (binomial z)
+#
+# All results are cached per dataset fingerprint.
+# -------------------------------------------------
+
+import re
+import numpy as np
+import pandas as pd
+
+from config import SIGNAL_WINDOW_DAYS, SIGNAL_Z_THRESHOLD
+from utils.dataset_cache import memoize_per_dataset
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+# canonical state -> whole-word label pattern. Progress states match the
+# completed form only ("Approved", not "Approval"), so "Approval Pending"
+# and "Pending Delivery" read as Pending.
+STATE_PATTERNS = {
+    "Rejected": r"reject\w*|declin\w*|denied|refused|disapproved",
+    "Cancelled": r"cancel\w*|void\w*|abort\w*",
+    "Delivered": r"delivered|completed?|fulfill?ed|invoiced|closed",
+    "Approved": r"approved|confirmed|accepted|dispatched|shipped|process\w*|in transit|out for delivery",
+    "Pending": r"pending|placed|new|open|hold|draft|submitted|awaiting",
+}
+
+# Exits: matched first, so a reason in the label ("Rejected - Not
+# Serviceable", "Cancelled - No Stock") keeps the rejection / cancellation
+TERMINAL_STATES = ["Rejected", "Cancelled"]
+
+# Negated / failed steps ("Not Delivered", "Undelivered", "Delivery
+# Failed", "Unapproved", "Returned") – never a progress state
+NEGATED_STATE_PATTERN = r"not|non|no|never|fail\w*|return\w*|un(?:deliver|approv|confirm|accept|fulfil|process|ship|invoic)\w*"
+
+_STATE_RES = {state: re.compile(rf"\b(?:{p})\b") for state, p in STATE_PATTERNS.items()}
+_NEGATED_RE = re.compile(rf"\b(?:{NEGATED_STATE_PATTERN})\b")
+
+ORDER_STATES = list(STATE_PATTERNS) + ["Other"]
+
+# Same-day tie-break for an order's final state: exits beat progress
+STATE_PRIORITY = {"Other": 0, "Pending": 1, "Approved": 2, "Delivered": 3, "Cancelled": 4, "Rejected": 5}
+
+# Funnel stage each final state has passed
+FUNNEL_STAGES = ["Placed", "Approved", "Delivered"]
+_STATE_REACH = {"Delivered": 2, "Approved": 1}
+
+# Roles offered for rejection breakdowns
+BREAKDOWN_ROLES = ["outlet", "sku", "rep", "warehouse", "brand", "city"]
+
+# Normal approximation of the daily binomial needs this many expected rejections
+MIN_EXPECTED_REJECTIONS = 5
+
+_results = memoize_per_dataset("operations", maxsize=32)
+
+
+def classify_state(label) -> str:
+    """
+    Canonical state for one raw ORDERSTATE label.
+
+    Rejected / Cancelled win whatever else the label says. A negated or
+    failed label is never a progress state (Delivered / Approved /
+    Pending), and labels matching no state or several are "Other":
+
+    >>> [classify_state(l) for l in ["Rejected - Not Serviceable", "Cancelled - No Stock",
+    ...                              "Order Cancelled (Not Required)", "Not Delivered"]]
+    ['Rejected', 'Cancelled', 'Cancelled', 'Other']
+    >>> [classify_state(l) for l in ["Undelivered", "Delivery Failed", "Unapproved",
+    ...                              "Approval Pending", "Dispatched", "Reject / Cancel"]]
+    ['Other', 'Other', 'Other', 'Pending', 'Approved', 'Other']
+    """
+    # "ORDER_APPROVED" / "OrderApproved" -> "order approved"
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", str(label))
+    text = " ".join(re.split(r"[^a-z0-9]+", text.lower())).strip()
+
+    matched = [state for state, pattern in _STATE_RES.items() if pattern.search(text)]
+
+    terminal = [state for state in matched if state in TERMINAL_STATES]
+    if terminal:
+        return terminal[0] if len(terminal) == 1 else "Other"
+
+    if _NEGATED_RE.search(text):
+        return "Other"
+
+    return matched[0] if len(matched) == 1 else "Other"
+
+
+def _state_col(cols: dict) -> str | None:
+    return cols.get("order_state")
+
+
+# -------------------------------------------------
+# Encoded Orders (shared by every result below)
+# -------------------------------------------------
+@timed("aggregation")
+def encoded_orders(df: pd.DataFrame, cols: dict) -> dict:
+    """
+    Row and order level codes for `df`:
+
+        row_state    int8 index into ORDER_STATES per row
+        row_order    order code per row (lines without an order id are
+                     their own order)
+        order_state  final state per order: its latest line by date,
+                     ties broken by STATE_PRIORITY
+        order_sales  net sales per order
+        order_day    date of that final line as int days (None without
+                     a date column)
+        row_sales    float64 line sales
+    """
+    state_col = _state_col(cols)
+    order_col = cols.get("order_id")
+    sales_col = cols.get("sales")
+    date_col = cols.get("date")
+
+    def build():
+        raw_codes, labels = pd.factorize(df[state_col])
+        lookup = np.array(
+            [ORDER_STATES.index(classify_state(label)) for label in labels] + [len(ORDER_STATES) - 1],
+            dtype=np.int8,
+        )
+        row_state = lookup[raw_codes]   # -1 (missing) picks the trailing "Other"
+
+        if order_col and order_col in df.columns:
+            row_order, order_ids = pd.factorize(df[order_col])
+            missing = row_order < 0
+            if missing.any():
+                row_order = row_order.copy()
+                row_order[missing] = len(order_ids) + np.arange(missing.sum())
+            n_orders = int(row_order.max()) + 1
+        else:
+            row_order = np.arange(len(df))
+            n_orders = len(df)
+
+        if sales_col and sales_col in df.columns:
+            row_sales = np.nan_to_num(numeric_column(df, sales_col).to_numpy(dtype=np.float64, na_value=np.nan))
+        else:
+            row_sales = np.zeros(len(df))
+
+        # Final state = the order's last line by (date, STATE_PRIORITY)
+        priority = np.array([STATE_PRIORITY[s] for s in ORDER_STATES], dtype=np.int8)[row_state]
+        days = None
+        if date_col and date_col in df.columns:
+            dates = to_datetime_fast(df[date_col])
+            days = np.where(
+                dates.notna().to_numpy(),
+                dates.to_numpy(dtype="datetime64[D]").astype(np.int64),
+                np.iinfo(np.int64).min,
+            )
+            sort = np.lexsort((priority, days, row_order))
+        else:
+            sort = np.lexsort((priority, row_order))
+
+        s_order = row_order[sort]
+        last = np.append(s_order[1:] != s_order[:-1], True)
+
+        order_state = np.full(n_orders, len(ORDER_STATES) - 1, dtype=np.int8)
+        order_state[s_order[last]] = row_state[sort][last]
+
+        order_day = None
+        if days is not None:
+            order_day = np.full(n_orders, np.iinfo(np.int64).min)
+            order_day[s_order[last]] = days[sort][last]
+
+        return {
+            "row_state": row_state,
+            "row_order": row_order,
+            "row_sales": row_sales,
+            "order_state": order_state,
+            "order_sales": np.bincount(row_order, weights=row_sales, minlength=n_orders),
+            "order_day": order_day,
+            "n_orders": n_orders,
+        }
+
+    key = ("orders", state_col, order_col, sales_col, date_col)
+    return _results.get(df, key, build)
+
+
+def _available(df: pd.DataFrame, cols: dict) -> bool:
+    state_col = _state_col(cols)
+    return df is not None and not df.empty and bool(state_col) and state_col in df.columns
+
+
+# -------------------------------------------------
+# Summary & Funnel
+# -------------------------------------------------
+def operations_summary(df: pd.DataFrame, cols: dict) -> dict:
+    """
+    Orders, per-state order counts / sales, rejection and cancellation
+    rates (% of orders) and the revenue lost to each. Empty dict when no
+    order-state column is detected.
+    """
+    if not _available(df, cols):
+        return {}
+
+    orders = encoded_orders(df, cols)
+    n = orders["n_orders"]
+    counts = np.bincount(orders["order_state"], minlength=len(ORDER_STATES))
+    sales = np.bincount(orders["order_state"], weights=orders["order_sales"], minlength=len(ORDER_STATES))
+
+    rejected = ORDER_STATES.index("Rejected")
+    cancelled = ORDER_STATES.index("Cancelled")
+    delivered = ORDER_STATES.index("Delivered")
+
+    return {
+        "orders": n,
+        "state_orders": dict(zip(ORDER_STATES, counts.tolist())),
+        "state_sales": dict(zip(ORDER_STATES, sales.tolist())),
+        "rejected_orders": int(counts[rejected]),
+        "rejection_rate": float(counts[rejected] / n * 100) if n else 0.0,
+        "cancelled_orders": int(counts[cancelled]),
+        "cancellation_rate": float(counts[cancelled] / n * 100) if n else 0.0,
+        "delivery_rate": float(counts[delivered] / n * 100) if n else 0.0,
+        "rejected_sales": float(sales[rejected]),
+        "cancelled_sales": float(sales[cancelled]),
+        "lost_share": float((sales[rejected] + sales[cancelled]) / sales.sum() * 100) if sales.sum() else 0.0,
+    }
+
+
+def order_funnel(df: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    """
+    Stage, Orders, Sales, Conversion_% (of placed) and Step_% (of the
+    previous stage) for Placed -> Approved -> Delivered, derived from
+    each order's final state.
+    """
+    if not _available(df, cols):
+        return pd.DataFrame()
+
+    def build():
+        orders = encoded_orders(df, cols)
+        reach_lookup = np.array([_STATE_REACH.get(s, 0) for s in ORDER_STATES], dtype=np.int8)
+        reach = reach_lookup[orders["order_state"]]
+
+        # Orders reaching stage k = orders whose furthest stage >= k
+        counts = np.bincount(reach, minlength=len(FUNNEL_STAGES))[::-1].cumsum()[::-1]
+        sales = np.bincount(reach, weights=orders["order_sales"], minlength=len(FUNNEL_STAGES))[::-1].cumsum()[::-1]
+
+        funnel = pd.DataFrame({"Stage": FUNNEL_STAGES, "Orders": counts, "Sales": sales})
+        placed = counts[0] or 1
+        funnel["Conversion_%"] = funnel["Orders"] / placed * 100
+        funnel["Step_%"] = funnel["Orders"] / funnel["Orders"].shift(1).fillna(placed).replace(0, 1) * 100
+        return funnel
+
+    return _results.get(df, ("funnel", _state_col(cols), cols.get("order_id"), cols.get("sales")), build)
+
+
+# -------------------------------------------------
+# Rejection Breakdown
+# -------------------------------------------------
+@timed("aggregation")
+def rejection_breakdown(df: pd.DataFrame, cols: dict, role: str, min_orders: int = 1) -> pd.DataFrame:
+    """
+    One row per member of the `role` column (outlet, sku, rep, warehouse,
+    ...): Orders (distinct orders involving the member), Rejected_Orders,
+    Rejection_Rate_%, Sales, Rejected_Sales (the member's sales in
+    rejected orders) and Lost_Share_%. Sorted by Rejected_Sales.
+    """
+    group_col = cols.get(role)
+    if not _available(df, cols) or not group_col or group_col not in df.columns:
+        return pd.DataFrame()
+
+    def build():
+        orders = encoded_orders(df, cols)
+        rejected = ORDER_STATES.index("Rejected")
+
+        member, members = pd.factorize(df[group_col])
+        valid = member >= 0
+        n_members = len(members)
+        n_orders = orders["n_orders"]
+
+        # One definition for counts and revenue: the order's final state
+        row_rejected = orders["order_state"][orders["row_order"]] == rejected
+        row_sales = orders["row_sales"]
+
+        # Distinct (member, order) pairs -> orders per member
+        pairs = pd.unique(member[valid].astype(np.int64) * n_orders + orders["row_order"][valid])
+        pair_member = pairs // n_orders
+        pair_rejected = orders["order_state"][pairs % n_orders] == rejected
+
+        order_count = np.bincount(pair_member, minlength=n_members)
+        rejected_count = np.bincount(pair_member, weights=pair_rejected, minlength=n_members)
+        sales = np.bincount(member[valid], weights=row_sales[valid], minlength=n_members)
+        lost = np.bincount(member[valid], weights=row_sales[valid] * row_rejected[valid], minlength=n_members)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table = pd.DataFrame({
+                group_col: members,
+                "Orders": order_count,
+                "Rejected_Orders": rejected_count.astype(np.int64),
+                "Rejection_Rate_%": np.where(order_count > 0, rejected_count / order_count * 100, 0.0),
+                "Sales": sales,
+                "Rejected_Sales": lost,
+                "Lost_Share_%": np.where(sales > 0, lost / sales * 100, 0.0),
+            })
+
+        return table.sort_values("Rejected_Sales", ascending=False, ignore_index=True)
+
+    key = ("breakdown", group_col, _state_col(cols), cols.get("order_id"), cols.get("sales"))
+    table = _results.get(df, key, build)
+    return table[table["Orders"] >= min_orders] if min_orders > 1 else table
+
+
+# -------------------------------------------------
+# Daily Rejection Spikes
+# -------------------------------------------------
+@timed("aggregation")
+def rejection_spikes(df: pd.DataFrame, cols: dict, window: int = SIGNAL_WINDOW_DAYS) -> pd.DataFrame:
+    """
+    Date, Orders, Rejected_Orders, Rejection_Rate_%, Baseline_% (rate over
+    the preceding `window` days), Z (binomial z of the day against that
+    baseline) and Spike (Z > SIGNAL_Z_THRESHOLD).
+    """
+    if not _available(df, cols) or not cols.get("date"):
+        return pd.DataFrame()
+
+    def build():
+        orders = encoded_orders(df, cols)
+        if orders["order_day"] is None:
+            return pd.DataFrame()
+
+        dated = orders["order_day"] != np.iinfo(np.int64).min
+        if not dated.any():
+            return pd.DataFrame()
+
+        day = orders["order_day"][dated]
+        first = day.min()
+        offset = day - first
+        span = int(offset.max()) + 1
+
+        total = np.bincount(offset, minlength=span).astype(np.float64)
+        rejected = np.bincount(
+            offset, weights=orders["order_state"][dated] == ORDER_STATES.index("Rejected"), minlength=span
+        )
+
+        # Trailing window sums (excluding the day itself) via cumulative sums
+        ctotal = np.concatenate([[0.0], total.cumsum()])
+        crejected = np.concatenate([[0.0], rejected.cumsum()])
+        start = np.maximum(np.arange(span) - window, 0)
+        base_total = ctotal[np.arange(span)] - ctotal[start]
+        base_rejected = crejected[np.arange(span)] - crejected[start]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(total > 0, rejected / total, np.nan)
+            baseline = np.where(base_total > 0, base_rejected / base_total, np.nan)
+            spread = np.sqrt(total * baseline * (1 - baseline))
+            z = np.where(spread > 0, (rejected - total * baseline) / spread, np.nan)
+
+        # Full baseline window and enough volume required before a day can be flagged
+        z[np.arange(span) < window] = np.nan
+        z[total * baseline < MIN_EXPECTED_REJECTIONS] = np.nan
+
+        table = pd.DataFrame({
+            "Date": pd.to_datetime(first + np.arange(span), unit="D"),
+            "Orders": total.astype(np.int64),
+            "Rejected_Orders": rejected.astype(np.int64),
+            "Rejection_Rate_%": rate * 100,
+            "Baseline_%": baseline * 100,
+            "Z": z,
+        })
+        table["Spike"] = table["Z"] > SIGNAL_Z_THRESHOLD
+        return table[table["Orders"] > 0].reset_index(drop=True)
+
+    key = ("spikes", _state_col(cols), cols.get("order_id"), cols.get("date"), window)
+    return _results.get(df, key, build)
@@ -0,0 +1,95 @@
+# engine/outlets.py
+# -------------------------------------------------
+# Outlet Churn, Risk Profile & Segmentation
+# -------------------------------------------------
+
+import pandas as pd
+
+from config import DEFAULT_CLUSTERS, HIGH_CHURN_DAYS, MEDIUM_CHURN_DAYS
+from utils.churn_analysis import churn_risk
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.risk_scoring import outlet_risk_score
+from utils.segmentation import segment_outlets
+
+
+def churn_table(df: pd.DataFrame, outlet_col: str, date_col: str) -> pd.DataFrame:
+    """Last order date, days inactive, Churn_Risk and Risk_Score per outlet."""
+    return outlet_risk_score(churn_risk(df, outlet_col, date_col))
+
+
+@timed("aggregation")
+def outlet_profile(
+    df: pd.DataFrame,
+    outlet_col: str,
+    sales_col: str | None = None,
+    qty_col: str | None = None,
+    date_col: str | None = None,
+) -> pd.DataFrame:
+    """
+    One row per outlet: Total_Sales, Total_Quantity, Last_Order_Date,
+    Days_Since_Last_Order and a recency-based Risk_Score.
+    """
+    if df is None or df.empty or outlet_col not in df.columns:
+        return pd.DataFrame()
+
+    columns = [c for c in (outlet_col, sales_col, qty_col, date_col) if c]
+    features = df[columns].copy()
+
+    if date_col:
+        features[date_col] = to_datetime_fast(features[date_col])
+
+    agg_map = {}
+    rename_map = {}
+
+    if sales_col:
+        agg_map[sales_col] = "sum"
+        rename_map[sales_col] = "Total_Sales"
+    if qty_col:
+        agg_map[qty_col] = "sum"
+        rename_map[qty_col] = "Total_Quantity"
+    if date_col:
+        agg_map[date_col] = "max"
+        rename_map[date_col] = "Last_Order_Date"
+
+    if not agg_map:
+        return features[[outlet_col]].drop_duplicates().reset_index(drop=True)
+
+    profile = (
+        features.groupby(outlet_col)
+        .agg(agg_map)
+        .reset_index()
+        .rename(columns=rename_map)
+    )
+
+    return score_recency(profile)
+
+
+def score_recency(profile: pd.DataFrame) -> pd.DataFrame:
+    """(Re)compute Days_Since_Last_Order and Risk_Score from Last_Order_Date."""
+    if "Last_Order_Date" in profile.columns:
+        profile["Days_Since_Last_Order"] = (
+            pd.Timestamp.today() - profile["Last_Order_Date"]
+        ).dt.days
+
+        profile["Risk_Score"] = pd.cut(
+            profile["Days_Since_Last_Order"],
+            bins=[-1, MEDIUM_CHURN_DAYS, HIGH_CHURN_DAYS, 9999],
+            labels=["Low Risk", "Medium Risk", "High Risk"]
+        )
+    else:
+        profile["Risk_Score"] = "Unknown"
+
+    return profile
+
+
+def segment_profile(profile: pd.DataFrame, outlet_col: str, n_clusters: int = DEFAULT_CLUSTERS) -> pd.DataFrame:
+    """
+    KMeans segments over the numeric outlet features.
+    The outlet identifier is kept out of the feature space.
+    """
+    if profile is None or profile.empty:
+        return pd.DataFrame()
+
+    segmented = segment_outlets(profile.set_index(outlet_col), n_clusters)
+    return segmented.reset_index()
@@ -0,0 +1,304 @@
+# engine/precompute.py
+# -------------------------------------------------
+# Precompute Worker: materialize page artifacts per dataset version
+# -------------------------------------------------
+#
+# In-process:   start_worker()  (daemon thread, one per process)
+# Standalone:   python -m engine.precompute --watch
+# -------------------------------------------------
+
+import argparse
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from config import (
+    DEFAULT_CLUSTERS,
+    DEFAULT_FORECAST_MONTHS,
+    PRECOMPUTE_POLL_SECONDS,
+    PRECOMPUTE_REFRESH_HOURS,
+)
+from engine.cli import to_jsonable
+from engine.cube import sales_cube
+from engine.insights import ruleset_version
+from engine.outlets import score_recency
+from engine.reports import REPORTS, run_reports
+from utils.column_detector import auto_detect_columns
+from utils.dataset_cache import (
+    artifact_manifest,
+    current_version,
+    dataset_fingerprint,
+    load_artifact,
+    load_version,
+    save_artifact,
+    write_artifact_manifest,
+)
+from utils.instrumentation import track
+
+DEFAULT_OPTIONS = {
+    "months": DEFAULT_FORECAST_MONTHS,
+    "clusters": DEFAULT_CLUSTERS,
+    "rules": ruleset_version(),
+}
+
+# Reports measured against today's date: re-scored on read where a
+# cheap re-scorer exists, otherwise served only on the day they were built
+RESCORE_ON_READ = {"outlet_profile": score_recency}
+DATED_REPORTS = {"churn", "segments", "insights"}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _today() -> str:
+    """Local calendar date the recency columns are measured against."""
+    return pd.Timestamp.today().date().isoformat()
+
+
+# -------------------------------------------------
+# Materialization
+# -------------------------------------------------
+def materialize(version: str, df: pd.DataFrame | None = None) -> dict:
+    """
+    Compute and persist every report plus the sales cube for `version`.
+    Reports already merged incrementally (a "partial" manifest built for
+    the same columns) are kept. Returns the artifact manifest.
+    """
+    previous = artifact_manifest(version) or {}
+    kept = {}
+    if previous.get("state") == "partial" and previous.get("options") == DEFAULT_OPTIONS:
+        kept = {name: r for name, r in previous.get("reports", {}).items() if r.get("ok")}
+
+    write_artifact_manifest(version, {
+        **(previous if kept else {}),
+        "version": version,
+        "state": "running",
+        "started_at": _now().isoformat(timespec="seconds"),
+    })
+
+    try:
+        with track("ingest", "precompute_load") as rec:
+            df = load_version(version) if df is None else df
+            rec.rows = len(df)
+
+        cols = auto_detect_columns(df)
+        if previous.get("cols") != cols:
+            kept = {}
+        reports = dict(kept)
+
+        with track("aggregation", "precompute_reports", rows=len(df)):
+            pending = [name for name in REPORTS if name not in kept]
+            results = run_reports(df, pending, cols=cols, **DEFAULT_OPTIONS) if pending else {}
+            if "cube" not in kept:
+                results["cube"] = sales_cube(df, cols)
+
+        for name, result in results.items():
+            if isinstance(result, dict) and set(result) == {"error"}:
+                reports[name] = result
+                continue
+
+            save_artifact(version, name, result if isinstance(result, pd.DataFrame) else to_jsonable(result))
+            reports[name] = {"ok": True}
+
+        manifest = {
+            "version": version,
+            "state": "ready",
+            "materialized_at": _now().isoformat(timespec="seconds"),
+            "as_of": _today(),
+            "rows": int(len(df)),
+            "cols": cols,
+            "options": DEFAULT_OPTIONS,
+            "reports": reports,
+        }
+    except Exception as e:
+        manifest = {
+            "version": version,
+            "state": "failed",
+            "failed_at": _now().isoformat(timespec="seconds"),
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+    write_artifact_manifest(version, manifest)
+    return manifest
+
+
+def artifact_status(version: str | None) -> dict:
+    """
+    Staleness of precomputed artifacts for a dataset version.
+
+    state: missing | running | partial | ready | stale | failed
+    """
+    manifest = artifact_manifest(version)
+
+    if not manifest:
+        return {"state": "missing", "version": version}
+
+    status = {"state": manifest.get("state", "missing"), "version": version}
+
+    if status["state"] == "running":
+        started = datetime.fromisoformat(manifest["started_at"])
+        if (_now() - started).total_seconds() > 3600:
+            # Worker died mid-run – allow a rebuild
+            status["state"] = "stale"
+
+    elif status["state"] in ("ready", "partial"):
+        materialized = datetime.fromisoformat(manifest["materialized_at"])
+        age_hours = (_now() - materialized).total_seconds() / 3600
+        status["materialized_at"] = materialized
+        status["age_hours"] = age_hours
+
+        if age_hours > PRECOMPUTE_REFRESH_HOURS:
+            status["state"] = "stale"
+
+    return status
+
+
+def needs_materialize(version: str | None) -> bool:
+    return bool(version) and artifact_status(version)["state"] in ("missing", "partial", "stale")
+
+
+# -------------------------------------------------
+# Read Path (pages)
+# -------------------------------------------------
+def cached_report(df: pd.DataFrame, name: str, cols: dict | None = None, **options):
+    """
+    Serve a report from precomputed artifacts when they are complete and
+    fresh (ready / partial, within PRECOMPUTE_REFRESH_HOURS) and were built
+    for this exact dataset, column mapping and options (including the
+    insight rule-set version); compute it live otherwise. Recency columns
+    are re-scored against today (RESCORE_ON_READ); DATED_REPORTS are only
+    served on the day they were built. Raises ValueError for reports that
+    cannot be produced.
+    """
+    cols = cols or auto_detect_columns(df)
+    version = dataset_fingerprint(df)
+    manifest = artifact_manifest(version)
+
+    if (
+        manifest
+        and artifact_status(version)["state"] in ("ready", "partial")
+        and manifest.get("reports", {}).get(name, {}).get("ok")
+        and manifest.get("cols") == cols
+        and all(manifest.get("options", {}).get(k) == v for k, v in {**DEFAULT_OPTIONS, **options}.items())
+        and (name not in DATED_REPORTS or manifest.get("as_of") == _today())
+    ):
+        result = load_artifact(version, name)
+        if isinstance(result, pd.DataFrame) and name in RESCORE_ON_READ:
+            result = RESCORE_ON_READ[name](result)
+        if result is not None:
+            return result
+
+    if name == "cube":
+        return sales_cube(df, cols)
+
+    result = run_reports(df, [name], cols=cols, **{**DEFAULT_OPTIONS, **options})[name]
+
+    if isinstance(result, dict) and set(result) == {"error"}:
+        raise ValueError(result["error"])
+
+    return result
+
+
+# -------------------------------------------------
+# Worker
+# -------------------------------------------------
+class PrecomputeWorker(threading.Thread):
+    """
+    Polls the dataset cache and materializes artifacts whenever the
+    CURRENT version has none (or they are older than the refresh window).
+    """
+
+    def __init__(self, poll_seconds: int = PRECOMPUTE_POLL_SECONDS):
+        super().__init__(name="fmcg-precompute", daemon=True)
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+
+    def wake(self):
+        """Check for a new dataset version immediately."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    def run_once(self) -> dict | None:
+        version = current_version()
+        if needs_materialize(version):
+            return materialize(version)
+        return None
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                pass
+
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_worker() -> PrecomputeWorker:
+    """Start (once per process) and return the background worker."""
+    global _worker
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = PrecomputeWorker()
+            _worker.start()
+
+    return _worker
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m engine.precompute",
+        description="Materialize dashboard artifacts for the cached dataset",
+    )
+    parser.add_argument("--watch", action="store_true", help="Keep polling for new dataset versions")
+    parser.add_argument("--version", help="Materialize this version instead of CURRENT")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if artifacts are fresh")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        worker = PrecomputeWorker()
+        print(f"Watching dataset cache every {worker.poll_seconds}s (Ctrl+C to stop)")
+        try:
+            while True:
+                manifest = worker.run_once()
+                if manifest:
+                    print(f"  {manifest['version']}: {manifest['state']}")
+                time.sleep(worker.poll_seconds)
+        except KeyboardInterrupt:
+            return 0
+
+    version = args.version or current_version()
+    if not version:
+        print("No dataset published to the cache yet.")
+        return 1
+
+    if not args.force and not needs_materialize(version):
+        print(f"{version}: artifacts are fresh")
+        return 0
+
+    manifest = materialize(version)
+    print(f"{version}: {manifest['state']}")
+    for name, result in manifest.get("reports", {}).items():
+        print(f"  {'✓' if result.get('ok') else '✗'} {name}")
+
+    return 0 if manifest["state"] == "ready" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+# engine/profiling.py
+# -------------------------------------------------
+# Column Profiling Engine (Data Quality Monitor)
+# -------------------------------------------------
+#
+# One chunked pass per dataset computes, for every column: null count,
+# HyperLogLog distinct estimate, min / max, top values and (numeric)
+# quantiles from a bottom-k sketch. Profiles are cached per dataset
+# fingerprint, in memory and as a dataset-cache artifact.
+#
+# Fast mode profiles a stratified sample instead and adds 95%
+# confidence bounds for null rates and medians.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    PROFILE_CHUNK_ROWS,
+    PROFILE_SAMPLE_ROWS,
+    PROFILE_TOP_VALUES,
+)
+from utils.dataset_cache import dataset_fingerprint, dataset_meta, load_artifact, memoize_per_dataset, save_artifact
+from utils.instrumentation import timed
+from utils.sketches import HyperLogLog, QuantileSketch, hash_values
+
+QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+Z_95 = 1.96
+
+_profiles = memoize_per_dataset("profiles", maxsize=8)
+
+
+# -------------------------------------------------
+# Stratified Sample
+# -------------------------------------------------
+def stratified_sample(
+    df: pd.DataFrame,
+    n: int = PROFILE_SAMPLE_ROWS,
+    strata_col: str | None = None,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    ~n rows sampled proportionally from each stratum.
+
+    Strata are the values of `strata_col` when given, otherwise 100
+    contiguous row blocks (robust to files sorted by date or region).
+    """
+    if len(df) <= n:
+        return df
+
+    frac = n / len(df)
+
+    if strata_col and strata_col in df.columns:
+        return (
+            df.groupby(strata_col, observed=True, dropna=False, group_keys=False)
+            .sample(frac=frac, random_state=seed)
+        )
+
+    rng = np.random.default_rng(seed)
+    edges = np.linspace(0, len(df), 101, dtype=np.int64)
+    positions = np.concatenate([
+        lo + rng.choice(hi - lo, size=max(1, round((hi - lo) * frac)), replace=False)
+        for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo
+    ])
+    return df.take(np.sort(positions))
+
+
+# -------------------------------------------------
+# Chunked Profiling Pass
+# -------------------------------------------------
+def _new_state(series: pd.Series) -> dict:
+    numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    return {
+        "dtype": str(series.dtype),
+        "nulls": 0,
+        "hll": HyperLogLog(),
+        "min": None,
+        "max": None,
+        "counts": pd.Series(dtype="int64"),
+        "sketch": QuantileSketch() if numeric else None,
+        "orderable": numeric or pd.api.types.is_datetime64_any_dtype(series),
+        "float": pd.api.types.is_float_dtype(series),
+    }
+
+
+def _update_state(state: dict, series: pd.Series):
+    nulls = int(series.isna().sum())
+    state["nulls"] += nulls
+
+    if nulls == len(series):
+        return
+
+    state["hll"].update(hash_values(series))
+
+    if state["orderable"]:
+        lo, hi = series.min(), series.max()
+        state["min"] = lo if state["min"] is None else min(state["min"], lo)
+        state["max"] = hi if state["max"] is None else max(state["max"], hi)
+
+    if state["sketch"] is not None:
+        state["sketch"].update(series.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    if not state["float"]:
+        # Keep a generous head per chunk so merged top values stay accurate
+        head = series.value_counts(dropna=True).head(PROFILE_TOP_VALUES * 20)
+        state["counts"] = state["counts"].add(head, fill_value=0)
+
+
+def _finish_state(column: str, state: dict, rows: int) -> dict:
+    top = state["counts"].sort_values(ascending=False).head(PROFILE_TOP_VALUES)
+    q = state["sketch"].quantiles(QUANTILES) if state["sketch"] else [None] * len(QUANTILES)
+
+    return {
+        "Column": str(column),
+        "Dtype": state["dtype"],
+        "Null_Count": state["nulls"],
+        "Null_%": round(state["nulls"] / rows * 100, 2) if rows else 0.0,
+        "Distinct_Est": state["hll"].estimate(),
+        "Min": None if state["min"] is None else str(state["min"]),
+        "Max": None if state["max"] is None else str(state["max"]),
+        "P01": q[0],
+        "P25": q[1],
+        "P50": q[2],
+        "P75": q[3],
+        "P99": q[4],
+        "Top_Values": ", ".join(f"{k} ({int(v):,})" for k, v in top.items()),
+    }
+
+
+@timed("aggregation")
+def _profile_pass(df: pd.DataFrame, chunk_rows: int = PROFILE_CHUNK_ROWS) -> pd.DataFrame:
+    states = {col: _new_state(df[col]) for col in df.columns}
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        for col in df.columns:
+            _update_state(states[col], chunk[col])
+
+    return pd.DataFrame([_finish_state(col, states[col], len(df)) for col in df.columns])
+
+
+def _add_confidence_bounds(profile: pd.DataFrame, sample: pd.DataFrame, total_rows: int):
+    n = len(sample)
+    fpc = np.sqrt(max(0.0, 1 - n / total_rows))
+
+    p = profile["Null_Count"] / n
+    margin = Z_95 * np.sqrt(p * (1 - p) / n) * fpc
+
+    profile["Null_Count"] = (p * total_rows).round().astype("int64")
+    profile["Null_%"] = (p * 100).round(2)
+    profile["Null_%_Low"] = ((p - margin).clip(lower=0) * 100).round(2)
+    profile["Null_%_High"] = ((p + margin).clip(upper=1) * 100).round(2)
+
+    # Sample quantiles plus order-statistic bounds for the median
+    spread = Z_95 * np.sqrt(n * 0.25) / n
+    probs = QUANTILES + [max(0.0, 0.5 - spread), min(1.0, 0.5 + spread)]
+    rows = []
+
+    for col in profile["Column"]:
+        series = sample[col] if col in sample.columns else None
+        if (
+            series is not None
+            and pd.api.types.is_numeric_dtype(series)
+            and not pd.api.types.is_bool_dtype(series)
+            and series.notna().any()
+        ):
+            rows.append(series.quantile(probs).to_numpy(dtype=np.float64))
+        else:
+            rows.append(np.full(len(probs), np.nan))
+
+    values = np.vstack(rows)
+    for i, name in enumerate(["P01", "P25", "P50", "P75", "P99", "P50_Low", "P50_High"]):
+        profile[name] = values[:, i]
+
+    return profile
+
+
+# -------------------------------------------------
+# Public API
+# -------------------------------------------------
+def profile_dataset(
+    df: pd.DataFrame,
+    fast: bool = False,
+    strata_col: str | None = None,
+) -> pd.DataFrame:
+    """
+    Column profile table (one row per column).
+
+    fast=True profiles a stratified sample: Null_Count is scaled to the
+    full frame, Null_%_Low / _High and P50_Low / _High are 95% bounds,
+    and Distinct_Est is a lower bound. Rows_Profiled records the sample
+    size either way.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    mode = f"sample:{strata_col or ''}" if fast else "full"
+
+    def build():
+        version = dataset_fingerprint(df)
+        artifact = f"profile_{'sample' if fast else 'full'}"
+        profile = None
+
+        if not strata_col:
+            try:
+                profile = load_artifact(version, artifact)
+            except Exception:
+                profile = None
+
+        if profile is None:
+            data = stratified_sample(df, strata_col=strata_col) if fast else df
+            profile = _profile_pass(data)
+            profile["Rows_Profiled"] = len(data)
+
+            if fast:
+                profile = _add_confidence_bounds(profile, data, len(df))
+
+            if not strata_col and dataset_meta(version) is not None:
+                try:
+                    save_artifact(version, artifact, profile)
+                except Exception:
+                    pass
+
+        return profile
+
+    return _profiles.get(df, (mode,), build)
@@ -0,0 +1,94 @@
+# engine/reports.py
+# -------------------------------------------------
+# Batch Report Registry
+# -------------------------------------------------
+#
+# Each report takes (df, cols, options) and returns a DataFrame or a
+# JSON-serialisable dict. `cols` is the auto_detect_columns mapping.
+# -------------------------------------------------
+
+import pandas as pd
+
+from config import DEFAULT_CLUSTERS, DEFAULT_FORECAST_MONTHS
+from engine.forecast import sales_forecast
+from engine.insights import actionable_insights
+from engine.kpis import executive_kpis, with_valid_dates
+from engine.outlets import churn_table, outlet_profile, segment_profile
+from engine.timeseries import daily_sales, monthly_sales
+from utils.column_detector import auto_detect_columns
+
+
+def _kpis(df, cols, options):
+    return executive_kpis(with_valid_dates(df, cols["date"]), cols["sales"], cols.get("outlet"))
+
+
+def _daily(df, cols, options):
+    return daily_sales(df, cols["date"], cols["sales"])
+
+
+def _monthly(df, cols, options):
+    return monthly_sales(df, cols["date"], cols["sales"])
+
+
+def _insights(df, cols, options):
+    return actionable_insights(df, cols["date"], cols["sales"], cols.get("sku"), cols.get("outlet"))
+
+
+def _churn(df, cols, options):
+    return churn_table(df, cols["outlet"], cols["date"])
+
+
+def _outlet_profile(df, cols, options):
+    return outlet_profile(df, cols["outlet"], cols.get("sales"), cols.get("quantity"), cols.get("date"))
+
+
+def _segments(df, cols, options):
+    profile = outlet_profile(df, cols["outlet"], cols.get("sales"), cols.get("quantity"), cols.get("date"))
+    return segment_profile(profile, cols["outlet"], options.get("clusters", DEFAULT_CLUSTERS))
+
+
+def _forecast(df, cols, options):
+    _, forecast = sales_forecast(df, cols["date"], cols["sales"], options.get("months", DEFAULT_FORECAST_MONTHS))
+    return forecast
+
+
+# name -> (builder, required column roles)
+REPORTS = {
+    "kpis": (_kpis, ["date", "sales"]),
+    "daily_sales": (_daily, ["date", "sales"]),
+    "monthly_sales": (_monthly, ["date", "sales"]),
+    "insights": (_insights, ["date", "sales"]),
+    "churn": (_churn, ["outlet", "date"]),
+    "outlet_profile": (_outlet_profile, ["outlet"]),
+    "segments": (_segments, ["outlet"]),
+    "forecast": (_forecast, ["date", "sales"]),
+}
+
+
+def run_reports(df: pd.DataFrame, names=None, cols: dict | None = None, **options) -> dict:
+    """
+    Run the requested reports (all by default).
+
+    Returns {name: result}. Reports that cannot run (missing columns,
+    insufficient history) map to {"error": "..."} instead of raising.
+    """
+    cols = cols or auto_detect_columns(df)
+    results = {}
+
+    for name in names or REPORTS:
+        if name not in REPORTS:
+            raise KeyError(f"Unknown report: {name}")
+
+        builder, required = REPORTS[name]
+        missing = [role for role in required if not cols.get(role)]
+
+        if missing:
+            results[name] = {"error": f"Missing columns: {', '.join(missing)}"}
+            continue
+
+        try:
+            results[name] = builder(df, cols, options)
+        except (ValueError, KeyError) as e:
+            results[name] = {"error": str(e)}
+
+    return results
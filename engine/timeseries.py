@@ -0,0 +1,75 @@
+# engine/timeseries.py
+# -------------------------------------------------
+# Daily / Monthly Sales Series
+# -------------------------------------------------
+#
+# Both views derive from the shared daily series in utils/series_store,
+# which is built once per dataset.
+# -------------------------------------------------
+
+import pandas as pd
+
+from utils.calendar_growth import GROWTH_COLUMNS, calendar_growth
+from utils.instrumentation import timed
+from utils.series_store import daily_series, period_growth, resample_series, rolling_mean
+
+
+def daily_sales(df: pd.DataFrame, date_col: str, sales_col: str) -> pd.DataFrame:
+    """
+    Day-level sales with rolling averages and growth indicators.
+
+    Columns: Date, Daily_Sales, 7D_Rolling_Avg, 14D_Rolling_Avg,
+             MTD_Sales, Prior_MTD_Sales, MoM_Growth_% (MTD vs prior MTD),
+             SDLY_Sales, YoY_Growth_% (vs same day last year)
+    Raises ValueError / KeyError when no daily series can be built.
+    """
+    daily = daily_series(df, date_col, sales_col)
+    return add_daily_indicators(daily.reset_index())
+
+
+def add_daily_indicators(daily: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill calendar gaps and (re)compute rolling averages and
+    calendar-correct growth on a (Date, Daily_Sales) frame.
+    """
+    series = (
+        daily.set_index("Date")["Daily_Sales"]
+        .sort_index()
+        .asfreq("D", fill_value=0)
+        .rename_axis("Date")
+    )
+
+    daily = series.reset_index()
+
+    daily["7D_Rolling_Avg"] = rolling_mean(series, 7).to_numpy()
+    daily["14D_Rolling_Avg"] = rolling_mean(series, 14).to_numpy()
+
+    growth = calendar_growth(series)
+    for col in GROWTH_COLUMNS:
+        daily[col] = growth[col].to_numpy()
+
+    return daily
+
+
+def monthly_from_daily(daily: pd.DataFrame) -> pd.DataFrame:
+    """Monthly (ds, y, Growth_%) series derived from a daily (Date, Daily_Sales) frame."""
+    return _monthly_frame(resample_series(daily.set_index("Date")["Daily_Sales"], "MS"))
+
+
+def _monthly_frame(monthly: pd.Series) -> pd.DataFrame:
+    frame = pd.DataFrame({"ds": monthly.index, "y": monthly.to_numpy()})
+    frame["Growth_%"] = period_growth(frame["y"])
+    return frame
+
+
+@timed("aggregation")
+def monthly_sales(df: pd.DataFrame, date_col: str, sales_col: str) -> pd.DataFrame:
+    """
+    Month-start sales series in Prophet layout (ds, y) plus Growth_%.
+    """
+    try:
+        daily = daily_series(df, date_col, sales_col)
+    except (ValueError, KeyError):
+        return pd.DataFrame(columns=["ds", "y", "Growth_%"])
+
+    return _monthly_frame(resample_series(daily, "MS"))
@@ -1,8 +1,13 @@
 import streamlit as st
-import pandas as pd
 
 from utils.snowflake_connector import get_snowflake_connection
 from config import SESSION_DF_KEY
+from utils.column_detector import ROLE_SPECS, resolve_schema, schema_override, set_schema_override
+from utils.data_loader import load_dataset
+from utils.excel_ingest import list_sheets
+from utils.instrumentation import begin_page
+
+begin_page("Upload Dataset")
 
 st.header("📤 Data Ingestion")
 st.caption("Upload FMCG data or connect to Snowflake")
@@ -13,17 +18,79 @@ source = st.radio("Select Data Source", ["Upload File", "Snowflake"])
 # FILE UPLOAD
 # =====================================================
 if source == "Upload File":
+    mode = "replace"
+    if st.session_state.get(SESSION_DF_KEY) is not None:
+        choice = st.radio(
+            "Upload Mode",
+            ["Replace dataset", "Append new orders"],
+            horizontal=True,
+            help="Append merges only orders (ORDER_ID) not already loaded"
+        )
+        mode = "append" if choice == "Append new orders" else "replace"
+
     file = st.file_uploader("Upload CSV / Excel", type=["csv", "xlsx"])
 
+    sheets = None
+    if file and file.name.lower().endswith(".xlsx"):
+        try:
+            meta = list_sheets(file.getvalue())
+        except Exception as e:
+            st.error(f"❌ Could not read workbook: {e}")
+            file, meta = None, []
+
+        if len(meta) > 1:
+            labels = {
+                m["name"]: f"{m['name']} ({m['rows']:,} rows)" if m["rows"] is not None else m["name"]
+                for m in meta
+            }
+            sheets = st.multiselect(
+                "Sheets to load",
+                list(labels),
+                default=[meta[0]["name"]],
+                format_func=labels.get,
+                help="Selected sheets are stacked into one dataset",
+            )
+            if not sheets:
+                st.info("Select at least one sheet")
+                file = None
+
     if file:
-        if file.name.endswith(".csv"):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
-
-        st.session_state[SESSION_DF_KEY] = df
-        st.session_state["data_source"] = "Upload"
-        st.success("✅ File uploaded successfully")
+        if mode == "append":
+            if st.button("➕ Append Orders"):
+                load_dataset(file, mode="append", sheets=sheets)
+        elif load_dataset(file, sheets=sheets) is not None:
+            st.success("✅ File uploaded successfully")
+
+    # -------------------------------------------------
+    # COLUMN MAPPING (persisted per schema)
+    # -------------------------------------------------
+    df = st.session_state.get(SESSION_DF_KEY)
+
+    if df is not None and not df.empty:
+        with st.expander("🧭 Column Mapping"):
+            st.caption("Detected business columns. Overrides are saved for every dataset with this schema.")
+
+            detected = resolve_schema(df)
+            current = schema_override(df)
+            options = ["(auto)"] + [str(c) for c in df.columns]
+
+            choices = {}
+            mapping_cols = st.columns(2)
+            for i, role in enumerate(ROLE_SPECS):
+                auto = detected.get(role)
+                chosen = current.get(role)
+                choices[role] = mapping_cols[i % 2].selectbox(
+                    f"{role.title()} (auto: {auto or '—'})",
+                    options,
+                    index=options.index(str(chosen)) if chosen is not None and str(chosen) in options else 0,
+                    key=f"schema_role_{role}",
+                )
+
+            if st.button("💾 Save Column Mapping"):
+                set_schema_override(df, {
+                    role: col for role, col in choices.items() if col != "(auto)"
+                })
+                st.success("✅ Column mapping saved")
 
 
 # =====================================================
@@ -1,9 +1,14 @@
 import streamlit as st
+import pandas as pd
 import plotly.express as px
 
 from config import SESSION_DF_KEY
+from engine.precompute import cached_report
 from utils.column_detector import auto_detect_columns
-from utils.safe_dataframe import prepare_daily_sales_df
+from utils.instrumentation import begin_page
+from utils.series_store import dimension_matrix
+
+begin_page("Advanced Daily Analysis")
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -41,11 +46,7 @@ if not date_col or not sales_col:
 # PREPARE DAILY DATA
 # -------------------------------------------------
 try:
-    daily_df = prepare_daily_sales_df(
-        df=df,
-        date_col=date_col,
-        sales_col=sales_col
-    )
+    daily_df = cached_report(df, "daily_sales", cols)
 except Exception as e:
     st.error("❌ Unable to generate daily analysis")
     st.code(str(e))
@@ -72,7 +73,7 @@ st.divider()
 # -------------------------------------------------
 fig = px.line(
     daily_df,
-    x=date_col,
+    x="Date",
     y=["Daily_Sales", "7D_Rolling_Avg", "14D_Rolling_Avg"],
     title="Daily Sales with Rolling Averages",
     labels={"value": "Sales Value", "variable": "Metric"},
@@ -85,6 +86,45 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True)
 
+# -------------------------------------------------
+# DAILY TREND BY DIMENSION
+# -------------------------------------------------
+dimensions = {
+    label: cols.get(role)
+    for label, role in [("Brand", "brand"), ("State", "state"), ("City", "city"), ("SKU", "sku")]
+    if cols.get(role)
+}
+
+if dimensions:
+    st.markdown("### 🔎 Daily Trend by Dimension")
+
+    dim_label = st.selectbox("Break down by", list(dimensions))
+
+    try:
+        members, dates, values = dimension_matrix(df, date_col, sales_col, dimensions[dim_label])
+    except (ValueError, KeyError) as e:
+        st.info(f"ℹ {e}")
+    else:
+        ranked = members[values.sum(axis=1).argsort()[::-1]]
+        selected = st.multiselect(
+            f"{dim_label} members",
+            ranked.tolist(),
+            default=ranked[:5].tolist()
+        )
+
+        if selected:
+            rows = members.get_indexer(selected)
+            dim_df = pd.DataFrame(values[rows].T, index=dates, columns=[str(m) for m in selected])
+
+            dim_fig = px.line(
+                dim_df.rolling(7, min_periods=1).mean(),
+                title=f"7-Day Rolling Sales by {dim_label}",
+                labels={"value": "Sales Value", "variable": dim_label},
+            )
+            dim_fig.update_layout(hovermode="x unified")
+
+            st.plotly_chart(dim_fig, use_container_width=True)
+
 # -------------------------------------------------
 # EXECUTIVE NOTE
 # -------------------------------------------------
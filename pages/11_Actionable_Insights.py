@@ -1,10 +1,13 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 
-from config import SESSION_DF_KEY, HIGH_CHURN_DAYS, ENABLE_AI_SUMMARY
+from config import SESSION_DF_KEY, ENABLE_AI_SUMMARY, SIGNAL_WINDOW_DAYS
+from engine.insights import PRIORITY_LEVELS, insight_offenders
+from engine.precompute import cached_report
+from utils.business_signal_engine import dimension_signals, metric_signals
 from utils.column_detector import auto_detect_columns
-from utils.churn_analysis import churn_risk
+from utils.instrumentation import begin_page
+
+begin_page("Actionable Insights")
 
 # =================================================
 # PAGE CONFIG
@@ -47,100 +50,41 @@ if not date_col or not sales_col:
     st.error("❌ Date & Sales columns are mandatory for insights.")
     st.stop()
 
-df[date_col] = pd.to_datetime(df[date_col])
-
 # =================================================
-# EXECUTIVE KPI SNAPSHOT
+# INSIGHT ENGINE (HEADLESS)
 # =================================================
-monthly_sales_df = (
-    df
-    .groupby(pd.Grouper(key=date_col, freq="M"))[sales_col]
-    .sum()
-    .reset_index()
-)
+insights = cached_report(df, "insights", cols)
+
+total_sales = insights["total_sales"]
+latest_month_sales = insights["latest_month_sales"]
+top_sku_share = insights["top_sku_share"]
+recent_growth = insights["recent_growth"]
+priority_score = insights["priority_score"]
+priority_level = insights["priority_level"]
 
-total_sales = df[sales_col].sum()
-avg_monthly_sales = monthly_sales_df[sales_col].mean()
-latest_month_sales = monthly_sales_df[sales_col].iloc[-1]
+risks = insights["risks"]
+opportunities = insights["opportunities"]
+actions = insights["actions"]
 
+# =================================================
+# EXECUTIVE KPI SNAPSHOT
+# =================================================
 k1, k2, k3, k4 = st.columns(4)
 
 k1.metric("Total Revenue", f"₹{total_sales:,.0f}")
-k2.metric("Avg Monthly Revenue", f"₹{avg_monthly_sales:,.0f}")
+k2.metric("Avg Monthly Revenue", f"₹{insights['avg_monthly_sales']:,.0f}")
 k3.metric("Latest Month Revenue", f"₹{latest_month_sales:,.0f}")
 
-if sku_col:
-    sku_sales = df.groupby(sku_col)[sales_col].sum().sort_values(ascending=False)
-    top_sku_share = sku_sales.iloc[0] / sku_sales.sum() * 100
+if top_sku_share is not None:
     k4.metric("Top SKU Dependency", f"{top_sku_share:.1f}%")
 else:
-    top_sku_share = None
     k4.metric("Top SKU Dependency", "N/A")
 
 st.divider()
 
-# =================================================
-# INSIGHT ENGINES WITH PRIORITY
-# =================================================
-risks = []
-opportunities = []
-actions = []
-
-priority_score = 0  # used for CEO summary
-
-# -------------------------------------------------
-# SALES MOMENTUM RISK
-# -------------------------------------------------
-monthly_sales_df["Growth_%"] = monthly_sales_df[sales_col].pct_change() * 100
-recent_growth = monthly_sales_df["Growth_%"].iloc[-1]
-
-if recent_growth < -5:
-    risks.append(("High", "📉 Sales momentum has declined sharply (>5%) in the most recent month."))
-    actions.append("Conduct immediate review of pricing, stock availability, and distributor coverage.")
-    priority_score += 3
-elif recent_growth < 0:
-    risks.append(("Medium", "⚠️ Sales growth has turned negative, indicating early demand softening."))
-    actions.append("Monitor distributor orders and field execution closely.")
-    priority_score += 2
-
-# -------------------------------------------------
-# SKU CONCENTRATION RISK
-# -------------------------------------------------
-if sku_col and top_sku_share and top_sku_share > 40:
-    risks.append(("High", f"🧩 Revenue concentration risk detected — top SKU contributes {top_sku_share:.1f}% of sales."))
-    actions.append("Reduce dependency by pushing secondary SKUs and bundle strategies.")
-    priority_score += 3
-
-# -------------------------------------------------
-# OUTLET CHURN RISK
-# -------------------------------------------------
-if outlet_col:
-    churn_df = churn_risk(df, outlet_col, date_col)
-    high_risk_outlets = (churn_df["Churn_Risk"] == "High").sum()
-
-    if high_risk_outlets > 0:
-        risks.append(("High", f"🚨 {high_risk_outlets} outlets inactive for over {HIGH_CHURN_DAYS} days."))
-        actions.append("Launch outlet reactivation schemes and optimize beat planning.")
-        priority_score += 3
-
-# -------------------------------------------------
-# GROWTH OPPORTUNITY
-# -------------------------------------------------
-if monthly_sales_df["Growth_%"].mean() > 3:
-    opportunities.append(("Medium", "🚀 Consistent average monthly growth above 3%."))
-    actions.append("Scale production and distributor allocation to capture momentum.")
-    priority_score += 1
-
 # =================================================
 # PRIORITY BADGE
 # =================================================
-if priority_score >= 7:
-    priority_level = "🔴 HIGH PRIORITY"
-elif priority_score >= 4:
-    priority_level = "🟠 MEDIUM PRIORITY"
-else:
-    priority_level = "🟢 LOW PRIORITY"
-
 st.markdown(f"### Executive Priority Level: **{priority_level}**")
 
 st.divider()
@@ -169,11 +113,88 @@ with c2:
 with c3:
     st.subheader("📌 Recommended Actions")
     if actions:
-        for a in set(actions):
+        for a in actions:
             st.markdown(f"- {a}")
     else:
         st.success("Current strategy appears optimal.")
 
+# =================================================
+# DRILL-DOWN: WORST OFFENDERS BY DIMENSION
+# =================================================
+drilldowns = {
+    label: cols.get(role)
+    for label, role in [("Brand", "brand"), ("Zone", "zone"), ("State", "state"), ("City", "city"), ("Outlet", "outlet")]
+    if cols.get(role)
+}
+
+if drilldowns:
+    st.divider()
+    st.subheader("🗺️ Drill-Down: Worst Offenders")
+    st.caption("The same insight rules evaluated for every member of the selected dimension.")
+
+    drill_label = st.selectbox("Evaluate rules by", list(drilldowns))
+    drill_col = drilldowns[drill_label]
+
+    try:
+        offenders = insight_offenders(df, cols, drill_col)
+    except (ValueError, KeyError) as e:
+        st.info(f"ℹ {e}")
+    else:
+        flagged = offenders[offenders["Rules_Fired"] > 0]
+
+        d1, d2, d3 = st.columns(3)
+        d1.metric(f"{drill_label}s Evaluated", f"{len(offenders):,}")
+        d2.metric(f"{drill_label}s Flagged", f"{len(flagged):,}")
+        d3.metric("High Priority", f"{int((offenders['Priority_Level'] == PRIORITY_LEVELS[0][1]).sum()):,}")
+
+        st.dataframe(
+            flagged.head(50)[[drill_col, "Priority_Level", "Score", "Sales", "Triggered"]],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+# =================================================
+# EARLY-WARNING SIGNALS (ROLLING VOLATILITY)
+# =================================================
+st.divider()
+st.subheader("📡 Early-Warning Signals")
+st.caption(
+    f"Rolling {SIGNAL_WINDOW_DAYS}-day volatility, z-score anomalies and trend breaks on daily totals."
+)
+
+SIGNAL_COLUMNS = ["Series", "Priority", "Signal", "Recent_CV", "Anomaly_Days", "Trend_Change_%", "Action"]
+
+metrics = [c for c in [sales_col, cols.get("quantity")] if c]
+
+try:
+    st.dataframe(
+        metric_signals(df, date_col, metrics)[SIGNAL_COLUMNS],
+        use_container_width=True,
+        hide_index=True,
+    )
+except (ValueError, KeyError) as e:
+    st.info(f"ℹ {e}")
+
+dimensions = {
+    label: cols.get(role)
+    for label, role in [("Brand", "brand"), ("State", "state"), ("Outlet", "outlet")]
+    if cols.get(role)
+}
+
+if dimensions:
+    dim_label = st.selectbox("Signals by", list(dimensions))
+
+    try:
+        dim_table = dimension_signals(df, date_col, sales_col, dimensions[dim_label])
+    except (ValueError, KeyError) as e:
+        st.info(f"ℹ {e}")
+    else:
+        st.dataframe(
+            dim_table[SIGNAL_COLUMNS].head(25),
+            use_container_width=True,
+            hide_index=True,
+        )
+
 # =================================================
 # AI-GENERATED CEO SUMMARY (TEXT ONLY)
 # =================================================
@@ -185,7 +206,7 @@ if ENABLE_AI_SUMMARY:
 **Overall Business Health:** {priority_level.replace('🔴','').replace('🟠','').replace('🟢','')}
 
 • Total revenue stands at ₹{total_sales:,.0f} with latest month contributing ₹{latest_month_sales:,.0f}.
-• Sales momentum shows {'decline' if recent_growth < 0 else 'stability'} in the most recent period.
+• Sales momentum shows {'decline' if recent_growth is not None and recent_growth < 0 else 'stability'} in the most recent period.
 • Revenue concentration {'is high' if top_sku_share and top_sku_share > 40 else 'remains within acceptable limits'}.
 • Outlet churn risk requires {'immediate attention' if priority_score >= 7 else 'continuous monitoring'}.
 
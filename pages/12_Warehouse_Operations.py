@@ -0,0 +1,156 @@
+# pages/12_Warehouse_Operations.py
+# -------------------------------------------------
+# Warehouse Throughput, Fill Rate & Rejections
+# -------------------------------------------------
+
+import streamlit as st
+
+from engine.cube import order_cube
+from utils.column_detector import auto_detect_columns
+from utils.warehouse_metrics import warehouse_rollup
+from utils.instrumentation import begin_page
+
+begin_page("Warehouse Operations")
+
+# -------------------------------------------------
+# Page Config
+# -------------------------------------------------
+st.set_page_config(
+    page_title="Warehouse Operations | DS Group",
+    page_icon="🏭",
+    layout="wide"
+)
+
+st.title("🏭 Warehouse Operations")
+st.caption("Throughput, fill rate and rejections – network → warehouse → SKU drill-down")
+
+st.divider()
+
+# -------------------------------------------------
+# Load Dataset
+# -------------------------------------------------
+df = st.session_state.get("df")
+
+if df is None or df.empty:
+    st.warning("📤 Please upload dataset or connect Snowflake.")
+    st.stop()
+
+# -------------------------------------------------
+# Auto Detect Columns
+# -------------------------------------------------
+cols = auto_detect_columns(df)
+
+required = ["warehouse", "order_state", "sales", "date"]
+missing = [c for c in required if not cols.get(c)]
+
+if missing:
+    st.error(f"❌ Required columns missing: {missing}")
+    st.stop()
+
+wh_col = cols["warehouse"]
+sku_col = cols.get("sku")
+
+# -------------------------------------------------
+# Shared Cube (warehouse × day × SKU, cached)
+# -------------------------------------------------
+cube = order_cube(df, cols)
+
+if cube.empty:
+    st.info("No dated orders available for warehouse analysis.")
+    st.stop()
+
+KPI_FORMAT = {
+    "Sales": "{:,.0f}",
+    "Quantity": "{:,.0f}",
+    "Lines": "{:,}",
+    "Orders": "{:,}",
+    "Delivered_Quantity": "{:,.0f}",
+    "Rejected_Orders": "{:,}",
+    "Rejected_Sales": "{:,.0f}",
+    "Active_Days": "{:,}",
+    "Orders_Per_Day": "{:,.1f}",
+    "Lines_Per_Order": "{:.2f}",
+    "Avg_Order_Value": "{:,.0f}",
+    "Fill_Rate_%": "{:.1f}%",
+    "Rejection_Rate_%": "{:.2f}%",
+}
+
+
+def kpi_row(summary):
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("📦 Orders / Day", f"{summary['Orders_Per_Day']:,.1f}")
+    k2.metric("🧾 Lines / Order", f"{summary['Lines_Per_Order']:.2f}")
+    k3.metric("✅ Fill Rate", f"{summary['Fill_Rate_%']:.1f}%")
+    k4.metric("🚫 Rejection Rate", f"{summary['Rejection_Rate_%']:.2f}%")
+
+
+# -------------------------------------------------
+# Network Level
+# -------------------------------------------------
+warehouses = warehouse_rollup(cube, [wh_col])
+
+network = cube.assign(Network="All").pipe(warehouse_rollup, ["Network"]).iloc[0]
+kpi_row(network)
+
+st.subheader("🏭 Warehouse Scorecard")
+
+st.dataframe(
+    warehouses.style.format(KPI_FORMAT),
+    use_container_width=True,
+    hide_index=True
+)
+
+c1, c2 = st.columns(2)
+c1.bar_chart(warehouses.set_index(wh_col)["Orders_Per_Day"], use_container_width=True)
+c1.caption("Orders per active day")
+c2.bar_chart(warehouses.set_index(wh_col)["Rejection_Rate_%"], use_container_width=True)
+c2.caption("Rejection rate (% of orders)")
+
+st.divider()
+
+# -------------------------------------------------
+# Warehouse Drill-Down
+# -------------------------------------------------
+selected = st.selectbox("🔎 Drill into warehouse", warehouses[wh_col].tolist())
+
+wh_cube = cube[cube[wh_col] == selected]
+summary = warehouses[warehouses[wh_col] == selected].iloc[0]
+
+st.subheader(f"🏭 {selected}")
+kpi_row(summary)
+
+daily = warehouse_rollup(wh_cube, [wh_col, "Date"]).set_index("Date")
+
+t1, t2 = st.columns(2)
+t1.line_chart(daily["Orders"], use_container_width=True)
+t1.caption("Orders per day")
+t2.line_chart(daily[["Fill_Rate_%", "Rejection_Rate_%"]], use_container_width=True)
+t2.caption("Daily fill rate and rejection rate")
+
+# -------------------------------------------------
+# SKU Drill-Down
+# -------------------------------------------------
+if sku_col:
+    st.subheader("📦 SKU Performance in Warehouse")
+
+    skus = warehouse_rollup(wh_cube, [sku_col], item_col=sku_col)
+
+    st.dataframe(
+        skus.head(50).style.format(KPI_FORMAT),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    sku = st.selectbox("🔎 Drill into SKU", skus[sku_col].head(200).tolist())
+
+    sku_daily = warehouse_rollup(
+        wh_cube[wh_cube[sku_col] == sku], [sku_col, "Date"], item_col=sku_col
+    ).set_index("Date")
+
+    st.line_chart(sku_daily[["Quantity", "Delivered_Quantity"]], use_container_width=True)
+    st.caption(f"{sku}: ordered vs delivered quantity per day")
+
+# -------------------------------------------------
+# Success
+# -------------------------------------------------
+st.success("Warehouse Operations loaded successfully ✅")
@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
 from utils.snowflake_connector import get_snowflake_connection
-from config import SESSION_DF_KEY
+from config import SESSION_DF_KEY, ENABLE_PRECOMPUTE_WORKER
+from engine.precompute import start_worker
+from utils.dataset_cache import publish_dataset
+from utils.frame_compaction import prepare_dataset
+from utils.instrumentation import begin_page
+
+begin_page("Snowflake SQL Studio")
 
 st.header("🧊 Snowflake SQL Studio")
 st.caption("Run secure read-only SQL queries and load results")
@@ -51,6 +57,13 @@ if st.button("▶ Run Query"):
 # -------------------------------------------------
 if "_sql_result" in st.session_state:
     if st.button("📥 Load Result into Application"):
-        st.session_state[SESSION_DF_KEY] = st.session_state["_sql_result"]
+        st.session_state[SESSION_DF_KEY] = prepare_dataset(st.session_state["_sql_result"])
         st.session_state["data_source"] = "Snowflake SQL"
         st.success("✅ Data loaded into dashboards")
+
+        if ENABLE_PRECOMPUTE_WORKER:
+            try:
+                publish_dataset(st.session_state[SESSION_DF_KEY], source="snowflake")
+                start_worker().wake()
+            except Exception as e:
+                st.info(f"ℹ Dashboards will compute on demand (cache unavailable: {e})")
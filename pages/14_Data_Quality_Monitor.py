@@ -2,6 +2,15 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from config import FAST_PROFILE_MIN_ROWS, PROFILE_SAMPLE_ROWS
+from engine.duplicates import duplicate_report
+from engine.profiling import profile_dataset
+from utils.instrumentation import begin_page, track
+from utils.date_normalizer import to_datetime_fast
+from utils.type_inference import infer_date_columns
+
+begin_page("Data Quality Monitor")
+
 st.set_page_config(page_title="Data Quality Monitor", layout="wide")
 
 st.title("🧪 Enterprise Data Quality Monitor")
@@ -19,20 +28,37 @@ if df is None:
     st.stop()
 
 # -------------------------------------------------
-# Metrics
+# Column Profiles (chunked pass, cached per dataset)
 # -------------------------------------------------
 total_rows = len(df)
 total_cols = df.shape[1]
-null_cells = df.isna().sum().sum()
-duplicate_rows = df.duplicated().sum()
+
+fast_mode = st.toggle(
+    "⚡ Fast mode (stratified sample)",
+    value=total_rows >= FAST_PROFILE_MIN_ROWS,
+    help=f"Profile ~{PROFILE_SAMPLE_ROWS:,} sampled rows and show 95% confidence bounds"
+)
+
+with track("aggregation", "column_profile", rows=total_rows):
+    profile = profile_dataset(df, fast=fast_mode)
+
+with track("aggregation", "null_and_duplicate_scan", rows=total_rows):
+    null_cells = int(profile["Null_Count"].sum())
+    duplicate_rows = duplicate_report(df)["duplicate_rows"]
 
 c1, c2, c3, c4 = st.columns(4)
 
 c1.metric("Rows", f"{total_rows:,}")
 c2.metric("Columns", total_cols)
-c3.metric("Null Values", f"{null_cells:,}")
+c3.metric("Null Values", f"{'~' if fast_mode else ''}{null_cells:,}")
 c4.metric("Duplicate Rows", f"{duplicate_rows:,}")
 
+if fast_mode:
+    st.caption(
+        f"⚡ Estimated from {int(profile['Rows_Profiled'].iloc[0]):,} sampled rows • "
+        "distinct counts are lower bounds"
+    )
+
 st.divider()
 
 # -------------------------------------------------
@@ -40,13 +66,11 @@ st.divider()
 # -------------------------------------------------
 st.subheader("🚨 Column-wise Null Analysis")
 
-null_df = (
-    df.isna().sum()
-    .reset_index()
-    .rename(columns={"index": "Column", 0: "Null_Count"})
-)
+null_columns = ["Column", "Null_Count", "Null_%"]
+if fast_mode:
+    null_columns += ["Null_%_Low", "Null_%_High"]
 
-null_df["Null_%"] = (null_df["Null_Count"] / total_rows * 100).round(2)
+null_df = profile[null_columns]
 
 st.dataframe(
     null_df.sort_values("Null_%", ascending=False),
@@ -54,24 +78,56 @@ st.dataframe(
 )
 
 # -------------------------------------------------
-# Freshness Check
+# Column Profiles
+# -------------------------------------------------
+st.subheader("📋 Column Profiles")
+
+st.dataframe(
+    profile.drop(columns=["Null_%_Low", "Null_%_High", "Rows_Profiled"], errors="ignore"),
+    use_container_width=True
+)
+
 # -------------------------------------------------
-date_cols = df.select_dtypes(include=["datetime", "object"]).columns
+# Duplicate Detection
+# -------------------------------------------------
+st.subheader("🔁 Duplicate Detection")
+
+dup_keys = st.multiselect(
+    "Duplicate key columns (empty = entire row)",
+    df.columns.tolist(),
+    help="e.g. ORDER_ID + SKU to catch the same order line loaded twice with different timestamps"
+)
 
+with track("aggregation", "duplicate_keys_scan", rows=total_rows):
+    dup = duplicate_report(df, dup_keys)
+
+d1, d2, d3 = st.columns(3)
+d1.metric("Duplicate Rows", f"{dup['duplicate_rows']:,}")
+d2.metric("Duplicate Groups", f"{dup['duplicate_groups']:,}")
+d3.metric("Largest Group", f"{dup['largest_group']:,}")
+
+if dup["duplicate_groups"]:
+    st.caption("Largest duplicate groups")
+    st.dataframe(dup["examples"], use_container_width=True)
+else:
+    st.success("✅ No duplicates for the selected key")
+
+# -------------------------------------------------
+# Freshness Check
+# -------------------------------------------------
 st.subheader("⏱ Data Freshness")
 
 freshness_results = []
 
-for col in date_cols:
-    try:
-        parsed = pd.to_datetime(df[col], errors="coerce")
+with track("aggregation", "freshness_scan", rows=total_rows):
+    for col, fmt in infer_date_columns(df).items():
+        parsed = to_datetime_fast(df[col], fmt)
         freshness_results.append({
             "Column": col,
+            "Format": fmt,
             "Latest_Date": parsed.max(),
             "Oldest_Date": parsed.min()
         })
-    except:
-        pass
 
 if freshness_results:
     st.dataframe(pd.DataFrame(freshness_results), use_container_width=True)
@@ -1,9 +1,13 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 from datetime import timedelta
 
 from config import SESSION_DF_KEY, CURRENCY_SYMBOL
+from engine.operations import operations_summary
+from utils.column_detector import auto_detect_columns
+from utils.instrumentation import begin_page, track
+from utils.schema_normalizer import canonical_view
+
+begin_page("AI Executive Chat")
 
 # =========================================================
 # PAGE CONFIG
@@ -22,8 +26,13 @@ if df is None or df.empty:
     st.warning("📥 Upload dataset to activate AI Executive Assistant.")
     st.stop()
 
-df.columns = [c.upper() for c in df.columns]
-df["ORDER_DATE"] = pd.to_datetime(df["ORDER_DATE"], errors="coerce")
+# Canonical names (SALES, DATE, OUTLET, ...) without touching the shared frame
+detected = auto_detect_columns(df)
+view = canonical_view(df, detected)
+
+if not view.has("SALES"):
+    st.error("❌ A sales / amount column is required for the AI Executive Assistant.")
+    st.stop()
 
 # =========================================================
 # SESSION CHAT MEMORY
@@ -83,13 +92,26 @@ if user_input:
 # =========================================================
 # CORE ANALYTICS ENGINE
 # =========================================================
+def unavailable(*names):
+    missing = [n for n in names if not view.has(n)]
+    if not missing:
+        return None
+
+    response = f"""
+ℹ️ **Not available for this dataset**
+
+This question needs: **{", ".join(missing)}**
+"""
+    return response, ["Total sales", "Overall performance"]
+
+
 def generate_response(question: str):
     q = question.lower()
     followups = []
 
     # ---------------- TOTAL SALES ----------------
     if "total sales" in q or "revenue" in q:
-        total_sales = df["AMOUNT"].sum()
+        total_sales = view.numeric("SALES").sum()
 
         response = f"""
 📊 **Total Sales Overview**
@@ -108,12 +130,15 @@ This represents the gross realized revenue across all orders in the dataset.
 
     # ---------------- PERFORMANCE ----------------
     elif "performance" in q:
+        orders = f"{view['ORDER_ID'].nunique():,}" if view.has("ORDER_ID") else "N/A"
+        outlets = f"{view['OUTLET'].nunique():,}" if view.has("OUTLET") else "N/A"
+
         response = f"""
 📊 **Overall Business Performance**
 
-• Total Sales: **{CURRENCY_SYMBOL}{df['AMOUNT'].sum():,.0f}**  
-• Total Orders: **{df['ORDER_ID'].nunique():,}**  
-• Active Outlets: **{df['OUTLET_ID'].nunique():,}**
+• Total Sales: **{CURRENCY_SYMBOL}{view.numeric('SALES').sum():,.0f}**  
+• Total Orders: **{orders}**  
+• Active Outlets: **{outlets}**
 
 **Executive Note:**  
 Performance is evaluated using sales volume, order throughput, and outlet coverage.
@@ -127,13 +152,13 @@ Performance is evaluated using sales volume, order throughput, and outlet covera
 
     # ---------------- MONTHLY SALES ----------------
     elif "month" in q:
-        monthly = (
-            df.groupby(df["ORDER_DATE"].dt.to_period("M"))["AMOUNT"]
-            .sum()
-            .reset_index()
-        )
+        missing = unavailable("DATE")
+        if missing:
+            return missing
+
+        monthly = view.numeric("SALES").groupby(view.dates().dt.to_period("M")).sum()
 
-        last_growth = monthly["AMOUNT"].pct_change().iloc[-1] * 100 if len(monthly) > 1 else 0
+        last_growth = monthly.pct_change().iloc[-1] * 100 if len(monthly) > 1 else 0
 
         response = f"""
 📈 **Monthly Sales Trend**
@@ -152,8 +177,13 @@ Month-over-month trends highlight demand momentum and early risk signals.
 
     # ---------------- SKU PERFORMANCE ----------------
     elif "sku" in q:
+        missing = unavailable("SKU")
+        if missing:
+            return missing
+
         top_sku = (
-            df.groupby("SKU_PLACED")["AMOUNT"]
+            view.numeric("SALES")
+            .groupby(view["SKU"])
             .sum()
             .sort_values(ascending=False)
             .head(1)
@@ -177,8 +207,13 @@ Revenue concentration at SKU level may indicate dependency risk.
 
     # ---------------- OUTLET RISK ----------------
     elif "outlet" in q and "risk" in q:
-        last_date = df["ORDER_DATE"].max()
-        inactive = df.groupby("OUTLET_ID")["ORDER_DATE"].max()
+        missing = unavailable("OUTLET", "DATE")
+        if missing:
+            return missing
+
+        dates = view.dates()
+        last_date = dates.max()
+        inactive = dates.groupby(view["OUTLET"]).max()
         inactive = inactive[inactive < last_date - timedelta(days=30)]
 
         response = f"""
@@ -198,13 +233,17 @@ Inactive outlets pose churn and revenue leakage risks.
 
     # ---------------- REJECTION ----------------
     elif "reject" in q:
-        rejected = df[df["ORDERSTATE"].str.contains("reject", case=False, na=False)]
-        rate = len(rejected) / len(df) * 100
+        missing = unavailable("ORDERSTATE")
+        if missing:
+            return missing
+
+        ops = operations_summary(df, detected)
 
         response = f"""
 🚫 **Order Rejection Analysis**
 
-Rejection rate: **{rate:.2f}%**
+Rejection rate: **{ops['rejection_rate']:.2f}%** of {ops['orders']:,} orders  
+Revenue lost to rejections: **{CURRENCY_SYMBOL}{ops['rejected_sales']:,.0f}**
 
 **Executive Note:**  
 Rejections impact fulfillment efficiency and customer trust.
@@ -249,7 +288,8 @@ for role, msg in st.session_state.chat_history:
 # =========================================================
 if st.session_state.chat_history and st.session_state.chat_history[-1][0] == "user":
     question = st.session_state.chat_history[-1][1]
-    answer, followups = generate_response(question)
+    with track("aggregation", "chat_response", rows=len(df)):
+        answer, followups = generate_response(question)
 
     with st.chat_message("assistant"):
         st.markdown(answer)
@@ -2,18 +2,16 @@
 # -------------------------------------------------
 
 import streamlit as st
-import pandas as pd
 
+from engine.kpis import executive_kpis, with_valid_dates
 from utils.column_detector import auto_detect_columns
-from utils.metrics import (
-    kpi_total_sales,
-    kpi_orders,
-    kpi_aov
-)
 from utils.visualizations import (
     line_sales_trend,
     bar_top
 )
+from utils.instrumentation import begin_page
+
+begin_page("Executive Overview")
 
 st.set_page_config(
     page_title="Executive Overview",
@@ -50,28 +48,28 @@ if missing:
 # -------------------------------------------------
 # Date Handling (SAFE)
 # -------------------------------------------------
-df = df.copy()
-df[cols["date"]] = pd.to_datetime(df[cols["date"]], errors="coerce")
-df = df.dropna(subset=[cols["date"]])
+df = with_valid_dates(df, cols["date"])
 
 # -------------------------------------------------
 # KPIs
 # -------------------------------------------------
+kpis = executive_kpis(df, cols["sales"])
+
 c1, c2, c3 = st.columns(3)
 
 c1.metric(
     "💰 Total Sales",
-    f"{kpi_total_sales(df, cols['sales']):,.0f}"
+    f"{kpis['total_sales']:,.0f}"
 )
 
 c2.metric(
     "🧾 Orders",
-    f"{kpi_orders(df):,}"
+    f"{kpis['orders']:,}"
 )
 
 c3.metric(
     "📊 Avg Order Value",
-    f"{kpi_aov(df, cols['sales']):,.0f}"
+    f"{kpis['avg_order_value']:,.0f}"
 )
 
 st.divider()
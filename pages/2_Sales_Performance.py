@@ -4,19 +4,17 @@
 # -------------------------------------------------
 
 import streamlit as st
-import pandas as pd
 
+from engine.kpis import executive_kpis, with_valid_dates
 from utils.column_detector import auto_detect_columns
 from utils.visualizations import (
     line_sales_trend,
     bar_top,
     heatmap
 )
-from utils.metrics import (
-    kpi_total_sales,
-    kpi_orders,
-    kpi_aov
-)
+from utils.instrumentation import begin_page
+
+begin_page("Sales Performance")
 
 st.set_page_config(
     page_title="Sales Performance",
@@ -53,28 +51,28 @@ if missing:
 # -------------------------------------------------
 # Date Handling (INLINE & SAFE)
 # -------------------------------------------------
-df = df.copy()
-df[cols["date"]] = pd.to_datetime(df[cols["date"]], errors="coerce")
-df = df.dropna(subset=[cols["date"]])
+df = with_valid_dates(df, cols["date"])
 
 # -------------------------------------------------
 # KPIs
 # -------------------------------------------------
+kpis = executive_kpis(df, cols["sales"])
+
 k1, k2, k3 = st.columns(3)
 
 k1.metric(
     "💰 Total Sales",
-    f"{kpi_total_sales(df, cols['sales']):,.0f}"
+    f"{kpis['total_sales']:,.0f}"
 )
 
 k2.metric(
     "🧾 Total Orders",
-    f"{kpi_orders(df):,}"
+    f"{kpis['orders']:,}"
 )
 
 k3.metric(
     "📊 Avg Order Value",
-    f"{kpi_aov(df, cols['sales']):,.0f}"
+    f"{kpis['avg_order_value']:,.0f}"
 )
 
 st.divider()
@@ -4,16 +4,16 @@
 # -------------------------------------------------
 
 import streamlit as st
-import pandas as pd
 
+from engine.kpis import executive_kpis, with_valid_dates
 from utils.column_detector import auto_detect_columns
-from utils.metrics import (
-    kpi_total_sales,
-    kpi_orders,
-)
 from utils.visualizations import (
     bar_top
 )
+from utils.ranking import concentration, group_totals, ranked_table
+from utils.instrumentation import begin_page
+
+begin_page("Outlet Distribution")
 
 # -------------------------------------------------
 # Page Config
@@ -53,28 +53,28 @@ if missing:
 # -------------------------------------------------
 # Safe Date Handling
 # -------------------------------------------------
-df = df.copy()
-df[cols["date"]] = pd.to_datetime(df[cols["date"]], errors="coerce")
-df = df.dropna(subset=[cols["date"]])
+df = with_valid_dates(df, cols["date"])
 
 # -------------------------------------------------
 # KPI SECTION
 # -------------------------------------------------
+kpis = executive_kpis(df, cols["sales"], cols["outlet"])
+
 k1, k2, k3 = st.columns(3)
 
 k1.metric(
     "🏪 Total Outlets",
-    f"{df[cols['outlet']].nunique():,}"
+    f"{kpis['outlets']:,}"
 )
 
 k2.metric(
     "💰 Total Sales",
-    f"{kpi_total_sales(df, cols['sales']):,.0f}"
+    f"{kpis['total_sales']:,.0f}"
 )
 
 k3.metric(
     "🧾 Total Orders",
-    f"{kpi_orders(df):,}"
+    f"{kpis['orders']:,}"
 )
 
 st.divider()
@@ -100,20 +100,42 @@ st.plotly_chart(
 # -------------------------------------------------
 st.subheader("📈 Outlet Sales Concentration")
 
-outlet_sales = (
-    df.groupby(cols["outlet"])[cols["sales"]]
-    .sum()
-    .sort_values(ascending=False)
-)
+# Same cached totals as the bar chart above – the outlets are grouped once
+outlet_sales = group_totals(df, cols["outlet"], cols["sales"])
+spread = concentration(outlet_sales, top=20)
 
-top_20_share = (
-    outlet_sales.head(20).sum() / outlet_sales.sum()
-) * 100
+if spread:
+    c1, c2, c3 = st.columns(3)
 
-st.metric(
-    "Top 20 Outlets Contribution",
-    f"{top_20_share:.2f}%"
-)
+    c1.metric(
+        "Top 20 Outlets Contribution",
+        f"{spread['top_share']:.2f}%"
+    )
+
+    c2.metric(
+        "Gini Coefficient",
+        f"{spread['gini']:.2f}"
+    )
+
+    abc = spread["abc"].set_index("Class")
+    c3.metric(
+        "A-Class Outlets",
+        f"{abc.loc['A', 'Members']:,}",
+        f"{abc.loc['A', 'Members'] / spread['members'] * 100:.1f}% of outlets",
+        delta_color="off"
+    )
+
+    p1, p2 = st.columns([3, 2])
+    p1.line_chart(
+        spread["pareto"].set_index("Members_%"),
+        use_container_width=True
+    )
+    p1.caption("Pareto curve: cumulative % of sales vs % of outlets (largest first)")
+    p2.dataframe(
+        spread["abc"].style.format({"Members": "{:,}", "Value": "{:,.0f}", "Share_%": "{:.1f}%"}),
+        use_container_width=True,
+        hide_index=True
+    )
 
 st.info(
     "📌 **Insight:** High concentration indicates dependency on a limited number "
@@ -124,11 +146,20 @@ st.info(
 # Outlet-Level Table
 # -------------------------------------------------
 with st.expander("📄 Outlet Sales Table"):
-    outlet_table = (
-        df.groupby(cols["outlet"], as_index=False)[cols["sales"]]
-        .sum()
-        .rename(columns={cols["sales"]: "Total_Sales"})
-        .sort_values("Total_Sales", ascending=False)
+    outlet_table = ranked_table(outlet_sales, 1_000, value_name="Total_Sales")
+
+    st.dataframe(
+        outlet_table.style.format({
+            "Total_Sales": "{:,.0f}",
+            "Share_%": "{:.2f}%",
+            "Cumulative_%": "{:.1f}%",
+        }),
+        use_container_width=True,
+        hide_index=True
     )
 
-    st.dataframe(outlet_table, use_container_width=True)
+    if len(outlet_sales) > len(outlet_table):
+        st.caption(
+            f"Top {len(outlet_table):,} of {len(outlet_sales):,} outlets; "
+            f"remaining outlets: {outlet_sales.sum() - outlet_table['Total_Sales'].sum():,.0f} in sales"
+        )
@@ -4,8 +4,18 @@
 # -------------------------------------------------
 
 import streamlit as st
+
+from engine.field_force import (
+    PRODUCTIVITY_METRICS,
+    productivity_distribution,
+    rep_day_productivity,
+    rep_productivity,
+)
 from utils.column_detector import auto_detect_columns
 from utils.visualizations import bar_top
+from utils.instrumentation import begin_page
+
+begin_page("Field Force Productivity")
 
 # -------------------------------------------------
 # Page Config
@@ -50,6 +60,87 @@ if not sales_col:
     st.warning("⚠ Sales column not detected.")
     st.stop()
 
+# -------------------------------------------------
+# Productivity Engine (visits, strike rate, coverage)
+# -------------------------------------------------
+reps = rep_productivity(df, cols)
+
+if reps.empty:
+    st.info("ℹ Outlet and order date columns are required for visit-level productivity.")
+else:
+    visits = reps["Visits"].sum()
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("🧑‍💼 Active Reps", f"{len(reps):,}")
+    k2.metric("🏪 Visits / Rep-Day", f"{visits / reps['Active_Days'].sum():.2f}")
+    k3.metric("🎯 Strike Rate", f"{reps['Productive_Calls'].sum() / visits * 100:.1f}%")
+    if "Visit_Minutes" in reps.columns and reps["Visit_Minutes"].sum() > 0:
+        k4.metric("⏱ Revenue / Visit-Minute", f"{reps['Sales'].sum() / reps['Visit_Minutes'].sum():,.0f}")
+    else:
+        k4.metric("🗺 Beat Coverage (median)", f"{reps['Beat_Coverage_%'].median():.1f}%")
+
+    # ---------------- Distribution ----------------
+    st.subheader("📈 Productivity Distribution Across Reps")
+
+    metrics = [m for m in PRODUCTIVITY_METRICS if m in reps.columns]
+    d1, d2 = st.columns([2, 1])
+    metric = d1.selectbox("Metric", metrics)
+
+    scope = reps
+    if "Designation" in reps.columns:
+        designations = ["All"] + sorted(reps["Designation"].dropna().astype(str).unique().tolist())
+        designation = d2.selectbox("Designation", designations)
+        if designation != "All":
+            scope = reps[reps["Designation"].astype(str) == designation]
+
+    distribution = productivity_distribution(scope, metric)
+
+    h1, h2 = st.columns([3, 1])
+    if not distribution["histogram"].empty:
+        h1.bar_chart(distribution["histogram"].set_index("Bin"), use_container_width=True)
+        h1.caption(f"Reps per {metric} bin (1st–99th percentile)")
+        h2.dataframe(
+            distribution["percentiles"].style.format({"Value": "{:,.2f}"}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    # ---------------- Leaders & laggards ----------------
+    ranked = scope.sort_values(metric, ascending=False, na_position="last")
+    rep_format = {
+        "Visits": "{:,}",
+        "Visits_Per_Day": "{:.2f}",
+        "Productive_Calls": "{:,}",
+        "Strike_Rate_%": "{:.1f}%",
+        "Sales": "{:,.0f}",
+        "Sales_Per_Day": "{:,.0f}",
+        "Visit_Minutes": "{:,.0f}",
+        "Minutes_Per_Visit": "{:.1f}",
+        "Revenue_Per_Minute": "{:,.1f}",
+        "Beat_Coverage_%": "{:.1f}%",
+    }
+
+    l1, l2 = st.columns(2)
+    l1.markdown(f"**🏆 Top 15 by {metric}**")
+    l1.dataframe(ranked.head(15).style.format(rep_format), use_container_width=True, hide_index=True)
+    l2.markdown(f"**🧭 Bottom 15 by {metric}**")
+    l2.dataframe(ranked.dropna(subset=[metric]).tail(15).style.format(rep_format), use_container_width=True, hide_index=True)
+
+    # ---------------- Rep drill-down ----------------
+    st.subheader("🔎 Rep Daily Activity")
+
+    rep_id = st.selectbox("Sales representative", ranked[rep_col].head(500).tolist())
+    days = rep_day_productivity(df, cols)
+    rep_days = days[days[rep_col] == rep_id].set_index("Date")
+
+    a1, a2 = st.columns(2)
+    a1.line_chart(rep_days[["Outlets_Visited", "Productive_Calls"]], use_container_width=True)
+    a1.caption("Outlets visited and productive calls per day")
+    a2.line_chart(rep_days["Beat_Coverage_%"], use_container_width=True)
+    a2.caption("Share of the rep's beat visited each day")
+
+st.divider()
+
 # -------------------------------------------------
 # Charts
 # -------------------------------------------------
@@ -91,6 +182,6 @@ else:
 st.info(
     "📌 **Insights:**\n\n"
     "- Identify top-performing sales representatives\n"
-    "- Detect underperformers for coaching\n"
+    "- Detect underperformers for coaching (low strike rate or beat coverage)\n"
     "- Align incentives with actual field contribution"
 )
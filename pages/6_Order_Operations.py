@@ -1,16 +1,32 @@
-# pages/6_Pricing_Discount_Analysis.py
+# pages/6_Order_Operations.py
 # --------------------------------------------------
-# 💸 Pricing & Discount Analysis (PRODUCTION SAFE)
+# 🚚 Order Operations, Pricing & Discounts (PRODUCTION SAFE)
 # --------------------------------------------------
 
 import streamlit as st
-import pandas as pd
 
+from engine.operations import (
+    BREAKDOWN_ROLES,
+    operations_summary,
+    order_funnel,
+    rejection_breakdown,
+    rejection_spikes,
+)
 from utils.column_detector import auto_detect_columns
-from utils.visualizations import bar_top
+from utils.pricing_metrics import (
+    discount_bands,
+    price_histogram,
+    price_statistics,
+    pricing_arrays,
+    pricing_totals,
+)
+from utils.price_elasticity import sku_elasticity
+from utils.instrumentation import begin_page
 
-st.header("💸 Pricing & Discount Analysis")
-st.caption("Analyze discount impact on sales & pricing effectiveness")
+begin_page("Order Operations")
+
+st.header("🚚 Order Operations")
+st.caption("Order funnel, rejections & revenue leakage, pricing and discount effectiveness")
 
 # --------------------------------------------------
 # Load Dataset
@@ -30,27 +46,132 @@ sales_col = cols.get("sales")
 qty_col = cols.get("quantity")
 discount_col = cols.get("discount")
 brand_col = cols.get("brand")
+sku_col = cols.get("sku")
+date_col = cols.get("date")
 
 # --------------------------------------------------
-# Derived Price (SAFE)
+# Order Funnel & Rejections (engine.operations, cached)
 # --------------------------------------------------
-df = df.copy()
+ops = operations_summary(df, cols)
+
+if ops:
+    o1, o2, o3, o4 = st.columns(4)
+    o1.metric("🧾 Orders", f"{ops['orders']:,}")
+    o2.metric("✅ Delivered", f"{ops['delivery_rate']:.1f}%")
+    o3.metric("🚫 Rejection Rate", f"{ops['rejection_rate']:.2f}%")
+    o4.metric("💸 Revenue Lost to Rejections", f"{ops['rejected_sales']:,.0f}")
+
+    st.subheader("🔻 Order Funnel")
+
+    funnel = order_funnel(df, cols)
+    f1, f2 = st.columns([2, 3])
+    f1.dataframe(
+        funnel.style.format({
+            "Orders": "{:,}",
+            "Sales": "{:,.0f}",
+            "Conversion_%": "{:.1f}%",
+            "Step_%": "{:.1f}%",
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    exits = {
+        state: ops["state_orders"][state]
+        for state in ("Pending", "Rejected", "Cancelled", "Other")
+        if ops["state_orders"][state]
+    }
+    f2.bar_chart(exits, use_container_width=True)
+    f2.caption("Orders that left the funnel (or are still open) by final state")
+
+    # ---------------- Rejection breakdown ----------------
+    st.subheader("🚫 Rejections by Dimension")
+
+    roles = [r for r in BREAKDOWN_ROLES if cols.get(r)]
+    if roles:
+        r1, r2 = st.columns([2, 1])
+        role = r1.selectbox(
+            "Break down by",
+            roles,
+            format_func=lambda r: f"{r.title()} ({cols[r]})"
+        )
+        min_orders = r2.number_input("Minimum orders", min_value=1, value=20, step=5)
+
+        breakdown = rejection_breakdown(df, cols, role, min_orders=int(min_orders))
+        st.dataframe(
+            breakdown.head(50).style.format({
+                "Orders": "{:,}",
+                "Rejected_Orders": "{:,}",
+                "Rejection_Rate_%": "{:.2f}%",
+                "Sales": "{:,.0f}",
+                "Rejected_Sales": "{:,.0f}",
+                "Lost_Share_%": "{:.2f}%",
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("Ranked by revenue lost to rejected orders")
+
+    # ---------------- Daily spikes ----------------
+    st.subheader("📈 Daily Rejection Rate")
 
-if sales_col and qty_col:
-    df["__unit_price__"] = df[sales_col] / df[qty_col].replace(0, pd.NA)
+    spikes = rejection_spikes(df, cols)
+    if not spikes.empty:
+        st.line_chart(
+            spikes.set_index("Date")[["Rejection_Rate_%", "Baseline_%"]],
+            use_container_width=True
+        )
+        flagged = spikes[spikes["Spike"]]
+        if flagged.empty:
+            st.success("No anomalous rejection spikes detected.")
+        else:
+            st.warning(f"{len(flagged)} day(s) with anomalous rejection spikes")
+            st.dataframe(
+                flagged.sort_values("Z", ascending=False).style.format({
+                    "Rejection_Rate_%": "{:.2f}%",
+                    "Baseline_%": "{:.2f}%",
+                    "Z": "{:.1f}",
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    else:
+        st.info("Order dates are required for the daily rejection view.")
 else:
-    df["__unit_price__"] = None
+    st.info("Order state column not detected – order funnel and rejections unavailable.")
+
+st.divider()
+st.header("💸 Pricing & Discount Analysis")
+
+# --------------------------------------------------
+# Pricing Arrays (no frame copy, cached per dataset)
+# --------------------------------------------------
+if not sales_col:
+    st.warning("Sales column not detected.")
+    st.stop()
+
+arrays = pricing_arrays(df, sales_col, qty_col, discount_col)
+totals = pricing_totals(arrays)
+
+k1, k2, k3, k4 = st.columns(4)
+
+k1.metric("💰 Gross Sales", f"{totals['gross_sales']:,.0f}")
+k2.metric("🏷 Discount Given", f"{totals['discount_amount']:,.0f}")
+k3.metric("🧾 Net Sales", f"{totals['net_sales']:,.0f}")
+k4.metric("📉 Effective Discount", f"{totals['discount_pct']:.2f}%")
 
 # --------------------------------------------------
 # Pricing Distribution
 # --------------------------------------------------
 st.subheader("🏷 Pricing Distribution")
 
-if df["__unit_price__"].notna().any():
-    st.line_chart(
-        df["__unit_price__"].dropna(),
+histogram = price_histogram(arrays)
+
+if not histogram.empty:
+    st.bar_chart(
+        histogram.set_index("Unit_Price"),
         use_container_width=True
     )
+    st.caption("Order lines per net unit price (1st–99th percentile)")
 else:
     st.info("Unit price cannot be derived from available columns.")
 
@@ -59,45 +180,105 @@ else:
 # --------------------------------------------------
 st.subheader("📉 Discount Impact on Sales")
 
-if discount_col and sales_col:
-    try:
-        st.plotly_chart(
-            bar_top(
-                df,
-                discount_col,
-                sales_col,
-                "Sales by Discount Level"
-            ),
-            use_container_width=True
-        )
-    except Exception:
-        st.info("Unable to visualize discount impact.")
+if discount_col:
+    bands = discount_bands(arrays)
+    st.bar_chart(
+        bands.set_index("Discount_Band")["Net_Sales"],
+        use_container_width=True
+    )
+    st.dataframe(
+        bands.style.format({"Net_Sales": "{:,.0f}", "Lines": "{:,}", "Share_%": "{:.1f}%"}),
+        use_container_width=True,
+        hide_index=True
+    )
 else:
     st.info("Discount column not detected.")
 
 # --------------------------------------------------
 # Brand-wise Pricing
 # --------------------------------------------------
-st.subheader("🏷 Brand-wise Average Price")
+st.subheader("🏷 Brand-wise Pricing")
 
-if brand_col and df["__unit_price__"].notna().any():
-    try:
-        avg_price = (
-            df.groupby(brand_col)["__unit_price__"]
-            .mean()
-            .sort_values(ascending=False)
-            .reset_index()
-        )
+if brand_col and qty_col:
+    brand_prices = price_statistics(df, brand_col, sales_col, qty_col, discount_col)
 
-        st.bar_chart(
-            avg_price.set_index(brand_col),
-            use_container_width=True
-        )
-    except Exception:
-        st.info("Unable to compute brand pricing.")
+    st.bar_chart(
+        brand_prices.set_index(brand_col)["Median_Unit_Price"].sort_values(ascending=False),
+        use_container_width=True
+    )
+    st.dataframe(
+        brand_prices.style.format({
+            "Gross_Sales": "{:,.0f}",
+            "Net_Sales": "{:,.0f}",
+            "Discount_Amount": "{:,.0f}",
+            "Discount_%": "{:.2f}%",
+            "Quantity": "{:,.0f}",
+            "Avg_Unit_Price": "{:,.2f}",
+            "Mean_Unit_Price": "{:,.2f}",
+            "Median_Unit_Price": "{:,.2f}",
+            "Lines": "{:,}",
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
 else:
     st.info("Brand or pricing data not available.")
 
+# --------------------------------------------------
+# Price Elasticity (batched log-log fits per SKU)
+# --------------------------------------------------
+st.subheader("📈 Price Elasticity & Discount Response by SKU")
+
+ELASTICITY_RANKINGS = {
+    "Most price-sensitive": ("Elasticity", True),
+    "Strongest discount uplift": ("Discount_Uplift_%", False),
+    "Net sales": ("Net_Sales", False),
+}
+
+if sku_col and date_col and qty_col:
+    elasticity = sku_elasticity(df, sku_col, date_col, sales_col, qty_col, discount_col)
+
+    if elasticity.empty:
+        st.info("Not enough priced weekly history per SKU to estimate elasticity.")
+    else:
+        responses = elasticity["Response"].value_counts()
+        e1, e2, e3 = st.columns(3)
+        e1.metric("SKUs Fitted", f"{len(elasticity):,}")
+        e2.metric("Elastic SKUs", f"{responses.get('Elastic', 0):,}")
+        e3.metric("Inelastic SKUs", f"{responses.get('Inelastic', 0):,}")
+
+        rank_by = st.selectbox("Rank SKUs by", list(ELASTICITY_RANKINGS))
+        rank_col, ascending = ELASTICITY_RANKINGS[rank_by]
+
+        significant_only = st.checkbox("Only statistically clear responses", value=False)
+        ranked = elasticity
+        if significant_only:
+            ranked = ranked[ranked["Response"] != "No clear response"]
+
+        ranked = ranked.sort_values(rank_col, ascending=ascending, na_position="last").head(50)
+
+        st.dataframe(
+            ranked.style.format({
+                "Net_Sales": "{:,.0f}",
+                "Avg_Unit_Price": "{:,.2f}",
+                "Avg_Discount_%": "{:.2f}%",
+                "Elasticity": "{:.2f}",
+                "Elasticity_SE": "{:.2f}",
+                "Elasticity_t": "{:.1f}",
+                "Elasticity_R2": "{:.2f}",
+                "Discount_Uplift_%": "{:+.1f}%",
+                "Uplift_t": "{:.1f}",
+            }, na_rep="–"),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(
+            "Elasticity: % change in weekly volume per 1% change in net unit price. "
+            "Discount uplift: % change in weekly volume per +1 pp of discount."
+        )
+else:
+    st.info("SKU, date and quantity columns are required for elasticity.")
+
 # --------------------------------------------------
 # Success
 # --------------------------------------------------
@@ -6,8 +6,11 @@
 import streamlit as st
 import pandas as pd
 
+from engine.precompute import cached_report
 from utils.column_detector import auto_detect_columns
-from utils.forecasting import forecast_sales
+from utils.instrumentation import begin_page
+
+begin_page("Sales Forecasting")
 
 st.header("📈 Sales Forecasting & Demand Planning")
 st.caption(
@@ -35,30 +38,6 @@ if not date_col or not sales_col:
     st.error("Date or Sales column could not be detected.")
     st.stop()
 
-# --------------------------------------------------
-# Data Preparation (PROPHET SAFE)
-# --------------------------------------------------
-data = df[[date_col, sales_col]].copy()
-data[date_col] = pd.to_datetime(data[date_col], errors="coerce")
-data = data.dropna()
-
-if data.empty:
-    st.error("No valid date/sales data available.")
-    st.stop()
-
-# Monthly aggregation (MANDATORY)
-data["Month"] = data[date_col].dt.to_period("M").dt.to_timestamp()
-
-monthly = (
-    data.groupby("Month", as_index=False)[sales_col]
-    .sum()
-    .rename(columns={"Month": "ds", sales_col: "y"})
-)
-
-if len(monthly) < 6:
-    st.warning("At least 6 months of data required for forecasting.")
-    st.stop()
-
 # --------------------------------------------------
 # Forecast Controls
 # --------------------------------------------------
@@ -72,10 +51,14 @@ months = st.slider(
 )
 
 # --------------------------------------------------
-# Run Forecast (UTILS)
+# Run Forecast (ENGINE)
 # --------------------------------------------------
 try:
-    forecast_df = forecast_sales(monthly, periods=months)
+    forecast_df = cached_report(df, "forecast", cols, months=months)
+    monthly = cached_report(df, "monthly_sales", cols)[["ds", "y"]]
+except ValueError as e:
+    st.warning(str(e))
+    st.stop()
 except Exception as e:
     st.error("Forecasting failed. Check data quality.")
     st.exception(e)
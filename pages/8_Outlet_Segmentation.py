@@ -7,8 +7,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from engine.precompute import cached_report
 from utils.column_detector import auto_detect_columns
-from utils.segmentation import segment_outlets
+from utils.instrumentation import begin_page
+
+begin_page("Outlet Segmentation")
 
 st.header("🏪 Outlet Segmentation & Risk Profiling")
 st.caption(
@@ -38,56 +41,6 @@ if not outlet_col:
     st.error("Outlet column not detected in dataset.")
     st.stop()
 
-# --------------------------------------------------
-# Feature Engineering (SAFE)
-# --------------------------------------------------
-features = df.copy()
-
-if date_col:
-    features[date_col] = pd.to_datetime(features[date_col], errors="coerce")
-
-agg_map = {}
-
-if sales_col:
-    agg_map[sales_col] = "sum"
-if qty_col:
-    agg_map[qty_col] = "sum"
-if date_col:
-    agg_map[date_col] = "max"
-
-outlet_df = (
-    features.groupby(outlet_col)
-    .agg(agg_map)
-    .reset_index()
-)
-
-# Rename for consistency
-rename_map = {}
-if sales_col:
-    rename_map[sales_col] = "Total_Sales"
-if qty_col:
-    rename_map[qty_col] = "Total_Quantity"
-if date_col:
-    rename_map[date_col] = "Last_Order_Date"
-
-outlet_df.rename(columns=rename_map, inplace=True)
-
-# --------------------------------------------------
-# Risk Scoring (NEW – EXECUTIVE GRADE)
-# --------------------------------------------------
-if "Last_Order_Date" in outlet_df.columns:
-    outlet_df["Days_Since_Last_Order"] = (
-        pd.Timestamp.today() - outlet_df["Last_Order_Date"]
-    ).dt.days
-
-    outlet_df["Risk_Score"] = pd.cut(
-        outlet_df["Days_Since_Last_Order"],
-        bins=[-1, 30, 60, 9999],
-        labels=["Low Risk", "Medium Risk", "High Risk"]
-    )
-else:
-    outlet_df["Risk_Score"] = "Unknown"
-
 # --------------------------------------------------
 # Segmentation Controls
 # --------------------------------------------------
@@ -101,10 +54,10 @@ clusters = st.slider(
 )
 
 # --------------------------------------------------
-# Apply Segmentation
+# Feature Engineering + Risk Scoring + Segmentation (ENGINE)
 # --------------------------------------------------
 try:
-    segmented_df = segment_outlets(outlet_df, clusters)
+    segmented_df = cached_report(df, "segments", cols, clusters=clusters)
 except Exception as e:
     st.error("Segmentation failed due to insufficient numeric features.")
     st.exception(e)
@@ -2,8 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from config import SESSION_DF_KEY, CURRENCY_SYMBOL
+from config import SESSION_DF_KEY, CURRENCY_SYMBOL, TRADING_WEEKMASK
+from engine.precompute import cached_report
+from utils.calendar_growth import GROWTH_COLUMNS
 from utils.column_detector import auto_detect_columns
+from utils.instrumentation import begin_page
+from utils.series_store import period_comparison
+
+begin_page("Daily Sales Analysis")
 
 # -------------------------------------------------
 # Page Config
@@ -47,24 +53,25 @@ if not date_col or not sales_col:
 # -------------------------------------------------
 # Prepare Daily Aggregation
 # -------------------------------------------------
-daily_df = df.copy()
-daily_df[date_col] = pd.to_datetime(daily_df[date_col])
+# Includes calendar-correct MoM (MTD vs prior MTD) / YoY (same day last year)
+try:
+    daily_df = cached_report(df, "daily_sales", cols)
+except Exception as e:
+    st.error("❌ Unable to generate daily analysis")
+    st.code(str(e))
+    st.stop()
 
-daily_df = (
-    daily_df
-    .groupby(pd.Grouper(key=date_col, freq="D"))
-    .agg(Daily_Sales=(sales_col, "sum"))
-    .reset_index()
-    .rename(columns={date_col: "Date"})
+trading_days = st.toggle(
+    "📆 Trading-day calendar",
+    help=f"Compare the same trading day ({TRADING_WEEKMASK}) of the prior month, "
+         "and the same weekday 52 weeks back"
 )
 
-daily_df.sort_values("Date", inplace=True)
-
-# -------------------------------------------------
-# Growth Calculations
-# -------------------------------------------------
-daily_df["MoM_Growth_%"] = daily_df["Daily_Sales"].pct_change(30) * 100
-daily_df["YoY_Growth_%"] = daily_df["Daily_Sales"].pct_change(365) * 100
+if trading_days:
+    growth = period_comparison(df, date_col, sales_col, trading_days=True)
+    daily_df = daily_df.assign(**{
+        col: growth[col].reindex(daily_df["Date"]).to_numpy() for col in GROWTH_COLUMNS
+    })
 
 # -------------------------------------------------
 # KPI Cards
@@ -87,15 +94,17 @@ latest_mom = daily_df["MoM_Growth_%"].iloc[-1]
 latest_yoy = daily_df["YoY_Growth_%"].iloc[-1]
 
 k3.metric(
-    "MoM Growth",
-    f"{latest_mom:.2f}%",
-    delta=f"{latest_mom:.2f}%"
+    "MoM Growth (MTD)",
+    f"{latest_mom:.2f}%" if pd.notna(latest_mom) else "–",
+    delta=f"{latest_mom:.2f}%" if pd.notna(latest_mom) else None,
+    help="Month-to-date vs the prior month to the same day"
 )
 
 k4.metric(
-    "YoY Growth",
-    f"{latest_yoy:.2f}%",
-    delta=f"{latest_yoy:.2f}%"
+    "YoY Growth (Same Day LY)",
+    f"{latest_yoy:.2f}%" if pd.notna(latest_yoy) else "–",
+    delta=f"{latest_yoy:.2f}%" if pd.notna(latest_yoy) else None,
+    help="Latest day vs the same day last year"
 )
 
 st.divider()
@@ -128,7 +137,7 @@ fig2 = px.line(
     growth_df,
     x="Date",
     y=["MoM_Growth_%", "YoY_Growth_%"],
-    title="MoM vs YoY Growth Trend"
+    title="MoM (MTD) vs YoY (Same Day LY) Growth Trend"
 )
 
 fig2.update_layout(template="plotly_white")
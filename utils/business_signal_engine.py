@@ -1,47 +1,225 @@
 import numpy as np
 import pandas as pd
 
+from config import SIGNAL_BREAK_T, SIGNAL_WINDOW_DAYS, SIGNAL_Z_THRESHOLD
+from utils.instrumentation import timed
+from utils.series_store import daily_series, dimension_window, metric_matrix
+
+# -------------------------------------------------
+# Volatility bands (coefficient of variation)
+# -------------------------------------------------
+HIGH_CV = 0.8
+MEDIUM_CV = 0.4
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+SIGNAL_TEXT = {
+    "High": (
+        "Severe instability detected in {name}",
+        "Extreme fluctuations indicate execution or demand breakdown",
+        "Immediate leadership review and corrective intervention required",
+    ),
+    "Medium": (
+        "Inconsistent performance observed in {name}",
+        "Performance variability impacting predictability",
+        "Operational optimization and monitoring advised",
+    ),
+    "Low": (
+        "Stable trend observed in {name}",
+        "Metric performance within acceptable variance",
+        "Maintain current execution strategy",
+    ),
+}
+
+
+def _priority(cv):
+    return np.where(cv >= HIGH_CV, "High", np.where(cv >= MEDIUM_CV, "Medium", "Low"))
+
+
 def detect_business_signals(df: pd.DataFrame, numeric_cols: list):
     """
     Detects volatility-based business risks & opportunities.
     Returns CEO-grade signals with priority, reason, and action.
     """
+    cols = [c for c in numeric_cols if c in df.columns]
+    if not cols:
+        return []
 
-    signals = []
+    values = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
 
-    for col in numeric_cols:
-        series = df[col].dropna()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(values, axis=0)
+        cv = np.nanstd(values, axis=0, ddof=1) / np.abs(mean)
 
-        if series.empty or series.mean() == 0:
+    signals = []
+    for col, m, level in zip(cols, mean, _priority(np.nan_to_num(cv))):
+        if np.isnan(m) or m == 0:
             continue
 
-        volatility = series.std() / abs(series.mean())
-
-        if volatility >= 0.8:
-            signals.append({
-                "metric": col,
-                "priority": "High",
-                "signal": f"Severe instability detected in {col}",
-                "reason": "Extreme fluctuations indicate execution or demand breakdown",
-                "action": "Immediate leadership review and corrective intervention required"
-            })
-
-        elif volatility >= 0.4:
-            signals.append({
-                "metric": col,
-                "priority": "Medium",
-                "signal": f"Inconsistent performance observed in {col}",
-                "reason": "Performance variability impacting predictability",
-                "action": "Operational optimization and monitoring advised"
-            })
+        signal, reason, action = SIGNAL_TEXT[level]
+        signals.append({
+            "metric": col,
+            "priority": str(level),
+            "signal": signal.format(name=col),
+            "reason": reason,
+            "action": action,
+        })
+
+    return signals
+
+
+# -------------------------------------------------
+# Rolling statistics over a [series × day] matrix
+# -------------------------------------------------
+def rolling_stats(matrix: np.ndarray, window: int):
+    """
+    Trailing mean / std of each row over `window` days (cumulative sums,
+    so cost is independent of the window). Positions with less than a
+    full window are NaN.
+    """
+    n, t = matrix.shape
+    csum = np.zeros((n, t + 1))
+    csum2 = np.zeros((n, t + 1))
+    np.cumsum(matrix, axis=1, out=csum[:, 1:])
+    np.cumsum(matrix * matrix, axis=1, out=csum2[:, 1:])
+
+    mean = np.full((n, t), np.nan)
+    std = np.full((n, t), np.nan)
+
+    if t >= window:
+        s = csum[:, window:] - csum[:, :-window]
+        s2 = csum2[:, window:] - csum2[:, :-window]
+        m = s / window
+        mean[:, window - 1:] = m
+        std[:, window - 1:] = np.sqrt(np.maximum(s2 / window - m * m, 0))
+
+    return mean, std
+
+
+def _signal_window(t: int, window: int) -> int:
+    return max(2, min(window, t // 2)) if t >= 4 else max(1, t)
+
+
+@timed("aggregation")
+def signal_table(names, matrix: np.ndarray, window: int = SIGNAL_WINDOW_DAYS, history: dict | None = None) -> pd.DataFrame:
+    """
+    Ranked signals for every row of a [series × day] matrix.
+
+    `history` ({"days", "sum", "sum_sq"} per row, see
+    series_store.dimension_window) replaces the days before the last
+    window when `matrix` holds only the trailing 2 × window days.
+
+    Recent_CV       -> CV over the last `window` days
+    Historical_CV   -> CV over everything before that
+    Anomaly_Days    -> days in the last window with |z| > SIGNAL_Z_THRESHOLD
+                       (z against the preceding window)
+    Trend_Change_%  -> last window mean vs the window before it
+    Trend_Break     -> |Welch t| of that change > SIGNAL_BREAK_T
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    n, t = matrix.shape
+    w = _signal_window(t, window)
+
+    mean, std = rolling_stats(matrix, w)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        recent_mean, recent_std = mean[:, -1], std[:, -1]
+        recent_cv = recent_std / np.abs(recent_mean)
 
+        if history is not None:
+            days = history["days"]
+            hist_mean = history["sum"] / days if days else np.full(n, np.nan)
+            hist_std = np.sqrt(np.maximum(history["sum_sq"] / days - hist_mean ** 2, 0)) if days else hist_mean
+            hist_cv = hist_std / np.abs(hist_mean) if days > 1 else np.full(n, np.nan)
         else:
-            signals.append({
-                "metric": col,
-                "priority": "Low",
-                "signal": f"Stable trend observed in {col}",
-                "reason": "Metric performance within acceptable variance",
-                "action": "Maintain current execution strategy"
-            })
+            past = matrix[:, :-w] if t > w else matrix[:, :0]
+            if past.shape[1] > 1:
+                hist_cv = past.std(axis=1) / np.abs(past.mean(axis=1))
+            else:
+                hist_cv = np.full(n, np.nan)
 
-    return signals
+        # z of each day against the window that precedes it
+        prev_mean = np.full((n, t), np.nan)
+        prev_std = np.full((n, t), np.nan)
+        prev_mean[:, 1:], prev_std[:, 1:] = mean[:, :-1], std[:, :-1]
+        z = (matrix - prev_mean) / np.where(prev_std > 0, prev_std, np.nan)
+
+        recent_z = z[:, -w:]
+        anomaly_days = np.sum(np.abs(np.nan_to_num(recent_z)) > SIGNAL_Z_THRESHOLD, axis=1)
+        latest_z = z[:, -1]
+
+        if t >= 2 * w:
+            base_mean, base_std = mean[:, -w - 1], std[:, -w - 1]
+            trend_change = (recent_mean / base_mean - 1) * 100
+            trend_t = (recent_mean - base_mean) / np.sqrt((recent_std ** 2 + base_std ** 2) / w)
+        else:
+            trend_change = np.full(n, np.nan)
+            trend_t = np.full(n, np.nan)
+
+    trend_break = np.abs(np.nan_to_num(trend_t)) > SIGNAL_BREAK_T
+    cv = np.nan_to_num(recent_cv)
+
+    priority = np.where(
+        (cv >= HIGH_CV) | (anomaly_days >= 3) | (trend_break & (np.nan_to_num(trend_change) < 0)),
+        "High",
+        np.where((cv >= MEDIUM_CV) | (anomaly_days > 0) | trend_break, "Medium", "Low"),
+    )
+
+    score = np.nanmax(np.vstack([
+        cv / HIGH_CV,
+        anomaly_days / 3,
+        np.abs(np.nan_to_num(trend_t)) / SIGNAL_BREAK_T,
+    ]), axis=0)
+
+    table = pd.DataFrame({
+        "Series": list(names),
+        "Priority": priority,
+        "Score": score,
+        "Recent_CV": recent_cv,
+        "Historical_CV": hist_cv,
+        "Anomaly_Days": anomaly_days,
+        "Latest_Z": latest_z,
+        "Trend_Change_%": trend_change,
+        "Trend_Break": trend_break,
+    })
+
+    table["Signal"] = [
+        "Trend break ({:+.1f}%) in {}".format(c, s) if b
+        else SIGNAL_TEXT[p][0].format(name=s)
+        for s, p, b, c in zip(table["Series"], table["Priority"], trend_break, np.nan_to_num(trend_change))
+    ]
+    table["Action"] = [SIGNAL_TEXT[p][2] for p in table["Priority"]]
+
+    rank = table["Priority"].map(PRIORITY_RANK)
+    return (
+        table.assign(_rank=rank)
+        .sort_values(["_rank", "Score"], ascending=[True, False], ignore_index=True)
+        .drop(columns="_rank")
+    )
+
+
+# -------------------------------------------------
+# Dataset entry points
+# -------------------------------------------------
+def metric_signals(df: pd.DataFrame, date_col: str, metrics, window: int = SIGNAL_WINDOW_DAYS) -> pd.DataFrame:
+    """Ranked signals for the daily totals of every metric in `metrics`."""
+    names, _, values = metric_matrix(df, date_col, metrics)
+    return signal_table(names, values, window)
+
+
+def dimension_signals(
+    df: pd.DataFrame,
+    date_col: str,
+    sales_col: str,
+    dim_col: str,
+    window: int = SIGNAL_WINDOW_DAYS,
+) -> pd.DataFrame:
+    """
+    Ranked sales signals for every member of `dim_col` (brand / state /
+    outlet). Only the trailing 2 × window days are held per member; the
+    historical CV comes from grouped sums, so outlet-level signals scale
+    with rows rather than outlets × calendar days.
+    """
+    w = _signal_window(len(daily_series(df, date_col, sales_col)), window)
+    members, _, values, history = dimension_window(df, date_col, sales_col, dim_col, 2 * w, w)
+    return signal_table(members.astype(str), values, window, history=history)
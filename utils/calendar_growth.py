@@ -0,0 +1,103 @@
+# utils/calendar_growth.py
+# -------------------------------------------------
+# Calendar-Correct Period Comparisons
+# -------------------------------------------------
+#
+# Growth is computed on a complete daily calendar with date-offset
+# joins instead of row offsets (pct_change(30) / pct_change(365) drift
+# whenever days are missing):
+#
+#   MTD vs prior MTD   -> month-to-date total vs the prior month up to
+#                         the same day (clipped to month end), or up to
+#                         the same trading day with a trading calendar
+#   Same day last year -> calendar date one year back, or the same
+#                         weekday 52 weeks back with a trading calendar
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import TRADING_WEEKMASK
+
+GROWTH_COLUMNS = ["MTD_Sales", "Prior_MTD_Sales", "MoM_Growth_%", "SDLY_Sales", "YoY_Growth_%"]
+
+
+def trading_calendar(index: pd.DatetimeIndex, weekmask: str = TRADING_WEEKMASK, holidays=()) -> pd.DatetimeIndex:
+    """Trading days within the span of `index`."""
+    if len(index) == 0:
+        return pd.DatetimeIndex([])
+    return pd.bdate_range(index.min(), index.max(), freq="C", weekmask=weekmask, holidays=list(holidays))
+
+
+def growth_pct(current, prior) -> np.ndarray:
+    """Percent growth; NaN where the prior value is missing or not positive."""
+    current = np.asarray(current, dtype=np.float64)
+    prior = np.asarray(prior, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(prior > 0, (current / prior - 1) * 100, np.nan)
+
+
+def _complete(daily: pd.Series) -> pd.Series:
+    return daily.sort_index().asfreq("D", fill_value=0)
+
+
+def _prior_mtd_calendar(mtd: pd.Series) -> np.ndarray:
+    # Mar 29–31 -> Feb 28 (DateOffset clips to month end)
+    return mtd.reindex(mtd.index - pd.DateOffset(months=1)).to_numpy()
+
+
+def _prior_mtd_trading(mtd: pd.Series, calendar: pd.DatetimeIndex) -> np.ndarray:
+    index = mtd.index
+    months = index.to_period("M")
+    is_trading = index.isin(calendar)
+
+    # Trading-day ordinal within the month (0 before the first trading day)
+    ordinal = pd.Series(is_trading.astype(np.int64), index=index).groupby(months).cumsum().to_numpy()
+
+    td_months = months[is_trading]
+    td_ordinal = ordinal[is_trading]
+    lookup = pd.Series(mtd.to_numpy()[is_trading], index=pd.MultiIndex.from_arrays([td_months, td_ordinal]))
+    per_month = pd.Series(td_ordinal).groupby(np.asarray(td_months)).max()
+
+    prior_months = months - 1
+    prior_count = per_month.reindex(np.asarray(prior_months)).to_numpy()
+    wanted = np.minimum(ordinal, np.nan_to_num(prior_count, nan=0)).astype(np.int64)
+
+    prior = lookup.reindex(pd.MultiIndex.from_arrays([prior_months, wanted])).to_numpy()
+    return np.where(ordinal > 0, prior, np.nan)
+
+
+def calendar_growth(
+    daily: pd.Series,
+    trading_days: bool = False,
+    weekmask: str = TRADING_WEEKMASK,
+    holidays=(),
+) -> pd.DataFrame:
+    """
+    Period comparisons for a daily sales Series (DatetimeIndex).
+
+    Returns a frame on the complete daily calendar with GROWTH_COLUMNS.
+    """
+    series = _complete(daily)
+    months = series.index.to_period("M")
+    mtd = series.groupby(months).cumsum()
+
+    if trading_days:
+        calendar = trading_calendar(series.index, weekmask, holidays)
+        prior_mtd = _prior_mtd_trading(mtd, calendar)
+        sdly = series.reindex(series.index - pd.Timedelta(days=364)).to_numpy()
+    else:
+        prior_mtd = _prior_mtd_calendar(mtd)
+        sdly = series.reindex(series.index - pd.DateOffset(years=1)).to_numpy()
+
+    return pd.DataFrame(
+        {
+            "MTD_Sales": mtd.to_numpy(),
+            "Prior_MTD_Sales": prior_mtd,
+            "MoM_Growth_%": growth_pct(mtd, prior_mtd),
+            "SDLY_Sales": sdly,
+            "YoY_Growth_%": growth_pct(series, sdly),
+        },
+        index=series.index,
+    )
@@ -1,17 +1,24 @@
 import pandas as pd
 import plotly.express as px
+from utils.date_normalizer import to_datetime_fast
+
+from utils.instrumentation import timed
+from utils.ranking import group_totals, top_n as top_members
+from utils.schema_normalizer import resolve_column
 
 
 def _empty_fig(title=""):
     return px.line(title=title, template="plotly_white")
 
 
+@timed("render")
 def line_sales_trend(df, date_col, sales_col):
+    date_col, sales_col = resolve_column(df, date_col), resolve_column(df, sales_col)
     if df is None or df.empty or date_col not in df or sales_col not in df:
         return _empty_fig("Sales Trend")
 
     temp = df.copy()
-    temp[date_col] = pd.to_datetime(temp[date_col], errors="coerce")
+    temp[date_col] = to_datetime_fast(temp[date_col])
 
     trend = temp.groupby(date_col, as_index=False)[sales_col].sum()
 
@@ -25,17 +32,13 @@ def line_sales_trend(df, date_col, sales_col):
     )
 
 
+@timed("render")
 def bar_top(df, group_col, value_col, top_n=10, title="Top Categories"):
+    group_col, value_col = resolve_column(df, group_col), resolve_column(df, value_col)
     if df is None or df.empty:
         return _empty_fig(title)
 
-    agg = (
-        df.groupby(group_col)[value_col]
-        .sum()
-        .sort_values(ascending=False)
-        .head(top_n)
-        .reset_index()
-    )
+    agg = top_members(group_totals(df, group_col, value_col), top_n).reset_index()
 
     return px.bar(
         agg,
@@ -47,7 +50,9 @@ def bar_top(df, group_col, value_col, top_n=10, title="Top Categories"):
     )
 
 
+@timed("render")
 def heatmap(df, x_col, y_col, value_col, title="Heatmap"):
+    x_col, y_col, value_col = resolve_column(df, x_col), resolve_column(df, y_col), resolve_column(df, value_col)
     if df is None or df.empty:
         return _empty_fig(title)
 
@@ -69,7 +74,9 @@ def heatmap(df, x_col, y_col, value_col, title="Heatmap"):
     )
 
 
+@timed("render")
 def scatter_price_qty(df, price_col, qty_col, title="Price vs Quantity"):
+    price_col, qty_col = resolve_column(df, price_col), resolve_column(df, qty_col)
     if df is None or df.empty:
         return _empty_fig(title)
 
@@ -83,7 +90,9 @@ def scatter_price_qty(df, price_col, qty_col, title="Price vs Quantity"):
     )
 
 
+@timed("render")
 def pie_chart(df, names_col, values_col, title="Category Share"):
+    names_col, values_col = resolve_column(df, names_col), resolve_column(df, values_col)
     if df is None or df.empty:
         return _empty_fig(title)
 
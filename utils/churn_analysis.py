@@ -1,13 +1,16 @@
 import pandas as pd
 from config import HIGH_CHURN_DAYS, MEDIUM_CHURN_DAYS
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
 
 
+@timed("aggregation")
 def churn_risk(df, outlet_col, date_col):
     if df is None or df.empty:
         return pd.DataFrame()
 
     temp = df[[outlet_col, date_col]].copy()
-    temp[date_col] = pd.to_datetime(temp[date_col], errors="coerce")
+    temp[date_col] = to_datetime_fast(temp[date_col])
 
     last_order = temp.groupby(outlet_col)[date_col].max().reset_index()
 
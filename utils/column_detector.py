@@ -1,20 +1,232 @@
-def detect_column(columns, keywords):
+# utils/column_detector.py
+# -------------------------------------------------
+# Schema Resolution Service
+# -------------------------------------------------
+#
+# Every candidate column is scored per business role on its name tokens
+# (exact name > whole-token match > substring, minus "avoid" tokens such
+# as ORDER in ORDERSTATE for the state role) plus a small value sample
+# (numeric parse rate, cardinality, identifier-like dtype). Each column
+# serves at most one role.
+#
+# The resolved mapping is cached per schema (hash of column names and
+# dtypes), so detection runs once per schema instead of once per page
+# rerun. A user override per schema is persisted in the dataset cache
+# and applied on top.
+# -------------------------------------------------
+
+import hashlib
+import re
+import numpy as np
+import pandas as pd
+
+from config import SCHEMA_SAMPLE_ROWS
+from utils.dataset_cache import load_schema_override, memoize_per_dataset, save_schema_override
+from utils.instrumentation import timed
+from utils.numeric_coercion import coerce_numeric, is_numeric
+from utils.type_inference import infer_date_columns
+
+DATE_KEYWORDS = ["order_date", "date", "created_date", "invoice_date"]
+
+# role -> keywords (in priority order), value kind, name tokens to avoid
+ROLE_SPECS = {
+    "date": {"keywords": DATE_KEYWORDS, "kind": "date"},
+    "sales": {
+        "keywords": ["amount", "sales", "sales_value", "net_amount", "revenue", "value"],
+        "kind": "numeric",
+        "avoid": ["discount", "tax", "quantity", "qty", "id", "code", "time"],
+    },
+    "quantity": {
+        "keywords": ["total_quantity", "quantity", "qty", "units"],
+        "kind": "numeric",
+        "avoid": ["id", "code"],
+    },
+    "discount": {
+        "keywords": ["discount_amount", "discount", "disc_amount", "disc"],
+        "kind": "numeric",
+        "avoid": ["id", "code", "percent", "pct", "rate"],
+    },
+    "sku": {"keywords": ["sku", "product_code", "product", "item"], "kind": "key"},
+    "brand": {"keywords": ["brand"], "kind": "label"},
+    "city": {"keywords": ["city", "town"], "kind": "label"},
+    "state": {"keywords": ["state", "region"], "kind": "label", "avoid": ["order", "status"]},
+    "zone": {"keywords": ["zone", "territory"], "kind": "label"},
+    "warehouse": {"keywords": ["warehouse", "depot", "godown", "distribution_center"], "kind": "label"},
+    "outlet": {"keywords": ["outlet", "store", "retailer", "shop"], "kind": "key"},
+    "rep": {"keywords": ["sales_rep", "rep", "salesman", "user", "executive"], "kind": "key"},
+    "designation": {"keywords": ["designation", "role", "job_title"], "kind": "label"},
+    "visit_time": {
+        "keywords": ["time_spent_at_outlet", "time_spent", "visit_duration", "visit_time", "duration"],
+        "kind": "numeric",
+        "avoid": ["id", "code"],
+    },
+    "order_id": {
+        "keywords": ["order_id", "order_no", "order_number", "invoice_no", "invoice_id", "bill_no"],
+        "kind": "key",
+    },
+    "order_state": {
+        "keywords": ["orderstate", "order_state", "order_status", "status"],
+        "kind": "label",
+    },
+}
+
+ID_TOKENS = {"id", "code", "no", "number", "key"}
+
+
+def schema_key(df: pd.DataFrame) -> str:
+    """16-hex hash of column names and dtypes."""
+    signature = repr((tuple(map(str, df.columns)), tuple(map(str, df.dtypes))))
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+
+
+_mappings = memoize_per_dataset("schema_mappings", maxsize=16, key=schema_key)
+_overrides = memoize_per_dataset("schema_overrides", maxsize=16, key=schema_key)
+
+
+# -------------------------------------------------
+# Scoring
+# -------------------------------------------------
+def _tokens(name: str) -> list:
+    # OutletId / outlet_id / OUTLET-ID -> ["outlet", "id"]
+    spaced = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", str(name))
+    return [t for t in re.split(r"[^a-z0-9]+", spaced.lower()) if t]
+
+
+def _name_score(name: str, spec: dict) -> float:
+    tokens = _tokens(name)
+    joined = "_".join(tokens)
+    compact = "".join(tokens)
+
+    best = 0.0
+    for rank, keyword in enumerate(spec["keywords"]):
+        words = keyword.split("_")
+        if joined == keyword:
+            score = 10.0
+        elif any(tokens[i:i + len(words)] == words for i in range(len(tokens))):
+            score = 6.0
+        elif keyword.replace("_", "") in compact:
+            score = 2.0
+        else:
+            continue
+        best = max(best, score - 0.25 * rank)
+
+    if best and any(a in tokens or (len(a) >= 4 and a in compact) for a in spec.get("avoid", [])):
+        best -= 8.0
+
+    return best
+
+
+def _sample(series: pd.Series) -> pd.Series:
+    if len(series) > SCHEMA_SAMPLE_ROWS:
+        series = series.iloc[np.linspace(0, len(series) - 1, SCHEMA_SAMPLE_ROWS, dtype=np.int64)]
+    return series.dropna()
+
+
+def _value_score(series: pd.Series, tokens: list, kind: str) -> float | None:
+    """Adjustment from a value sample; None disqualifies the column."""
+    sample = _sample(series)
+    if sample.empty:
+        return None
+
+    distinct = sample.nunique() / len(sample)
+    numeric = is_numeric(series)
+
+    if kind == "numeric":
+        if not numeric:
+            parsed = coerce_numeric(sample.astype(str))
+            if parsed.notna().mean() < 0.9:
+                return None
+        return 1.0 if pd.api.types.is_float_dtype(series) else 0.0
+
+    if pd.api.types.is_bool_dtype(series):
+        return None
+
+    if kind == "key":
+        score = 2.0 if ID_TOKENS.intersection(tokens) else 0.0
+        score += 1.0 if pd.api.types.is_integer_dtype(series) else 0.0
+        score -= 1.0 if "name" in tokens else 0.0
+        return score if sample.nunique() > 1 else None
+
+    # label: a categorical attribute, not a measure or a row identifier
+    if pd.api.types.is_float_dtype(series):
+        return None
+    return -2.0 if distinct > 0.9 and len(sample) >= 50 else 0.0
+
+
+@timed("column_detection")
+def resolve_schema(df: pd.DataFrame) -> dict:
     """
-    Detect first matching column based on keyword priority.
-    Case-insensitive, safe for production.
+    Scored role -> column mapping (before user overrides).
+    Cached per schema_key(df).
     """
-    if columns is None:
-        return None
+    if df is None or df.empty:
+        return {role: None for role in ROLE_SPECS}
+
+    def build():
+        columns = df.columns.tolist()
+        date_formats = infer_date_columns(df)
+
+        mapping = {}
+        taken = set()
+
+        for role, spec in ROLE_SPECS.items():
+            best, best_score = None, 0.0
+
+            for col in columns:
+                if col in taken:
+                    continue
+
+                name_score = _name_score(col, spec)
+                if name_score <= 0:
+                    continue
+
+                if spec["kind"] == "date":
+                    # Prefer columns whose values actually parse as dates
+                    value_score = 20.0 if str(col) in date_formats else 0.0
+                else:
+                    value_score = _value_score(df[col], _tokens(col), spec["kind"])
+                    if value_score is None:
+                        continue
 
-    for key in keywords:
-        for col in columns:
-            try:
-                if key in col.lower():
-                    return col
-            except Exception:
-                continue
+                score = name_score + value_score
+                if score > best_score:
+                    best, best_score = col, score
 
-    return None
+            if best is None and spec["kind"] == "date":
+                best = next((c for c in columns if str(c) in date_formats and c not in taken), None)
+
+            mapping[role] = best
+            if best is not None:
+                taken.add(best)
+
+        return mapping
+
+    return _mappings.get(df, (), build)
+
+
+# -------------------------------------------------
+# User Overrides (persisted per schema)
+# -------------------------------------------------
+def schema_override(df: pd.DataFrame) -> dict:
+    """{role: column} chosen by the user for this schema (may be empty)."""
+    return _overrides.get(df, (), lambda: load_schema_override(schema_key(df)) or {})
+
+
+def set_schema_override(df: pd.DataFrame, override: dict):
+    """Persist a user mapping for this schema; None / missing roles fall back to detection."""
+    key = schema_key(df)
+    clean = {
+        role: col for role, col in (override or {}).items()
+        if role in ROLE_SPECS and col in df.columns
+    }
+    save_schema_override(key, clean)
+    _overrides.clear()
+
+
+def clear_schema_cache():
+    """Drop memoized mappings and overrides (re-detect on next call)."""
+    _mappings.clear()
+    _overrides.clear()
 
 
 def auto_detect_columns(df):
@@ -22,74 +234,10 @@ def auto_detect_columns(df):
     Auto-detect commonly used business columns.
     Returns a dictionary used across ALL dashboards.
     """
+    mapping = resolve_schema(df)
 
     if df is None or df.empty:
-        return {
-            "date": None,
-            "sales": None,
-            "quantity": None,
-            "sku": None,
-            "brand": None,
-            "city": None,
-            "state": None,
-            "outlet": None,
-            "rep": None
-        }
-
-    cols = df.columns.tolist()
-
-    return {
-        # Date
-        "date": detect_column(
-            cols,
-            ["order_date", "date", "created_date", "invoice_date"]
-        ),
-
-        # Sales / Revenue
-        "sales": detect_column(
-            cols,
-            ["amount", "sales", "sales_value", "net_amount", "value"]
-        ),
-
-        # Quantity
-        "quantity": detect_column(
-            cols,
-            ["total_quantity", "quantity", "qty", "units"]
-        ),
-
-        # SKU / Product
-        "sku": detect_column(
-            cols,
-            ["sku", "product_code", "product", "item"]
-        ),
-
-        # Brand
-        "brand": detect_column(
-            cols,
-            ["brand"]
-        ),
-
-        # City
-        "city": detect_column(
-            cols,
-            ["city", "town"]
-        ),
-
-        # State
-        "state": detect_column(
-            cols,
-            ["state", "region"]
-        ),
-
-        # Outlet / Store
-        "outlet": detect_column(
-            cols,
-            ["outlet", "store", "retailer", "shop"]
-        ),
-
-        # Sales Representative
-        "rep": detect_column(
-            cols,
-            ["sales_rep", "rep", "salesman", "user", "executive"]
-        )
-    }
+        return dict(mapping)
+
+    override = schema_override(df)
+    return {role: override.get(role, col) for role, col in mapping.items()}
@@ -1,24 +1,178 @@
+import time
+
 import pandas as pd
 import streamlit as st
-from config import SESSION_DF_KEY, SESSION_SOURCE_KEY
+from config import ENABLE_PRECOMPUTE_WORKER, SESSION_DF_KEY, SESSION_SOURCE_KEY
+from engine.incremental import apply_append
+from engine.precompute import start_worker
+from utils.column_detector import auto_detect_columns
+from utils.dataset_cache import (
+    append_partition,
+    build_order_index,
+    dataset_fingerprint,
+    dataset_meta,
+    hash_keys,
+    is_known_order,
+    load_order_index,
+    order_key_column,
+    publish_dataset,
+)
+from utils.excel_ingest import ExcelIngestJob, list_sheets, workbook_bytes
+from utils.frame_compaction import compact_frame, prepare_dataset
+from utils.instrumentation import timed, track
+
+
+def read_workbook(file, sheets=None) -> pd.DataFrame:
+    """
+    Parse the selected sheets (first sheet by default) of an .xlsx upload
+    in a worker thread, showing progress. Previously parsed workbooks
+    are served from the columnar cache.
+    """
+    data = workbook_bytes(file)
+    meta = list_sheets(data)
+    sheets = sheets or [meta[0]["name"]]
+    rows = [m["rows"] for m in meta if m["name"] in sheets]
+
+    job = ExcelIngestJob(data, sheets, total_rows=sum(rows) if None not in rows else None)
+    job.start()
+
+    bar = st.progress(0.0, text="Reading workbook...")
+    while job.is_alive():
+        bar.progress(job.progress, text=job.stage)
+        time.sleep(0.25)
+    job.join()
+    bar.empty()
+
+    if job.error is not None:
+        raise job.error
+
+    return job.result
+
+
+def read_upload(file, sheets=None) -> pd.DataFrame | None:
+    """CSV (UTF-8, falling back to Latin-1) or Excel upload -> DataFrame."""
+    name = file.name.lower()
+
+    if name.endswith(".csv"):
+        try:
+            return pd.read_csv(file)
+        except UnicodeDecodeError:
+            file.seek(0)
+            return pd.read_csv(file, encoding="latin1")
+    elif name.endswith(".xlsx"):
+        return read_workbook(file, sheets)
+    elif name.endswith(".xls"):
+        return pd.read_excel(file)
 
+    st.error("Unsupported file format")
+    return None
+
+
+def _publish(df: pd.DataFrame, source: str):
+    if not ENABLE_PRECOMPUTE_WORKER:
+        return
 
-def load_dataset(file):
     try:
-        if file.name.lower().endswith(".csv"):
-            df = pd.read_csv(file, encoding="latin1")
-        elif file.name.lower().endswith((".xlsx", ".xls")):
-            df = pd.read_excel(file)
-        else:
-            st.error("Unsupported file format")
+        with st.spinner("Caching dataset for dashboard precompute..."):
+            publish_dataset(df, source=source)
+        start_worker().wake()
+    except Exception as e:
+        st.info(f"ℹ Dashboards will compute on demand (cache unavailable: {e})")
+
+
+def _append(base: pd.DataFrame, new: pd.DataFrame, source: str) -> pd.DataFrame | None:
+    """
+    Merge `new` into `base`, skipping orders already present (by ORDER_ID
+    hash). Only the new rows are written to the cache and folded into
+    the precomputed artifacts.
+    """
+    base_key = order_key_column(base)
+    new_key = order_key_column(new)
+
+    if base_key is None or new_key is None:
+        st.error("Appending requires an ORDER_ID column in both the current and the new dataset")
+        return None
+
+    new = new.rename(columns={new_key: base_key})
+    extra = [c for c in new.columns if c not in base.columns]
+    if extra:
+        st.warning(f"⚠ Ignoring columns not in the current dataset: {', '.join(map(str, extra))}")
+    new = new.reindex(columns=base.columns)
+
+    with track("ingest", "append_dedupe", rows=len(new)):
+        base_version = dataset_fingerprint(base)
+        cached = ENABLE_PRECOMPUTE_WORKER
+
+        if cached:
+            try:
+                if dataset_meta(base_version) is None:
+                    publish_dataset(base, source="append-base")
+                index = load_order_index(base_version)
+            except Exception:
+                cached = False
+
+        if not cached or index is None:
+            index = build_order_index(base)
+
+        known = is_known_order(index, hash_keys(new[base_key]))
+        new_rows = new.loc[~known].reset_index(drop=True)
+
+    skipped = int(known.sum())
+
+    if new_rows.empty:
+        st.info(f"ℹ No new orders found ({skipped:,} rows already loaded)")
+        return base
+
+    # Category sets differ between base and new rows -> re-compact the union
+    combined = compact_frame(pd.concat([base, new_rows], ignore_index=True))
+
+    if cached:
+        try:
+            with st.spinner("Merging new orders into cached dashboards..."):
+                version = append_partition(base_version, combined, new_rows, source=source)
+                apply_append(base_version, version, new_rows, auto_detect_columns(combined))
+
+            start_worker().wake()
+        except Exception as e:
+            st.info(f"ℹ Dashboards will compute on demand (cache unavailable: {e})")
+
+    st.success(f"✅ Appended {len(new_rows):,} new rows ({skipped:,} already-loaded rows skipped)")
+    return combined
+
+
+@timed("ingest")
+def load_dataset(file, mode: str = "replace", source: str = "Upload", sheets=None):
+    """
+    Read an uploaded file into the session dataset.
+
+    mode="replace" swaps the active dataset; mode="append" merges only
+    orders not already loaded into it. `sheets` selects Excel sheets.
+    """
+    try:
+        with track("ingest", "read_upload") as rec:
+            df = read_upload(file, sheets)
+            rec.rows = 0 if df is None else len(df)
+
+        if df is None:
             return None
 
         if df.empty:
             st.error("Uploaded file is empty")
             return None
 
+        df = prepare_dataset(df)
+
+        base = st.session_state.get(SESSION_DF_KEY)
+
+        if mode == "append" and base is not None:
+            df = _append(base, df, source.lower())
+            if df is None:
+                return None
+        else:
+            _publish(df, source.lower())
+
         st.session_state[SESSION_DF_KEY] = df
-        st.session_state[SESSION_SOURCE_KEY] = "uploader"
+        st.session_state[SESSION_SOURCE_KEY] = source
 
         return df
 
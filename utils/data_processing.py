@@ -1,11 +1,12 @@
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
+from utils.date_normalizer import to_datetime_fast
 
 
 def prepare_time_series(df, date_col, sales_col, freq="MS"):
     temp = df[[date_col, sales_col]].copy()
-    temp[date_col] = pd.to_datetime(temp[date_col], errors="coerce")
+    temp[date_col] = to_datetime_fast(temp[date_col])
     temp = temp.dropna()
 
     ts = (
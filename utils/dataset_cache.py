@@ -0,0 +1,539 @@
+# utils/dataset_cache.py
+# -------------------------------------------------
+# On-Disk Columnar Dataset Cache (Streamlit-free)
+# -------------------------------------------------
+#
+# <DATASET_CACHE_DIR>/
+#   CURRENT.json                     -> latest published version
+#   datasets/<version>/meta.json     -> parts list (shared with parent versions)
+#   datasets/<version>/parts/part-NNNNN.parquet
+#   datasets/<version>/order_index.npy -> sorted ORDER_ID hashes (append de-dup)
+#   datasets/<version>/artifacts/    -> precomputed page artifacts
+#       manifest.json
+#       <name>.parquet | <name>.json
+#   schemas/<schema key>.json        -> user column-role overrides
+#   workbooks/<sha1>/<sheet>.parquet -> parsed Excel sheets (skip re-parsing)
+# -------------------------------------------------
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from config import DATASET_CACHE_DIR, FINGERPRINT_CHUNK_ROWS, ORDER_KEY_COLUMN
+
+_fingerprints = {}
+_fp_lock = threading.Lock()
+_memos = weakref.WeakSet()
+
+
+# -------------------------------------------------
+# Fingerprint
+# -------------------------------------------------
+def _frame_signature(df: pd.DataFrame) -> tuple:
+    return (df.shape, tuple(map(str, df.columns)), tuple(map(str, df.dtypes)))
+
+
+def _arrow_chunks(series: pd.Series):
+    """Arrow chunks backing `series`, or None for numpy / object columns."""
+    to_arrow = getattr(series.array, "__arrow_array__", None)
+    if to_arrow is None:
+        return None
+    data = to_arrow()
+    return data.chunks if hasattr(data, "chunks") else [data]
+
+
+def _column_token(series: pd.Series) -> tuple:
+    """
+    Cheap change detector for one column. Arrow data is immutable, so
+    its buffer addresses move on any edit; numpy data can be written in
+    place, so it also carries a wrapping sum of its raw words.
+    """
+    chunks = _arrow_chunks(series)
+    if chunks is not None:
+        return tuple(b.address for c in chunks for b in c.buffers() if b is not None)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = pd.Series(series.array.codes)
+    values = series.to_numpy()
+    if values.dtype == object:
+        return (values.__array_interface__["data"][0],)
+    raw = np.ascontiguousarray(values).view(np.uint8)
+    if raw.size % 8 == 0:
+        raw = raw.view(np.uint64)
+    return (values.__array_interface__["data"][0], int(raw.sum(dtype=np.uint64)))
+
+
+def _frame_token(df: pd.DataFrame) -> tuple:
+    return (_frame_signature(df),) + tuple(
+        _column_token(df.iloc[:, i]) for i in range(df.shape[1])
+    )
+
+
+def _hash_column(digest, series: pd.Series):
+    """Feed one column's raw buffers into `digest` (no per-row work)."""
+    chunks = _arrow_chunks(series)
+    if chunks is not None and not any(c.offset for c in chunks):
+        for chunk in chunks:
+            digest.update(repr((str(chunk.type), len(chunk), chunk.null_count)).encode("utf-8"))
+            for buf in chunk.buffers():
+                if buf is not None:
+                    digest.update(buf)
+        return
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        digest.update(np.ascontiguousarray(series.array.codes).view(np.uint8))
+        _hash_column(digest, pd.Series(series.cat.categories))
+        return
+
+    values = series.to_numpy() if chunks is None else None
+    if values is not None and values.dtype != object:
+        digest.update(np.ascontiguousarray(values).view(np.uint8))
+        return
+
+    # Object / sliced arrow columns -> row hashes, in bounded blocks
+    for start in range(0, len(series), FINGERPRINT_CHUNK_ROWS):
+        block = series.iloc[start:start + FINGERPRINT_CHUNK_ROWS]
+        try:
+            hashed = pd.util.hash_pandas_object(block, index=False)
+        except TypeError:
+            hashed = pd.util.hash_pandas_object(block.astype(str), index=False)
+        digest.update(hashed.to_numpy().tobytes())
+
+
+def _remember(df: pd.DataFrame, token: tuple, version: str):
+    key = id(df)
+    with _fp_lock:
+        _fingerprints[key] = (
+            weakref.ref(df, lambda _, key=key: _fingerprints.pop(key, None)),
+            token,
+            version,
+        )
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Stable 16-hex version id for a dataset.
+
+    Hashes the schema plus every column's raw buffers, so a change to
+    any value yields a new version. Memoized per live frame object and
+    re-validated on each call with a per-column token (buffer address,
+    plus a word checksum for numpy columns), so reassigning a column or
+    editing a value re-hashes without re-reading every row per call.
+    In-place edits to object columns (or ones that swap equal words
+    between rows) slip past the token: call invalidate_fingerprint(df).
+    Frames derived from a fingerprinted one skip the pass entirely via
+    derive_fingerprint.
+    """
+    token = _frame_token(df)
+
+    with _fp_lock:
+        cached = _fingerprints.get(id(df))
+        if cached and cached[0]() is df and cached[1] == token:
+            return cached[2]
+
+    digest = hashlib.sha1(repr(token[0]).encode("utf-8"))
+    for i in range(df.shape[1]):
+        _hash_column(digest, df.iloc[:, i])
+
+    version = digest.hexdigest()[:16]
+    _remember(df, token, version)
+    return version
+
+
+def derive_fingerprint(child: pd.DataFrame, parent: pd.DataFrame, *transform) -> str:
+    """
+    Version `child` as parent's version plus the (deterministic)
+    transformation that produced it, e.g.
+    derive_fingerprint(out, df, "with_valid_dates", date_col).
+    Avoids re-hashing a derived frame that is rebuilt on every rerun.
+    """
+    parts = (dataset_fingerprint(parent),) + tuple(map(repr, transform))
+    version = hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+    _remember(child, _frame_token(child), version)
+    return version
+
+
+def invalidate_fingerprint(df: pd.DataFrame):
+    """Forget `df`'s memoized version after editing it in place."""
+    with _fp_lock:
+        _fingerprints.pop(id(df), None)
+
+
+# -------------------------------------------------
+# Per-Dataset Memo (in-process LRU)
+# -------------------------------------------------
+def _freeze(value):
+    """Hashable form of a memo key part (dict / list / set arguments)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(map(_freeze, value), key=repr))
+    return value
+
+
+class DatasetMemo:
+    """
+    Thread-safe LRU of results derived from one dataset, keyed by
+    key(df) (dataset_fingerprint by default) plus the result's own parts.
+    Values are built outside the lock; concurrent misses may both build.
+
+        _memo = memoize_per_dataset("operations", maxsize=32)
+
+        @_memo                                  # fn(df, *args) by its args
+        def summary(df, cols): ...
+
+        _memo.get(df, ("funnel", col), build)   # build() for a custom key
+    """
+
+    def __init__(self, name: str, maxsize: int, key=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.key = key or dataset_fingerprint
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        _memos.add(self)
+
+    def get(self, df: pd.DataFrame, parts, build):
+        key = (self.key(df),) + _freeze(tuple(parts))
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        value = build()
+
+        with self._lock:
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+        return value
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(df, *args, **kwargs):
+            if df is None:
+                return fn(df, *args, **kwargs)
+            parts = (fn.__name__,) + args + tuple(sorted(kwargs.items()))
+            return self.get(df, parts, lambda: fn(df, *args, **kwargs))
+
+        wrapper.memo = self
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def memoize_per_dataset(name: str, maxsize: int = 32, key=None) -> DatasetMemo:
+    """
+    Named per-dataset memo (see DatasetMemo); `key` replaces
+    dataset_fingerprint, e.g. a schema hash for per-schema results.
+    """
+    return DatasetMemo(name, maxsize, key)
+
+
+def clear_memos():
+    """Empty every per-dataset memo and memoized fingerprint (cold start)."""
+    for memo in list(_memos):
+        memo.clear()
+    with _fp_lock:
+        _fingerprints.clear()
+
+
+# -------------------------------------------------
+# Paths / JSON helpers
+# -------------------------------------------------
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def dataset_dir(version: str) -> str:
+    return os.path.join(DATASET_CACHE_DIR, "datasets", version)
+
+
+def artifact_dir(version: str) -> str:
+    return os.path.join(dataset_dir(version), "artifacts")
+
+
+def _write_json(path: str, payload: dict):
+    """Atomic JSON write (readers never see a half-written file)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2, ensure_ascii=False, default=str)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_parquet(df: pd.DataFrame, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    try:
+        df.to_parquet(tmp, index=False)
+    except (TypeError, ValueError):
+        # Mixed-type object columns (common in raw CSV / Excel) -> text
+        mixed = df.select_dtypes(include="object").columns
+        df.astype({c: str for c in mixed}).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------
+# Order Key Hash Index
+# -------------------------------------------------
+def order_key_column(df: pd.DataFrame) -> str | None:
+    """Case-insensitive lookup of the ORDER_ID de-duplication key."""
+    for col in df.columns:
+        if str(col).upper() == ORDER_KEY_COLUMN:
+            return col
+    return None
+
+
+# Integral key text ("1002", "1002.0") – hashed by value, like int keys
+INTEGRAL_KEY_PATTERN = r"[+-]?\d{1,18}(?:\.0*)?"
+
+
+def hash_keys(values: pd.Series) -> np.ndarray:
+    """
+    Vectorized 64-bit hashes of key values (type-insensitive).
+
+    Integral keys hash by value and everything else by stripped text, so an
+    ORDER_ID read as int, as float (a NaN in the column) or as padded text
+    hashes the same:
+
+    >>> a = hash_keys(pd.Series([1002, 1003]))
+    >>> b = hash_keys(pd.Series([1002.0, 1003.0, np.nan]))
+    >>> c = hash_keys(pd.Series([" 1002", "1003.0 "]))
+    >>> bool((a == b[:2]).all() and (a == c).all())
+    True
+    """
+    if pd.api.types.is_bool_dtype(values):
+        values = values.astype(str)
+
+    if pd.api.types.is_numeric_dtype(values):
+        text = values
+        numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        integral = np.isfinite(numbers) & (numbers % 1 == 0) & (np.abs(numbers) < 1e18)
+        if pd.api.types.is_integer_dtype(values):
+            numbers = values.to_numpy(dtype=np.int64, na_value=0)
+        ints = numbers[integral].astype(np.int64)
+    else:
+        text = values.astype("string").str.strip()
+        integral = text.str.fullmatch(INTEGRAL_KEY_PATTERN).fillna(False).to_numpy(dtype=bool)
+        ints = text[integral].str.replace(r"\.0*$", "", regex=True).astype(np.int64).to_numpy()
+
+    hashes = np.empty(len(values), dtype=np.uint64)
+    hashes[integral] = pd.util.hash_array(ints)
+
+    rest = ~integral
+    if rest.any():
+        hashes[rest] = pd.util.hash_array(text[rest].astype(str).to_numpy(dtype=object))
+
+    return hashes
+
+
+def build_order_index(df: pd.DataFrame) -> np.ndarray | None:
+    key = order_key_column(df)
+    if key is None:
+        return None
+    return np.unique(hash_keys(df[key]))
+
+
+def load_order_index(version: str) -> np.ndarray | None:
+    path = os.path.join(dataset_dir(version), "order_index.npy")
+    return np.load(path) if os.path.exists(path) else None
+
+
+def _save_order_index(version: str, index: np.ndarray | None):
+    if index is None:
+        return
+    path = os.path.join(dataset_dir(version), "order_index.npy")
+    tmp = f"{path}.tmp.npy"
+    np.save(tmp, index)
+    os.replace(tmp, path)
+
+
+def is_known_order(index: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """Boolean mask: which hashes already exist in the sorted index."""
+    if index is None or len(index) == 0:
+        return np.zeros(len(hashes), dtype=bool)
+    pos = np.searchsorted(index, hashes)
+    pos[pos == len(index)] = 0
+    return index[pos] == hashes
+
+
+# -------------------------------------------------
+# Datasets
+# -------------------------------------------------
+def _write_meta(version: str, source: str, rows: int, columns, parts: list, parent: str | None = None):
+    _write_json(os.path.join(dataset_dir(version), "meta.json"), {
+        "version": version,
+        "parent": parent,
+        "source": source,
+        "rows": int(rows),
+        "columns": [str(c) for c in columns],
+        "parts": parts,
+        "published_at": _now(),
+    })
+
+
+def _set_current(version: str, source: str):
+    _write_json(os.path.join(DATASET_CACHE_DIR, "CURRENT.json"), {
+        "version": version,
+        "source": source,
+        "published_at": _now(),
+    })
+
+
+def publish_dataset(df: pd.DataFrame, source: str = "upload") -> str:
+    """
+    Snapshot a dataset into the cache and mark it as CURRENT.
+    Re-publishing identical data is a no-op apart from CURRENT.
+    """
+    version = dataset_fingerprint(df)
+
+    if dataset_meta(version) is None:
+        part = os.path.join("datasets", version, "parts", "part-00000.parquet")
+        _write_parquet(df, os.path.join(DATASET_CACHE_DIR, part))
+        _save_order_index(version, build_order_index(df))
+        _write_meta(version, source, len(df), df.columns, [part])
+
+    _set_current(version, source)
+    return version
+
+
+def append_partition(
+    base_version: str,
+    combined: pd.DataFrame,
+    new_rows: pd.DataFrame,
+    source: str = "append",
+) -> str:
+    """
+    Register `combined` (= base rows + `new_rows`) as a new version that
+    reuses the base version's partitions and adds one new partition.
+    Only the new rows are written to disk.
+    """
+    base_meta = dataset_meta(base_version)
+    if base_meta is None:
+        raise KeyError(f"Unknown dataset version: {base_version}")
+
+    version = dataset_fingerprint(combined)
+
+    if dataset_meta(version) is None:
+        parts = list(base_meta.get("parts", []))
+        part = os.path.join("datasets", version, "parts", f"part-{len(parts):05d}.parquet")
+        _write_parquet(new_rows, os.path.join(DATASET_CACHE_DIR, part))
+
+        base_index = load_order_index(base_version)
+        new_index = build_order_index(new_rows)
+        if base_index is not None and new_index is not None:
+            _save_order_index(version, np.union1d(base_index, new_index))
+
+        _write_meta(version, source, len(combined), combined.columns, parts + [part], parent=base_version)
+
+    _set_current(version, source)
+    return version
+
+
+def current_version() -> str | None:
+    current = _read_json(os.path.join(DATASET_CACHE_DIR, "CURRENT.json"))
+    return current.get("version") if current else None
+
+
+def dataset_meta(version: str) -> dict | None:
+    return _read_json(os.path.join(dataset_dir(version), "meta.json"))
+
+
+def load_version(version: str) -> pd.DataFrame:
+    meta = dataset_meta(version) or {}
+    parts = meta.get("parts") or [os.path.join("datasets", version, "data.parquet")]
+
+    frames = [pd.read_parquet(os.path.join(DATASET_CACHE_DIR, p)) for p in parts]
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+# -------------------------------------------------
+# Artifacts
+# -------------------------------------------------
+def save_artifact(version: str, name: str, result) -> str:
+    """Persist a DataFrame (Parquet) or dict (JSON) artifact."""
+    if isinstance(result, pd.DataFrame):
+        path = os.path.join(artifact_dir(version), f"{name}.parquet")
+        _write_parquet(result, path)
+    else:
+        path = os.path.join(artifact_dir(version), f"{name}.json")
+        _write_json(path, result)
+    return path
+
+
+def load_artifact(version: str, name: str):
+    """Return the stored artifact, or None when it does not exist."""
+    base = os.path.join(artifact_dir(version), name)
+
+    if os.path.exists(f"{base}.parquet"):
+        return pd.read_parquet(f"{base}.parquet")
+
+    return _read_json(f"{base}.json")
+
+
+def artifact_manifest(version: str | None) -> dict | None:
+    if not version:
+        return None
+    return _read_json(os.path.join(artifact_dir(version), "manifest.json"))
+
+
+def write_artifact_manifest(version: str, manifest: dict):
+    _write_json(os.path.join(artifact_dir(version), "manifest.json"), manifest)
+
+
+# -------------------------------------------------
+# Schema Overrides (column-role mapping per schema)
+# -------------------------------------------------
+def _schema_path(key: str) -> str:
+    return os.path.join(DATASET_CACHE_DIR, "schemas", f"{key}.json")
+
+
+def load_schema_override(key: str) -> dict | None:
+    payload = _read_json(_schema_path(key))
+    return payload.get("override") if payload else None
+
+
+def save_schema_override(key: str, override: dict):
+    _write_json(_schema_path(key), {"schema": key, "override": override, "saved_at": _now()})
+
+
+# -------------------------------------------------
+# Parsed Excel Sheets (per workbook content hash)
+# -------------------------------------------------
+def _sheet_path(workbook: str, sheet: str) -> str:
+    name = hashlib.sha1(str(sheet).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(DATASET_CACHE_DIR, "workbooks", workbook, f"{name}.parquet")
+
+
+def load_workbook_sheet(workbook: str, sheet: str) -> pd.DataFrame | None:
+    path = _sheet_path(workbook, sheet)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def save_workbook_sheet(workbook: str, sheet: str, df: pd.DataFrame):
+    _write_parquet(df, _sheet_path(workbook, sheet))
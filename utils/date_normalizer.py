@@ -0,0 +1,92 @@
+# utils/date_normalizer.py
+# -------------------------------------------------
+# Datetime Normalization Service
+# -------------------------------------------------
+#
+# Date strings are parsed with an explicit, once-detected format.
+# Low-cardinality columns (most orders share a few hundred dates) parse
+# only their unique values and map the result back to rows.
+#
+# normalize_dates() runs once at ingest so the prepared session dataset
+# carries real datetime64 columns; every later pd.to_datetime / .dt call
+# on them is then free.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import DATE_MIN_HIT_RATE, UNIQUE_PARSE_MAX_RATIO
+from utils.instrumentation import timed
+from utils.type_inference import NATIVE_DATETIME, detect_date_format, infer_date_columns
+
+
+def to_datetime_fast(series: pd.Series, fmt: str | None = None) -> pd.Series:
+    """
+    Drop-in for pd.to_datetime(series, errors="coerce").
+
+    Uses `fmt` (detected when not given) and unique-value parsing when
+    the column repeats its values.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    fmt = fmt or detect_date_format(series)
+    if fmt == NATIVE_DATETIME:
+        return series
+
+    codes, uniques = pd.factorize(series)
+
+    if len(uniques) > len(series) * UNIQUE_PARSE_MAX_RATIO:
+        return pd.to_datetime(series, format=fmt, errors="coerce")
+
+    parsed = pd.to_datetime(pd.Series(uniques), format=fmt, errors="coerce").to_numpy()
+    values = np.where(codes >= 0, parsed[np.maximum(codes, 0)], np.datetime64("NaT"))
+
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _parse_mixed_offsets(series: pd.Series, fmt: str | None) -> pd.Series | None:
+    """
+    Columns mixing UTC offsets ("+05:30" and "+00:00") cannot share one
+    timezone: parse them as UTC and store naive UTC timestamps. None when
+    the column still does not parse.
+    """
+    try:
+        parsed = pd.to_datetime(series, format=fmt, errors="coerce", utc=True)
+    except (ValueError, TypeError):
+        return None
+    return parsed.dt.tz_localize(None)
+
+
+@timed("ingest")
+def normalize_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepared copy of `df` with detected date columns stored as datetime64.
+
+    A column is only converted when at least DATE_MIN_HIT_RATE of its
+    non-null values parse, so mislabelled text columns are left intact.
+    A column mixing UTC offsets is stored as naive UTC; one that cannot
+    be parsed at all is left as text instead of failing the upload.
+    Returns `df` itself when nothing needs converting.
+    """
+    if df is None or df.empty:
+        return df
+
+    converted = {}
+    for col, fmt in infer_date_columns(df).items():
+        if col not in df.columns or fmt == NATIVE_DATETIME:
+            continue
+
+        try:
+            parsed = to_datetime_fast(df[col], fmt)
+        except (ValueError, TypeError):
+            parsed = _parse_mixed_offsets(df[col], fmt)
+            if parsed is None:
+                continue
+
+        present = int(df[col].notna().sum())
+
+        if present and parsed.notna().sum() >= DATE_MIN_HIT_RATE * present:
+            converted[col] = parsed
+
+    return df.assign(**converted) if converted else df
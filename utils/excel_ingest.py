@@ -0,0 +1,235 @@
+# utils/excel_ingest.py
+# -------------------------------------------------
+# Excel Ingest Engine (Streamlit-free)
+# -------------------------------------------------
+#
+#   list_sheets()   -> sheet names + dimensions read from the .xlsx
+#                      package XML (no workbook load, no cells parsed)
+#   ExcelIngestJob  -> worker thread streaming the selected sheets in
+#                      read-only mode, block by block, with progress
+#
+# Parsed sheets are stored as Parquet in the dataset cache under the
+# workbook's content hash; loading the same workbook again reads
+# Parquet and never touches Excel. python-calamine (Rust reader) is
+# used when installed, openpyxl read-only mode otherwise – both stream
+# rows into the same EXCEL_CHUNK_ROWS blocks.
+# -------------------------------------------------
+
+import hashlib
+import io
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+try:
+    import python_calamine
+    CALAMINE_AVAILABLE = True
+except Exception:
+    CALAMINE_AVAILABLE = False
+
+from config import EXCEL_CHUNK_ROWS
+from utils.dataset_cache import load_workbook_sheet, save_workbook_sheet
+from utils.instrumentation import track
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DIMENSION = re.compile(rb'<(?:\w+:)?dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"')
+
+
+def workbook_bytes(file) -> bytes:
+    """Raw bytes of an uploaded file / path / buffer."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if isinstance(file, str):
+        with open(file, "rb") as fh:
+            return fh.read()
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def workbook_key(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _open(data: bytes):
+    from openpyxl import load_workbook
+
+    return load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for ch in letters:
+        number = number * 26 + ord(ch) - 64
+    return number
+
+
+def list_sheets(data: bytes) -> list:
+    """
+    [{"name", "rows", "columns"}] from the workbook / sheet XML headers.
+    rows excludes the header row; rows / columns are None when the sheet
+    records no dimension.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        rels = ET.fromstring(package.read("xl/_rels/workbook.xml.rels"))
+        targets = {r.get("Id"): r.get("Target") for r in rels.iter(f"{_PKG_NS}Relationship")}
+        workbook = ET.fromstring(package.read("xl/workbook.xml"))
+
+        sheets = []
+        for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+            target = targets.get(sheet.get(f"{_REL_NS}id"), "")
+            path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+            rows = columns = None
+            try:
+                with package.open(path) as fh:
+                    match = _DIMENSION.search(fh.read(8192))
+                if match and match.group(3):
+                    rows = max(int(match.group(4)) - 1, 0)
+                    columns = _column_number(match.group(3).decode()) - _column_number(match.group(1).decode()) + 1
+            except KeyError:
+                pass
+
+            sheets.append({"name": sheet.get("name"), "rows": rows, "columns": columns})
+
+        return sheets
+
+
+def _headers(row) -> list:
+    headers, seen = [], {}
+    for i, value in enumerate(row):
+        name = str(value).strip() if value is not None else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+    return headers
+
+
+def _calamine_cell(value):
+    # calamine reports empty cells as "" and every number as float
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _block(records: list, headers: list) -> pd.DataFrame:
+    width = len(headers)
+    records = [r[:width] + (None,) * (width - len(r)) if len(r) != width else r for r in records]
+    return pd.DataFrame.from_records(records, columns=headers).infer_objects()
+
+
+def _finish(blocks: list, headers: list) -> pd.DataFrame:
+    if not blocks:
+        return pd.DataFrame(columns=headers)
+
+    df = pd.concat(blocks, ignore_index=True).infer_objects()
+
+    # Mixed blocks (a column empty in one block, numeric in another)
+    for col in df.columns[df.dtypes == object]:
+        converted = pd.to_numeric(df[col], errors="coerce")
+        if converted.notna().sum() == df[col].notna().sum():
+            df[col] = converted
+
+    # Drop the all-empty trailing columns Excel often reports
+    empty = [c for c in df.columns if str(c).startswith("Unnamed: ") and df[c].isna().all()]
+    return df.drop(columns=empty)
+
+
+class ExcelIngestJob(threading.Thread):
+    """
+    Parse `sheets` of a workbook in the background.
+
+    Poll `rows_done` / `total_rows` / `stage` for progress; after join(),
+    `result` holds the concatenated frame or `error` the failure.
+    """
+
+    def __init__(self, data: bytes, sheets: list, total_rows: int | None = None):
+        super().__init__(daemon=True, name="excel-ingest")
+        self.data = data
+        self.sheets = list(sheets)
+        self.key = workbook_key(data)
+        self.total_rows = total_rows
+        self.rows_done = 0
+        self.stage = "queued"
+        self.result = None
+        self.error = None
+
+    @property
+    def progress(self) -> float:
+        if not self.is_alive() and self.stage == "done":
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return min(self.rows_done / self.total_rows, 0.99)
+
+    def _stream(self, sheet: str, rows) -> pd.DataFrame:
+        """Header row + EXCEL_CHUNK_ROWS blocks from a row iterator, with progress."""
+        headers = _headers(next(rows, ()))
+        blocks, records = [], []
+        done = self.rows_done
+
+        for row in rows:
+            records.append(row)
+            if len(records) % 1_000 == 0:
+                self.rows_done = done + len(records)
+                self.stage = f"Parsing {sheet}: {self.rows_done:,} rows"
+            if len(records) >= EXCEL_CHUNK_ROWS:
+                blocks.append(_block(records, headers))
+                done += len(records)
+                records = []
+
+        if records:
+            blocks.append(_block(records, headers))
+        self.rows_done = done + len(records)
+
+        return _finish(blocks, headers)
+
+    def _parse(self, sheet: str) -> pd.DataFrame:
+        self.stage = f"Parsing {sheet}"
+        if CALAMINE_AVAILABLE:
+            workbook = python_calamine.CalamineWorkbook.from_filelike(io.BytesIO(self.data))
+            rows = (tuple(map(_calamine_cell, row)) for row in workbook.get_sheet_by_name(sheet).iter_rows())
+            return self._stream(sheet, rows)
+
+        workbook = _open(self.data)
+        try:
+            return self._stream(sheet, workbook[sheet].iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    def run(self):
+        try:
+            frames = []
+            for sheet in self.sheets:
+                cached = load_workbook_sheet(self.key, sheet)
+
+                if cached is None:
+                    with track("ingest", "excel_parse") as rec:
+                        cached = self._parse(sheet)
+                        rec.rows = len(cached)
+                    self.stage = f"Caching {sheet}"
+                    try:
+                        save_workbook_sheet(self.key, sheet, cached)
+                    except Exception:
+                        pass
+                else:
+                    self.rows_done += len(cached)
+
+                frames.append(cached)
+
+            self.result = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            self.stage = "done"
+        except Exception as e:
+            self.error = e
+            self.stage = "failed"
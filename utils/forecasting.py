@@ -9,29 +9,22 @@ except Exception:
 
 from sklearn.linear_model import LinearRegression
 
+from utils.instrumentation import timed
+from utils.series_store import daily_series, resample_series
 
-def prepare_time_series(df, date_col, sales_col, freq="M"):
-    if df is None or df.empty:
-        return pd.DataFrame()
 
-    if date_col not in df.columns or sales_col not in df.columns:
+@timed("aggregation")
+def prepare_time_series(df, date_col, sales_col, freq="MS"):
+    try:
+        daily = daily_series(df, date_col, sales_col)
+    except (ValueError, KeyError):
         return pd.DataFrame()
 
-    temp = df[[date_col, sales_col]].copy()
-    temp[date_col] = pd.to_datetime(temp[date_col], errors="coerce")
-    temp = temp.dropna()
-
-    ts = (
-        temp
-        .groupby(pd.Grouper(key=date_col, freq=freq))[sales_col]
-        .sum()
-        .reset_index()
-    )
-
-    ts.rename(columns={date_col: "ds", sales_col: "y"}, inplace=True)
-    return ts
+    ts = resample_series(daily, freq)
+    return pd.DataFrame({"ds": ts.index, "y": ts.to_numpy()})
 
 
+@timed("model_fit")
 def forecast_sales(ts_df, periods=12):
     if ts_df is None or ts_df.empty:
         return pd.DataFrame()
@@ -41,7 +34,7 @@ def forecast_sales(ts_df, periods=12):
         model = Prophet()
         model.fit(ts_df)
 
-        future = model.make_future_dataframe(periods=periods, freq="M")
+        future = model.make_future_dataframe(periods=periods, freq="MS")
         forecast = model.predict(future)
 
         return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
@@ -62,7 +55,7 @@ def forecast_sales(ts_df, periods=12):
     future_dates = pd.date_range(
         start=ts_df["ds"].iloc[-1],
         periods=periods + 1,
-        freq="M"
+        freq="MS"
     )[1:]
 
     return pd.DataFrame({
@@ -0,0 +1,171 @@
+# utils/frame_compaction.py
+# -------------------------------------------------
+# Dataset Memory Compaction (runs once at ingest)
+# -------------------------------------------------
+#
+#   low-cardinality text   -> category (BRAND, CITY, STATE, ORDERSTATE, ...)
+#   int64                  -> int32 when the value range fits
+#   float64                -> float32 when every value round-trips
+#                             within FLOAT32_TOLERANCE (e.g. paise)
+#   date strings           -> datetime64 (normalize_dates)
+#
+# Monetary columns (detected sales / discount, amount / price / value
+# names) are never compacted – float64 stays float64 so totals never
+# drift, and text money ("1,200") is left for numeric coercion instead
+# of becoming a category. Count columns (detected quantity) are left
+# alone too: int64 stays int64 so summed totals cannot overflow.
+#
+# Categoricals also make groupby / factorize on those columns work on
+# small integer codes instead of strings. Engines still aggregate in
+# float64 (numeric_column / to_numpy(dtype=float64)).
+# -------------------------------------------------
+
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    CATEGORY_MAX_RATIO,
+    COUNT_ROLES,
+    FLOAT32_TOLERANCE,
+    MONETARY_ROLES,
+    MONETARY_TOKENS,
+)
+from utils.column_detector import auto_detect_columns
+from utils.dataset_cache import dataset_fingerprint
+from utils.date_normalizer import normalize_dates
+from utils.instrumentation import timed
+
+_INT32 = np.iinfo(np.int32)
+
+_STATS_MAXSIZE = 16
+_stats = OrderedDict()
+_stats_lock = threading.Lock()
+
+
+def frame_memory(df: pd.DataFrame) -> int:
+    """Deep memory footprint in bytes."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def monetary_columns(df: pd.DataFrame) -> set:
+    """Columns holding money: the detected MONETARY_ROLES plus MONETARY_TOKENS names."""
+    cols = auto_detect_columns(df)
+    monetary = {cols[role] for role in MONETARY_ROLES if cols.get(role)}
+
+    for col in df.columns:
+        spaced = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", str(col))
+        if set(re.split(r"[^a-z0-9]+", spaced.lower())).intersection(MONETARY_TOKENS):
+            monetary.add(col)
+
+    return monetary
+
+
+def count_columns(df: pd.DataFrame) -> set:
+    """Detected COUNT_ROLES columns (quantities)."""
+    cols = auto_detect_columns(df)
+    return {cols[role] for role in COUNT_ROLES if cols.get(role)}
+
+
+def _compact_column(series: pd.Series, monetary: bool = False, count: bool = False):
+    """
+    Compacted Series, or None when the column is left as is.
+    Monetary and count columns are never touched.
+    """
+    dtype = series.dtype
+
+    if monetary or count or isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series):
+        return None
+
+    if _is_text(series):
+        codes, uniques = pd.factorize(series)
+        if len(uniques) > len(series) * CATEGORY_MAX_RATIO:
+            return None
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=pd.Index(uniques)),
+            index=series.index,
+            name=series.name,
+        )
+
+    if pd.api.types.is_integer_dtype(series) and dtype.itemsize > 4:
+        if pd.api.types.is_extension_array_dtype(dtype):
+            return None
+        values = series.to_numpy()
+        if len(values) and (values.min() < _INT32.min or values.max() > _INT32.max):
+            return None
+        return series.astype(np.int32)
+
+    if pd.api.types.is_float_dtype(series) and dtype.itemsize > 4:
+        if pd.api.types.is_extension_array_dtype(dtype):
+            return None
+        values = series.to_numpy()
+        narrow = values.astype(np.float32)
+        with np.errstate(invalid="ignore"):
+            error = np.abs(narrow.astype(np.float64) - values)
+        if np.nanmax(error, initial=0.0) > FLOAT32_TOLERANCE:
+            return None
+        return pd.Series(narrow, index=series.index, name=series.name)
+
+    return None
+
+
+@timed("ingest")
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of `df` with categorical text and downcast numerics (see module notes)."""
+    if df is None or df.empty:
+        return df
+
+    monetary = monetary_columns(df)
+    counts = count_columns(df)
+
+    compacted = {}
+    for col in df.columns:
+        series = _compact_column(df[col], monetary=col in monetary, count=col in counts)
+        if series is not None:
+            compacted[col] = series
+
+    if not compacted:
+        return df
+
+    out = df.copy(deep=False)
+    for col, series in compacted.items():
+        out[col] = series
+    return out
+
+
+def prepare_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ingest preparation shared by upload, Snowflake and the CLI: date
+    normalization followed by compaction. Memory before / after is
+    recorded for compaction_stats().
+    """
+    if df is None or df.empty:
+        return df
+
+    before = frame_memory(df)
+    prepared = compact_frame(normalize_dates(df))
+
+    key = dataset_fingerprint(prepared)
+    with _stats_lock:
+        _stats[key] = {"before": before, "after": frame_memory(prepared)}
+        _stats.move_to_end(key)
+        while len(_stats) > _STATS_MAXSIZE:
+            _stats.popitem(last=False)
+
+    return prepared
+
+
+def compaction_stats(df: pd.DataFrame) -> dict | None:
+    """{"before": bytes, "after": bytes} when `df` came from prepare_dataset()."""
+    if df is None:
+        return None
+    key = dataset_fingerprint(df)
+    with _stats_lock:
+        return _stats.get(key)
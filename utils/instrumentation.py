@@ -0,0 +1,291 @@
+# utils/instrumentation.py
+# -------------------------------------------------
+# Hot-Path Timing Instrumentation (Streamlit-free)
+# -------------------------------------------------
+#
+# Stages used across the platform:
+#   ingest | column_detection | aggregation | model_fit | render
+#
+# Every instrumented step appends one record to a process-wide ring
+# buffer (wall time, rows processed, RSS delta). The hidden Performance
+# view (app.py?view=performance) summarizes it as percentiles.
+# -------------------------------------------------
+
+import contextvars
+import functools
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config import ENABLE_PROFILING, PERF_BUFFER_SIZE
+
+STAGES = ["ingest", "column_detection", "aggregation", "model_fit", "render"]
+
+_records = deque(maxlen=PERF_BUFFER_SIZE)
+_lock = threading.Lock()
+_run_ids = itertools.count(1)
+
+_current_page = contextvars.ContextVar("perf_page", default="(headless)")
+_current_run = contextvars.ContextVar("perf_run", default=0)
+_depth = contextvars.ContextVar("perf_depth", default=0)
+
+# Single-rerun profile capture (armed from the Performance view)
+_capture = {"armed_page": None, "run_id": None, "page": None, "profiler": None, "engine": None}
+
+
+# -------------------------------------------------
+# Memory
+# -------------------------------------------------
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def _rss_bytes() -> int:
+    """
+    Current resident set size. Cheap /proc read on Linux,
+    falls back to peak RSS elsewhere (delta becomes a lower bound).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except Exception:
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return 0
+
+
+def _infer_rows(args, kwargs):
+    for value in itertools.chain(args, kwargs.values()):
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return len(value)
+    return None
+
+
+# -------------------------------------------------
+# Page Context
+# -------------------------------------------------
+def begin_page(page: str) -> int:
+    """
+    Mark the start of a page run. Call once at the top of every page.
+    Steps recorded afterwards (in the same script thread) belong to it.
+    """
+    run_id = next(_run_ids)
+    _current_page.set(page)
+    _current_run.set(run_id)
+    _depth.set(0)
+
+    if _capture["armed_page"] in (page, "*"):
+        _start_capture(page, run_id)
+
+    return run_id
+
+
+def current_page() -> str:
+    return _current_page.get()
+
+
+# -------------------------------------------------
+# Recording
+# -------------------------------------------------
+class StepRecord(dict):
+    """Mutable record yielded by `track` – set `rows` once known."""
+
+    @property
+    def rows(self):
+        return self.get("rows")
+
+    @rows.setter
+    def rows(self, value):
+        self["rows"] = None if value is None else int(value)
+
+
+@contextmanager
+def track(stage: str, step: str, rows=None):
+    """
+    Context manager timing one step.
+
+        with track("aggregation", "monthly_sales", rows=len(df)) as rec:
+            ...
+            rec.rows = len(result)
+    """
+    record = StepRecord(
+        page=_current_page.get(),
+        run_id=_current_run.get(),
+        stage=stage,
+        step=step,
+        depth=_depth.get(),
+    )
+    record.rows = rows
+
+    if not ENABLE_PROFILING:
+        yield record
+        return
+
+    token = _depth.set(record["depth"] + 1)
+    profiling = _capture_active(record)
+
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        record["mem_delta_mb"] = (_rss_bytes() - rss_before) / 1024 ** 2
+        record["ts"] = time.time()
+
+        if profiling:
+            _pause_capture()
+
+        _depth.reset(token)
+
+        with _lock:
+            _records.append(dict(record))
+
+
+def timed(stage: str, step: str | None = None):
+    """
+    Decorator form of `track`. Rows default to the length of the
+    first DataFrame / Series argument.
+    """
+    def decorator(fn):
+        name = step or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track(stage, name, rows=_infer_rows(args, kwargs)):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def records() -> pd.DataFrame:
+    with _lock:
+        snapshot = list(_records)
+    return pd.DataFrame(snapshot)
+
+
+def clear():
+    with _lock:
+        _records.clear()
+
+
+# -------------------------------------------------
+# Summaries
+# -------------------------------------------------
+def _percentiles(grouped):
+    seconds = grouped["seconds"]
+    return pd.DataFrame({
+        "runs": seconds.count(),
+        "p50_s": seconds.quantile(0.50),
+        "p90_s": seconds.quantile(0.90),
+        "p99_s": seconds.quantile(0.99),
+        "max_s": seconds.max(),
+    })
+
+
+def step_summary(data: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Per page × stage × step latency percentiles."""
+    data = records() if data is None else data
+    if data.empty:
+        return pd.DataFrame()
+
+    grouped = data.groupby(["page", "stage", "step"], sort=False)
+    summary = _percentiles(grouped)
+    summary["avg_rows"] = grouped["rows"].mean()
+    summary["avg_mem_delta_mb"] = grouped["mem_delta_mb"].mean()
+
+    return summary.reset_index().sort_values("p90_s", ascending=False)
+
+
+def page_summary(data: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Per page latency percentiles, where one run's time is the sum of
+    its top-level instrumented steps.
+    """
+    data = records() if data is None else data
+    if data.empty:
+        return pd.DataFrame()
+
+    runs = (
+        data[data["depth"] == 0]
+        .groupby(["page", "run_id"], as_index=False)["seconds"]
+        .sum()
+    )
+
+    summary = _percentiles(runs.groupby("page"))
+    return summary.reset_index().sort_values("p90_s", ascending=False)
+
+
+# -------------------------------------------------
+# Single-Rerun Profile Capture (cProfile / pyinstrument)
+# -------------------------------------------------
+def arm_capture(page: str = "*"):
+    """Profile the next run of `page` ("*" = whichever page runs next)."""
+    _capture.update(armed_page=page, run_id=None, page=None, profiler=None, engine=None)
+
+
+def capture_status() -> dict:
+    return {k: _capture[k] for k in ("armed_page", "page", "run_id", "engine")}
+
+
+def _start_capture(page, run_id):
+    try:
+        from pyinstrument import Profiler
+        profiler, engine = Profiler(), "pyinstrument"
+    except Exception:
+        import cProfile
+        profiler, engine = cProfile.Profile(), "cProfile"
+
+    _capture.update(armed_page=None, page=page, run_id=run_id, profiler=profiler, engine=engine)
+
+
+def _capture_active(record) -> bool:
+    """Only top-level steps of the captured run toggle the profiler."""
+    if record["depth"] != 0 or _capture["run_id"] != record["run_id"]:
+        return False
+
+    profiler = _capture["profiler"]
+    if _capture["engine"] == "pyinstrument":
+        profiler.start()
+    else:
+        profiler.enable()
+    return True
+
+
+def _pause_capture():
+    profiler = _capture["profiler"]
+    if _capture["engine"] == "pyinstrument":
+        profiler.stop()
+    else:
+        profiler.disable()
+
+
+def capture_report(limit: int = 40) -> str | None:
+    """Text report of the last captured run (None if nothing captured)."""
+    profiler = _capture["profiler"]
+    if profiler is None:
+        return None
+
+    if _capture["engine"] == "pyinstrument":
+        return profiler.output_text(unicode=True, color=False)
+
+    import io
+    import pstats
+
+    buffer = io.StringIO()
+    try:
+        pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(limit)
+    except TypeError:
+        return "No instrumented steps executed during the captured run."
+    return buffer.getvalue()
@@ -0,0 +1,89 @@
+# utils/numeric_coercion.py
+# -------------------------------------------------
+# Numeric Coercion Engine
+# -------------------------------------------------
+#
+# Already-numeric columns are returned untouched. Text columns such as
+# "₹1,25,000.50", "Rs. 4,500" or "(1,200)" are cleaned with vectorized
+# Arrow string kernels (operating on the UTF-8 buffers, no Python
+# string per row) and cast to float64; unparseable values become NaN.
+# Cleaned columns are cached per dataset fingerprint.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
+from config import CURRENCY_SYMBOL
+from utils.dataset_cache import memoize_per_dataset
+from utils.instrumentation import timed
+
+# Removed before parsing (matched on lower-cased text, longest first).
+# Commas cover both western (1,000,000) and lakh (10,00,000) grouping.
+STRIP_TOKENS = list(dict.fromkeys([
+    CURRENCY_SYMBOL, "₹", "rs.", "rs", "inr", "$", ",", " ", " ",
+]))
+
+_NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+_columns = memoize_per_dataset("numeric_columns", maxsize=32)
+
+
+def is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _parse_arrow(series: pd.Series) -> np.ndarray:
+    try:
+        arr = pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed Python objects (numbers + text)
+        arr = pa.array(series.astype("string"), type=pa.string(), from_pandas=True)
+
+    text = pc.utf8_lower(arr)
+    for token in STRIP_TOKENS:
+        text = pc.replace_substring(text, token, "")
+
+    # Accounting negatives: (1200) -> -1200
+    text = pc.replace_substring(pc.replace_substring(text, "(", "-"), ")", "")
+
+    try:
+        parsed = pc.cast(text, pa.float64())
+    except pa.ArrowInvalid:
+        valid = pc.match_substring_regex(text, _NUMBER_PATTERN)
+        parsed = pc.cast(pc.if_else(valid, text, pa.scalar(None, pa.string())), pa.float64())
+
+    return parsed.to_numpy(zero_copy_only=False)
+
+
+def _parse_pandas(series: pd.Series) -> np.ndarray:
+    text = series.astype(str).str.lower()
+    for token in STRIP_TOKENS:
+        text = text.str.replace(token, "", regex=False)
+    text = text.str.replace("(", "-", regex=False).str.replace(")", "", regex=False)
+    return pd.to_numeric(text, errors="coerce").to_numpy(dtype=np.float64)
+
+
+@timed("aggregation")
+def coerce_numeric(series: pd.Series) -> pd.Series:
+    """Numeric view of `series`: untouched if numeric, else cleaned to float64."""
+    if is_numeric(series):
+        return series
+
+    values = _parse_arrow(series) if PYARROW_AVAILABLE else _parse_pandas(series)
+    return pd.Series(values, index=series.index, name=series.name, dtype=np.float64)
+
+
+def numeric_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """coerce_numeric(df[col]), cached per dataset fingerprint for text columns."""
+    series = df[col]
+    if is_numeric(series):
+        return series
+
+    return _columns.get(df, (col,), lambda: coerce_numeric(series))
@@ -0,0 +1,62 @@
+# utils/performance_view.py
+# -------------------------------------------------
+# Hidden Performance View (app.py?view=performance)
+# -------------------------------------------------
+
+import streamlit as st
+
+from utils import instrumentation as perf
+
+
+def render_performance_view():
+    st.title("⏱ Performance")
+    st.caption("Per-page and per-step latency from the instrumentation ring buffer")
+
+    data = perf.records()
+
+    if data.empty:
+        st.info("No instrumented steps recorded yet. Open a few dashboards first.")
+    else:
+        k1, k2, k3 = st.columns(3)
+        k1.metric("Recorded Steps", f"{len(data):,}")
+        k2.metric("Page Runs", f"{data['run_id'].nunique():,}")
+        k3.metric("Slowest Step", f"{data['seconds'].max():.2f}s")
+
+        st.subheader("📄 Per-Page Latency")
+        st.dataframe(perf.page_summary(data), use_container_width=True)
+
+        st.subheader("🧩 Per-Step Latency")
+        stages = st.multiselect("Stages", perf.STAGES, default=perf.STAGES)
+        steps = perf.step_summary(data)
+        st.dataframe(steps[steps["stage"].isin(stages)], use_container_width=True)
+
+        with st.expander("📄 Raw Records (latest 500)"):
+            st.dataframe(data.tail(500).iloc[::-1], use_container_width=True)
+
+    st.divider()
+
+    # -------------------------------------------------
+    # Single-Rerun Profile Capture
+    # -------------------------------------------------
+    st.subheader("🔬 Profile Capture")
+
+    pages = ["*"] + (sorted(data["page"].unique()) if not data.empty else [])
+    target = st.selectbox("Capture next run of page", pages, format_func=lambda p: "Any page" if p == "*" else p)
+
+    c1, c2 = st.columns(2)
+    if c1.button("🎯 Arm Capture", use_container_width=True):
+        perf.arm_capture(target)
+        st.success("Capture armed – open the target page once.")
+
+    if c2.button("🧹 Clear Records", use_container_width=True):
+        perf.clear()
+        st.rerun()
+
+    status = perf.capture_status()
+    if status["armed_page"]:
+        st.info(f"Waiting for next run of: {status['armed_page']}")
+
+    report = perf.capture_report()
+    if report:
+        st.caption(f"{status['engine']} capture of **{status['page']}** (run {status['run_id']})")
+        st.code(report, language="text")
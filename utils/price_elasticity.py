@@ -0,0 +1,162 @@
+# utils/price_elasticity.py
+# -------------------------------------------------
+# Batched Price Elasticity & Discount Response
+# -------------------------------------------------
+#
+# Lines are rolled up to SKU × period cells (ELASTICITY_PERIOD_DAYS),
+# then two regressions are fitted for every SKU at once:
+#
+#   log(quantity) = a + b · log(net unit price)    b = price elasticity
+#   log(quantity) = a + c · discount %             c = discount uplift
+#
+# Each fit is ordinary least squares per group, solved in closed form
+# from grouped sums (np.bincount over the SKU codes, centred two-pass),
+# so thousands of SKUs cost a few array passes instead of one model per
+# SKU. Results are cached per dataset fingerprint.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import ELASTICITY_MIN_PERIODS, ELASTICITY_PERIOD_DAYS, ELASTICITY_T_THRESHOLD
+from utils.dataset_cache import memoize_per_dataset
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.pricing_metrics import pricing_arrays
+
+_results = memoize_per_dataset("elasticity", maxsize=8)
+
+
+def batched_ols(groups: np.ndarray, x: np.ndarray, y: np.ndarray, n_groups: int) -> dict:
+    """
+    Per-group simple regression y = a + b·x.
+
+    {"n", "slope", "intercept", "se", "t", "r2"} arrays of length
+    n_groups; NaN where a group has fewer than 3 points or no variation
+    in x.
+    """
+    n = np.bincount(groups, minlength=n_groups).astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.bincount(groups, weights=x, minlength=n_groups) / n
+        mean_y = np.bincount(groups, weights=y, minlength=n_groups) / n
+
+        dx = x - mean_x[groups]
+        dy = y - mean_y[groups]
+        sxx = np.bincount(groups, weights=dx * dx, minlength=n_groups)
+        sxy = np.bincount(groups, weights=dx * dy, minlength=n_groups)
+        syy = np.bincount(groups, weights=dy * dy, minlength=n_groups)
+
+        valid = (n >= 3) & (sxx > 1e-12)
+        slope = np.where(valid, sxy / sxx, np.nan)
+        rss = np.maximum(syy - slope * sxy, 0.0)
+        se = np.where(valid, np.sqrt(rss / (n - 2) / sxx), np.nan)
+        r2 = np.where(valid & (syy > 0), 1 - rss / syy, np.nan)
+        t = slope / se
+
+    return {
+        "n": n,
+        "slope": slope,
+        "intercept": mean_y - slope * mean_x,
+        "se": se,
+        "t": np.where(se > 0, t, np.nan),
+        "r2": r2,
+    }
+
+
+def _response(elasticity: float, t: float) -> str:
+    if not np.isfinite(t) or abs(t) < ELASTICITY_T_THRESHOLD:
+        return "No clear response"
+    if elasticity < -1:
+        return "Elastic"
+    if elasticity < 0:
+        return "Inelastic"
+    return "Price-positive"
+
+
+@timed("aggregation")
+def sku_elasticity(
+    df: pd.DataFrame,
+    sku_col: str,
+    date_col: str,
+    sales_col: str,
+    qty_col: str,
+    discount_col: str | None = None,
+) -> pd.DataFrame:
+    """
+    One row per SKU with at least ELASTICITY_MIN_PERIODS priced periods:
+    Periods, Net_Sales, Avg_Unit_Price, Avg_Discount_%, Elasticity,
+    Elasticity_SE, Elasticity_t, Elasticity_R2, Discount_Uplift_%
+    (volume change per +1 pp discount), Uplift_t and Response.
+    Sorted by Net_Sales.
+    """
+    def build():
+        arrays = pricing_arrays(df, sales_col, qty_col, discount_col)
+        dates = to_datetime_fast(df[date_col])
+
+        sku_codes, skus = pd.factorize(df[sku_col])
+        days = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+        valid = (sku_codes >= 0) & dates.notna().to_numpy()
+        if not valid.any():
+            return pd.DataFrame()
+
+        qty = np.nan_to_num(arrays["quantity"])
+        net = np.nan_to_num(arrays["net"])
+        gross = np.nan_to_num(arrays["gross"])
+        discount = arrays["discount"]
+
+        # SKU × period cells
+        period = (days[valid] - days[valid].min()) // ELASTICITY_PERIOD_DAYS
+        cell_key = sku_codes[valid].astype(np.int64) * (int(period.max()) + 1) + period
+        cells, cell_keys = pd.factorize(cell_key)
+        n_cells = len(cell_keys)
+
+        cell_qty = np.bincount(cells, weights=qty[valid], minlength=n_cells)
+        cell_net = np.bincount(cells, weights=net[valid], minlength=n_cells)
+        cell_gross = np.bincount(cells, weights=gross[valid], minlength=n_cells)
+        cell_discount = np.bincount(cells, weights=discount[valid], minlength=n_cells)
+        cell_sku = (cell_keys // (int(period.max()) + 1)).astype(np.int64)
+
+        priced = (cell_qty > 0) & (cell_net > 0)
+        groups = cell_sku[priced]
+        log_qty = np.log(cell_qty[priced])
+        log_price = np.log(cell_net[priced] / cell_qty[priced])
+        discount_pct = np.where(
+            cell_gross[priced] > 0, cell_discount[priced] / cell_gross[priced] * 100, 0.0
+        )
+
+        n_skus = len(skus)
+        price_fit = batched_ols(groups, log_price, log_qty, n_skus)
+        uplift_fit = batched_ols(groups, discount_pct, log_qty, n_skus)
+
+        sku_qty = np.bincount(groups, weights=cell_qty[priced], minlength=n_skus)
+        sku_net = np.bincount(groups, weights=cell_net[priced], minlength=n_skus)
+        sku_gross = np.bincount(groups, weights=cell_gross[priced], minlength=n_skus)
+        sku_discount = np.bincount(groups, weights=cell_discount[priced], minlength=n_skus)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table = pd.DataFrame({
+                sku_col: skus,
+                "Periods": price_fit["n"].astype(np.int64),
+                "Net_Sales": sku_net,
+                "Avg_Unit_Price": sku_net / sku_qty,
+                "Avg_Discount_%": np.where(sku_gross > 0, sku_discount / sku_gross * 100, 0.0),
+                "Elasticity": price_fit["slope"],
+                "Elasticity_SE": price_fit["se"],
+                "Elasticity_t": price_fit["t"],
+                "Elasticity_R2": price_fit["r2"],
+                "Discount_Uplift_%": np.expm1(uplift_fit["slope"]) * 100,
+                "Uplift_t": uplift_fit["t"],
+            })
+
+        table = table[table["Periods"] >= ELASTICITY_MIN_PERIODS]
+        table["Response"] = [
+            _response(e, t) for e, t in zip(table["Elasticity"], table["Elasticity_t"])
+        ]
+
+        return table.sort_values("Net_Sales", ascending=False, ignore_index=True)
+
+    if df is None or df.empty or not all(c and c in df.columns for c in (sku_col, date_col, sales_col, qty_col)):
+        return pd.DataFrame()
+
+    return _results.get(df, (sku_col, date_col, sales_col, qty_col, discount_col), build)
@@ -1,26 +1,236 @@
+# utils/pricing_metrics.py
+# -------------------------------------------------
+# Columnar Pricing & Discount Engine
+# -------------------------------------------------
+#
+# Line-level pricing is computed as standalone float64 arrays over only
+# the sales / quantity / discount columns – the dataset is never copied
+# or widened with derived columns:
+#
+#   net          = sales value (or unit price × quantity − discount)
+#   gross        = net + discount
+#   discount_pct = discount / gross × 100   (0 where gross ≤ 0)
+#   unit_price   = net / quantity           (NaN where quantity ≤ 0)
+#
+# Group statistics (SKU / brand) come from one grouped pass over those
+# arrays. Everything is cached per dataset fingerprint.
+# -------------------------------------------------
+
+import numpy as np
 import pandas as pd
 
+from config import DISCOUNT_BAND_EDGES, PRICE_BAND_LABELS
+from utils.dataset_cache import memoize_per_dataset
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+_cache = memoize_per_dataset("pricing", maxsize=16)
+
+
+
+def _values(df: pd.DataFrame, col: str | None) -> np.ndarray | None:
+    if not col or col not in df.columns:
+        return None
+    return numeric_column(df, col).to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+# -------------------------------------------------
+# Line-Level Arrays
+# -------------------------------------------------
+@timed("aggregation")
+def pricing_arrays(
+    df: pd.DataFrame,
+    sales_col: str | None,
+    qty_col: str | None,
+    discount_col: str | None = None,
+    price_col: str | None = None,
+) -> dict:
+    """
+    {"net", "gross", "discount", "discount_pct", "quantity", "unit_price"}
+    as float64 arrays aligned with df rows. Uses `price_col` × quantity
+    as gross when given, otherwise `sales_col` as the net line value.
+    Raises ValueError when neither can be derived.
+    """
+    def build():
+        qty = _values(df, qty_col)
+        discount = _values(df, discount_col)
+        discount = np.zeros(len(df)) if discount is None else np.nan_to_num(discount)
+
+        price = _values(df, price_col)
+        if price is not None and qty is not None:
+            gross = price * qty
+            net = gross - discount
+        else:
+            net = _values(df, sales_col)
+            if net is None:
+                raise ValueError("Sales or unit price column required for pricing")
+            gross = net + discount
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discount_pct = np.where(gross > 0, discount / gross * 100, 0.0)
+            if qty is None:
+                unit_price = np.full(len(df), np.nan)
+            else:
+                unit_price = np.where(qty > 0, net / qty, np.nan)
+
+        return {
+            "net": net,
+            "gross": gross,
+            "discount": discount,
+            "discount_pct": discount_pct,
+            "quantity": qty,
+            "unit_price": unit_price,
+        }
 
-def calculate_pricing_metrics(df, price_col, qty_col, discount_col=None):
     if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+
+    key = ("arrays", sales_col, qty_col, discount_col, price_col)
+    return _cache.get(df, key, build)
+
+
+def pricing_totals(arrays: dict) -> dict:
+    """Dataset-level Gross / Net / Discount and effective discount %."""
+    gross = float(np.nansum(arrays["gross"]))
+    discount = float(np.nansum(arrays["discount"]))
+    return {
+        "gross_sales": gross,
+        "net_sales": float(np.nansum(arrays["net"])),
+        "discount_amount": discount,
+        "discount_pct": discount / gross * 100 if gross > 0 else 0.0,
+    }
+
+
+# -------------------------------------------------
+# Grouped Statistics
+# -------------------------------------------------
+@timed("aggregation")
+def price_statistics(
+    df: pd.DataFrame,
+    group_col: str,
+    sales_col: str | None,
+    qty_col: str | None,
+    discount_col: str | None = None,
+    price_col: str | None = None,
+) -> pd.DataFrame:
+    """
+    One row per member of `group_col` (SKU, brand, ...):
+    Gross_Sales, Net_Sales, Discount_Amount, Discount_%, Quantity,
+    Avg_Unit_Price (volume weighted), Mean_Unit_Price,
+    Median_Unit_Price, Lines and Price_Band (tertile of the median price
+    across members). Sorted by Net_Sales.
+    """
+    def build():
+        arrays = pricing_arrays(df, sales_col, qty_col, discount_col, price_col)
+        codes, members = pd.factorize(df[group_col])
+
+        frame = pd.DataFrame({
+            "net": arrays["net"],
+            "gross": arrays["gross"],
+            "discount": arrays["discount"],
+            "quantity": arrays["quantity"] if arrays["quantity"] is not None else np.nan,
+            "unit_price": arrays["unit_price"],
+        })[codes >= 0]
+
+        grouped = frame.groupby(codes[codes >= 0], sort=False)
+        stats = grouped.agg(
+            Gross_Sales=("gross", "sum"),
+            Net_Sales=("net", "sum"),
+            Discount_Amount=("discount", "sum"),
+            Quantity=("quantity", "sum"),
+            Mean_Unit_Price=("unit_price", "mean"),
+            Median_Unit_Price=("unit_price", "median"),
+            Lines=("net", "size"),
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stats["Discount_%"] = np.where(
+                stats["Gross_Sales"] > 0, stats["Discount_Amount"] / stats["Gross_Sales"] * 100, 0.0
+            )
+            stats["Avg_Unit_Price"] = np.where(
+                stats["Quantity"] > 0, stats["Net_Sales"] / stats["Quantity"], np.nan
+            )
+
+        medians = stats["Median_Unit_Price"]
+        if medians.notna().sum() >= len(PRICE_BAND_LABELS):
+            ranks = medians.rank(method="first")
+            stats["Price_Band"] = pd.qcut(ranks, len(PRICE_BAND_LABELS), labels=PRICE_BAND_LABELS)
+        else:
+            stats["Price_Band"] = pd.Categorical([None] * len(stats), categories=PRICE_BAND_LABELS)
+
+        stats.insert(0, group_col, members[stats.index.to_numpy()])
+
+        return stats.sort_values("Net_Sales", ascending=False, ignore_index=True)[[
+            group_col, "Gross_Sales", "Net_Sales", "Discount_Amount", "Discount_%", "Quantity",
+            "Avg_Unit_Price", "Mean_Unit_Price", "Median_Unit_Price", "Lines", "Price_Band",
+        ]]
+
+    if df is None or df.empty or group_col not in df.columns:
         return pd.DataFrame()
 
-    df = df.copy()
+    key = ("groups", group_col, sales_col, qty_col, discount_col, price_col)
+    return _cache.get(df, key, build)
+
+
+def discount_bands(arrays: dict) -> pd.DataFrame:
+    """Net sales, lines and share by discount-% band (DISCOUNT_BAND_EDGES)."""
+    edges = list(DISCOUNT_BAND_EDGES)
+    labels = (
+        ["No discount", f"≤{edges[0]:g}%"]
+        + [f"{lo:g}–{hi:g}%" for lo, hi in zip(edges[:-1], edges[1:])]
+        + [f">{edges[-1]:g}%"]
+    )
+
+    # 0 -> "No discount"; (0, e1] -> band 1; (e1, e2] -> band 2; ...
+    # 0.1 pp resolution: paise rounding must not push a 5% line into 5–10%
+    pct = np.round(arrays["discount_pct"], 1)
+    band = np.where(pct > 0, np.searchsorted(edges, pct, side="left") + 1, 0)
+
+    net = np.nan_to_num(arrays["net"])
+    sales = np.bincount(band, weights=net, minlength=len(labels))
+    lines = np.bincount(band, minlength=len(labels))
+
+    total = sales.sum()
+    return pd.DataFrame({
+        "Discount_Band": labels,
+        "Net_Sales": sales,
+        "Lines": lines,
+        "Share_%": sales / total * 100 if total else np.zeros(len(labels)),
+    })
 
-    df["Gross_Sales"] = df[price_col] * df[qty_col]
 
-    if discount_col and discount_col in df.columns:
-        df["Discount_Amount"] = df[discount_col].fillna(0)
-    else:
-        df["Discount_Amount"] = 0
+def price_histogram(arrays: dict, bins: int = 30) -> pd.DataFrame:
+    """Line counts per unit-price bin (1st–99th percentile range)."""
+    price = arrays["unit_price"]
+    price = price[np.isfinite(price)]
+    if price.size == 0:
+        return pd.DataFrame(columns=["Unit_Price", "Lines"])
 
-    df["Net_Sales"] = df["Gross_Sales"] - df["Discount_Amount"]
+    lo, hi = np.percentile(price, [1, 99])
+    counts, edges = np.histogram(price, bins=bins, range=(lo, hi if hi > lo else lo + 1))
+    return pd.DataFrame({"Unit_Price": np.round((edges[:-1] + edges[1:]) / 2, 2), "Lines": counts})
 
-    df["Discount_Percent"] = (
-        df["Discount_Amount"] / df["Gross_Sales"].replace(0, pd.NA)
-    ).fillna(0) * 100
 
-    return df
+# -------------------------------------------------
+# Frame API (kept for existing callers)
+# -------------------------------------------------
+def calculate_pricing_metrics(df, price_col, qty_col, discount_col=None):
+    """
+    `df` with Gross_Sales / Discount_Amount / Net_Sales / Discount_Percent
+    appended. Built from pricing_arrays(); the source columns are shared
+    with `df` (Copy-on-Write), not copied.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    arrays = pricing_arrays(df, None, qty_col, discount_col, price_col=price_col)
+
+    return df.assign(
+        Gross_Sales=arrays["gross"],
+        Discount_Amount=arrays["discount"],
+        Net_Sales=arrays["net"],
+        Discount_Percent=arrays["discount_pct"],
+    )
 
 
 def sku_level_pricing(df, sku_col):
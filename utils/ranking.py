@@ -0,0 +1,141 @@
+# utils/ranking.py
+# -------------------------------------------------
+# Ranking & Concentration (partial selection)
+# -------------------------------------------------
+#
+#   group_totals()  one aggregation per (dataset, group, value): factorize
+#                   + np.bincount, cached per dataset fingerprint
+#   top_n()         leaders via np.argpartition – O(n) selection, only
+#                   the n winners are sorted
+#   ranked_table()  top-n rows with Share_%, Cumulative_% and ABC class
+#                   (exact: the cumulative share of the leaders only
+#                   needs the leaders)
+#   concentration() top-n / tail sums, Pareto curve, ABC split and Gini
+#
+# Every function past group_totals() takes a totals Series, so cube
+# rollups (engine.cube) and page aggregates rank the same way.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import ABC_THRESHOLDS
+from utils.dataset_cache import memoize_per_dataset
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+_totals = memoize_per_dataset("group_totals", maxsize=32)
+
+PARETO_POINTS = 200
+
+
+@timed("aggregation")
+def group_totals(df: pd.DataFrame, group_col: str, value_col: str) -> pd.Series:
+    """Sum of `value_col` per member of `group_col` (unsorted, NaN keys dropped)."""
+    if df is None or df.empty or group_col not in df.columns or value_col not in df.columns:
+        return pd.Series(dtype=np.float64)
+
+    def build():
+        codes, members = pd.factorize(df[group_col])
+        values = numeric_column(df, value_col).to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = codes >= 0
+
+        return pd.Series(
+            np.bincount(codes[valid], weights=np.nan_to_num(values[valid]), minlength=len(members)),
+            index=pd.Index(members, name=group_col),
+            name=value_col,
+        )
+
+    return _totals.get(df, (group_col, value_col), build)
+
+
+def top_n(totals: pd.Series, n: int, largest: bool = True) -> pd.Series:
+    """The n largest (or smallest) totals, sorted – argpartition, no full sort."""
+    values = totals.to_numpy(dtype=np.float64)
+    n = max(0, min(int(n), len(values)))
+    if n == 0:
+        return totals.iloc[:0]
+
+    keyed = -values if largest else values
+    if n < len(values):
+        picked = np.argpartition(keyed, n - 1)[:n]
+    else:
+        picked = np.arange(len(values))
+    picked = picked[np.argsort(keyed[picked], kind="stable")]
+
+    return totals.iloc[picked]
+
+
+def _abc_class(cumulative_before: np.ndarray) -> np.ndarray:
+    a, b = ABC_THRESHOLDS
+    return np.select([cumulative_before < a, cumulative_before < b], ["A", "B"], "C")
+
+
+def ranked_table(totals: pd.Series, n: int, value_name: str | None = None) -> pd.DataFrame:
+    """Top-n members with Rank, value, Share_%, Cumulative_% and ABC_Class."""
+    top = top_n(totals, n)
+    grand = float(totals.sum())
+    value_name = value_name or totals.name or "Value"
+
+    values = top.to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = values / grand * 100 if grand else np.zeros(len(values))
+    cumulative = np.cumsum(share)
+
+    return pd.DataFrame({
+        "Rank": np.arange(1, len(top) + 1),
+        totals.index.name or "Member": top.index,
+        value_name: values,
+        "Share_%": share,
+        "Cumulative_%": cumulative,
+        "ABC_Class": _abc_class(cumulative - share),
+    })
+
+
+@timed("aggregation")
+def concentration(totals: pd.Series, top: int = 20) -> dict:
+    """
+    {"members", "total", "top_sum", "top_share", "tail_sum", "tail_share",
+     "gini", "abc" (Class, Members, Value, Share_%), "pareto"
+     (Members_%, Value_%)} – negative totals count as zero.
+    """
+    values = np.maximum(totals.to_numpy(dtype=np.float64), 0.0)
+    n = len(values)
+    total = float(values.sum())
+
+    if n == 0 or total <= 0:
+        return {}
+
+    ordered = np.sort(values)[::-1]
+    cumulative = np.cumsum(ordered) / total * 100
+
+    top = min(top, n)
+    top_sum = float(cumulative[top - 1] * total / 100)
+
+    # Gini from the ascending order: (2 Σ i·x_i) / (n Σ x) − (n + 1) / n
+    ascending = ordered[::-1]
+    gini = float(2 * np.dot(np.arange(1, n + 1), ascending) / (n * total) - (n + 1) / n)
+
+    classes = _abc_class(np.concatenate([[0.0], cumulative[:-1]]))
+    abc = pd.DataFrame({"Class": ["A", "B", "C"]})
+    abc["Members"] = [int((classes == c).sum()) for c in abc["Class"]]
+    abc["Value"] = [float(ordered[classes == c].sum()) for c in abc["Class"]]
+    abc["Share_%"] = abc["Value"] / total * 100
+
+    points = np.unique(np.linspace(0, n - 1, min(n, PARETO_POINTS)).astype(np.int64))
+    pareto = pd.DataFrame({
+        "Members_%": np.concatenate([[0.0], (points + 1) / n * 100]),
+        "Value_%": np.concatenate([[0.0], cumulative[points]]),
+    })
+
+    return {
+        "members": n,
+        "total": total,
+        "top_sum": top_sum,
+        "top_share": top_sum / total * 100,
+        "tail_sum": total - top_sum,
+        "tail_share": (total - top_sum) / total * 100,
+        "gini": gini,
+        "abc": abc,
+        "pareto": pareto,
+    }
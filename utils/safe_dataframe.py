@@ -1,6 +1,10 @@
 import pandas as pd
 
+from utils.instrumentation import timed
+from utils.series_store import daily_series
 
+
+@timed("aggregation")
 def prepare_daily_sales_df(df: pd.DataFrame, date_col: str, sales_col: str):
     """
     Bulletproof daily sales preparation
@@ -8,56 +12,13 @@ def prepare_daily_sales_df(df: pd.DataFrame, date_col: str, sales_col: str):
     - Guarantees Plotly-safe numeric columns
     """
 
-    if df is None or df.empty:
-        raise ValueError("Dataset is empty")
-
-    if date_col not in df.columns or sales_col not in df.columns:
-        raise KeyError("Required columns missing")
-
-    data = df[[date_col, sales_col]].copy()
-
-    # -----------------------------
-    # DATE CLEANING
-    # -----------------------------
-    data[date_col] = pd.to_datetime(
-        data[date_col],
-        errors="coerce",
-        utc=False
-    )
-
-    data = data.dropna(subset=[date_col])
-
-    # -----------------------------
-    # SALES CLEANING
-    # -----------------------------
-    data[sales_col] = (
-        data[sales_col]
-        .astype(str)
-        .str.replace(",", "", regex=False)
-    )
-
-    data[sales_col] = pd.to_numeric(
-        data[sales_col],
-        errors="coerce"
-    )
-
-    data = data.dropna(subset=[sales_col])
-
-    if data.empty:
-        raise ValueError("No valid daily sales data after cleaning")
-
-    # -----------------------------
-    # DAILY AGGREGATION
-    # -----------------------------
+    # Raises ValueError / KeyError for empty data or missing columns
     daily_df = (
-        data
-        .groupby(pd.Grouper(key=date_col, freq="D"))
-        .sum(numeric_only=True)
+        daily_series(df, date_col, sales_col)
+        .rename_axis(date_col)
         .reset_index()
     )
 
-    daily_df.rename(columns={sales_col: "Daily_Sales"}, inplace=True)
-
     # -----------------------------
     # SORT + ROLLING
     # -----------------------------
@@ -1,41 +1,125 @@
+# utils/schema_normalizer.py
+# -------------------------------------------------
+# Canonical Schema View
+# -------------------------------------------------
+#
+# Upload and Snowflake datasets name their columns differently. Instead
+# of renaming (a new frame per call) or uppercasing the shared session
+# frame in place, a CanonicalView maps canonical names to the detected
+# source columns and hands out the underlying Series – no data is copied
+# and the dataset itself is never modified.
+# -------------------------------------------------
+
+from collections.abc import Mapping
+
 import pandas as pd
+
 from utils.column_detector import auto_detect_columns
+from utils.date_normalizer import to_datetime_fast
+from utils.numeric_coercion import numeric_column
 
+# canonical name -> auto_detect_columns role
+CANONICAL_ROLES = {
+    "DATE": "date",
+    "SALES": "sales",
+    "QUANTITY": "quantity",
+    "DISCOUNT": "discount",
+    "SKU": "sku",
+    "BRAND": "brand",
+    "OUTLET": "outlet",
+    "SALES_REP": "rep",
+    "DESIGNATION": "designation",
+    "VISIT_TIME": "visit_time",
+    "ORDER_ID": "order_id",
+    "ORDERSTATE": "order_state",
+    "CITY": "city",
+    "STATE": "state",
+    "ZONE": "zone",
+    "WAREHOUSE": "warehouse",
+}
 
-def normalize_dataframe_schema(df: pd.DataFrame) -> pd.DataFrame:
+
+class CanonicalView(Mapping):
     """
-    Normalize dataframe column names so ALL dashboards
-    work consistently for Upload + Snowflake.
+    Read-only mapping of canonical column names to the dataset's Series.
+
+        view = canonical_view(df)
+        view["SALES"]            -> df[<detected sales column>] (no copy)
+        view.numeric("SALES")    -> cleaned float view (cached)
+        view.dates()             -> DATE as datetime64
+        view.source("OUTLET")    -> underlying column name
     """
 
-    if df is None or df.empty:
-        return df
+    def __init__(self, df: pd.DataFrame, cols: dict | None = None):
+        self.df = df
+        cols = cols if cols is not None else auto_detect_columns(df)
+        self.columns = {
+            name: cols[role]
+            for name, role in CANONICAL_ROLES.items()
+            if cols.get(role) is not None and cols[role] in df.columns
+        }
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self.df[self.columns[name]]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def has(self, *names) -> bool:
+        return all(name in self.columns for name in names)
 
-    cols = auto_detect_columns(df)
+    def source(self, name: str):
+        return self.columns.get(name)
 
-    rename_map = {}
+    def numeric(self, name: str) -> pd.Series:
+        return numeric_column(self.df, self.columns[name])
 
-    if cols.get("date"):
-        rename_map[cols["date"]] = "DATE"
+    def dates(self, name: str = "DATE") -> pd.Series:
+        return to_datetime_fast(self[name])
 
-    if cols.get("sales"):
-        rename_map[cols["sales"]] = "SALES"
+    def to_frame(self, names=None) -> pd.DataFrame:
+        """Frame with canonical headers (Copy-on-Write, shares the column data)."""
+        names = [n for n in (names or self.columns) if n in self.columns]
+        return pd.DataFrame({name: self[name] for name in names}, copy=False)
 
-    if cols.get("quantity"):
-        rename_map[cols["quantity"]] = "QUANTITY"
 
-    if cols.get("brand"):
-        rename_map[cols["brand"]] = "BRAND"
+def canonical_view(df: pd.DataFrame, cols: dict | None = None) -> CanonicalView:
+    return CanonicalView(df, cols)
 
-    if cols.get("sku"):
-        rename_map[cols["sku"]] = "SKU"
 
-    if cols.get("rep"):
-        rename_map[cols["rep"]] = "SALES_REP"
+def resolve_column(df: pd.DataFrame, name):
+    """
+    Column of `df` for `name`: `name` itself when present, otherwise the
+    column detected for canonical `name` ("SALES", "DATE", ...), or None.
+    """
+    if df is None or name is None or name in df.columns:
+        return name
+    return canonical_view(df).source(name)
+
+
+def normalize_dataframe_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize dataframe column names so ALL dashboards
+    work consistently for Upload + Snowflake.
+
+    Detected columns are renamed to their canonical names; every other
+    column is kept. A canonical name already held by an undetected column
+    is left alone. Returns a new frame (Copy-on-Write, no data copied).
+    """
+
+    if df is None or df.empty:
+        return df
 
-    if cols.get("outlet"):
-        rename_map[cols["outlet"]] = "OUTLET"
+    view = canonical_view(df)
+    renamed = set(view.columns.values())
+    taken = {str(c) for c in df.columns if c not in renamed}
 
-    df = df.rename(columns=rename_map)
+    rename_map = {
+        source: name for name, source in view.columns.items()
+        if source != name and name not in taken
+    }
 
-    return df
+    return df.rename(columns=rename_map)
@@ -2,7 +2,10 @@ import pandas as pd
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 
+from utils.instrumentation import timed
 
+
+@timed("aggregation")
 def prepare_outlet_features(df, outlet_col, sales_col, qty_col):
     if df is None or df.empty:
         return pd.DataFrame()
@@ -22,6 +25,7 @@ def prepare_outlet_features(df, outlet_col, sales_col, qty_col):
     return outlet_df
 
 
+@timed("model_fit")
 def segment_outlets(outlet_df, n_clusters=3):
     if outlet_df is None or outlet_df.empty:
         return pd.DataFrame()
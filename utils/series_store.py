@@ -0,0 +1,241 @@
+# utils/series_store.py
+# -------------------------------------------------
+# Shared Sales Time-Series Store
+# -------------------------------------------------
+#
+# The daily sales series is built once per dataset (bincount over day
+# offsets, gap-free calendar) and everything else is derived from it:
+# weekly / monthly resamples, rolling averages and period growth
+# (including calendar-correct MTD / same-day-last-year comparisons).
+#
+# Per-dimension daily series (brand, state, outlet, ...) are kept as a
+# 2-D array [member × day] so slicing a handful of members is free;
+# dimension_window() keeps only the trailing days plus per-member history
+# moments for universes too large for the full calendar.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import SERIES_MATRIX_MAX_CELLS
+from utils.calendar_growth import calendar_growth
+from utils.dataset_cache import memoize_per_dataset
+from utils.date_normalizer import to_datetime_fast
+from utils.instrumentation import timed
+from utils.numeric_coercion import numeric_column
+
+_store = memoize_per_dataset("series_store", maxsize=32)
+
+
+
+def _day_offsets(df: pd.DataFrame, date_col: str, sales_col: str):
+    """(day offsets from the first day, sales, first day, valid-row mask)."""
+    if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+
+    if date_col not in df.columns or sales_col not in df.columns:
+        raise KeyError("Required columns missing")
+
+    dates = to_datetime_fast(df[date_col])
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_localize(None)
+
+    sales = numeric_column(df, sales_col)
+    valid = (dates.notna() & sales.notna()).to_numpy()
+
+    if not valid.any():
+        raise ValueError("No valid daily sales data after cleaning")
+
+    days = dates.to_numpy()[valid].astype("datetime64[D]").astype(np.int64)
+    first = days.min()
+
+    return days - first, sales.to_numpy(dtype=np.float64)[valid], first, valid
+
+
+def _calendar(first: int, n_days: int) -> pd.DatetimeIndex:
+    return pd.date_range(np.datetime64(int(first), "D"), periods=n_days, freq="D", name="Date")
+
+
+# -------------------------------------------------
+# Daily Series
+# -------------------------------------------------
+@timed("aggregation")
+def daily_series(df: pd.DataFrame, date_col: str, sales_col: str) -> pd.Series:
+    """
+    Gap-free daily sales (Series named Daily_Sales on a daily
+    DatetimeIndex). Cached per dataset fingerprint and column pair.
+    Raises ValueError / KeyError when no series can be built.
+    """
+    def build():
+        offsets, sales, first, _ = _day_offsets(df, date_col, sales_col)
+        totals = np.bincount(offsets, weights=sales)
+        return pd.Series(totals, index=_calendar(first, len(totals)), name="Daily_Sales")
+
+    if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+
+    return _store.get(df, ("daily", date_col, sales_col), build)
+
+
+def resample_series(daily: pd.Series, freq: str = "MS") -> pd.Series:
+    """Weekly ("W") / monthly ("MS") / ... totals derived from the daily series."""
+    if freq == "D":
+        return daily
+    return daily.resample(freq).sum()
+
+
+def rolling_mean(series: pd.Series, window: int) -> pd.Series:
+    return series.rolling(window, min_periods=1).mean()
+
+
+def period_growth(series: pd.Series, periods: int = 1) -> pd.Series:
+    """Percent change versus `periods` steps earlier."""
+    return series.pct_change(periods) * 100
+
+
+def period_comparison(df: pd.DataFrame, date_col: str, sales_col: str, trading_days: bool = False) -> pd.DataFrame:
+    """calendar_growth() of the daily series, cached alongside it."""
+    daily = daily_series(df, date_col, sales_col)
+    return _store.get(
+        df,
+        ("growth", date_col, sales_col, trading_days),
+        lambda: calendar_growth(daily, trading_days=trading_days),
+    )
+
+
+# -------------------------------------------------
+# Per-Dimension Daily Matrix
+# -------------------------------------------------
+@timed("aggregation")
+def dimension_matrix(df: pd.DataFrame, date_col: str, sales_col: str, dim_col: str):
+    """
+    Daily sales per member of `dim_col`.
+
+    Returns (members Index, dates DatetimeIndex, values ndarray of shape
+    [len(members), len(dates)]). Cached like daily_series; raises
+    ValueError above SERIES_MATRIX_MAX_CELLS (e.g. outlet × day on
+    very large outlet universes – see dimension_window()).
+    """
+    def build():
+        offsets, sales, first, valid = _day_offsets(df, date_col, sales_col)
+        codes, members = pd.factorize(df[dim_col].to_numpy()[valid], use_na_sentinel=False)
+
+        n_days = int(offsets.max()) + 1
+        if len(members) * n_days > SERIES_MATRIX_MAX_CELLS:
+            raise ValueError(
+                f"{dim_col} has too many members ({len(members):,}) for a daily matrix"
+            )
+
+        flat = np.bincount(
+            codes.astype(np.int64) * n_days + offsets,
+            weights=sales,
+            minlength=len(members) * n_days,
+        )
+
+        return pd.Index(members, name=dim_col), _calendar(first, n_days), flat.reshape(len(members), n_days)
+
+    if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+    if dim_col not in df.columns:
+        raise KeyError(f"Column not found: {dim_col}")
+
+    return _store.get(df, ("matrix", date_col, sales_col, dim_col), build)
+
+
+@timed("aggregation")
+def dimension_window(df: pd.DataFrame, date_col: str, sales_col: str, dim_col: str, days: int, split: int):
+    """
+    Trailing slice of dimension_matrix() plus history moments, for member
+    universes too large for the full matrix (outlet × two years).
+
+    Returns (members Index, dates DatetimeIndex of the last `days` days,
+    values ndarray [len(members), days], history dict). history holds the
+    moments of each member's daily sales before the last `split` days –
+    "days" (count), "sum" and "sum_sq" – from grouped sums of x and x²
+    over the rows, never a dense member × day array.
+    """
+    def build():
+        offsets, sales, first, valid = _day_offsets(df, date_col, sales_col)
+        codes, members = pd.factorize(df[dim_col].to_numpy()[valid], use_na_sentinel=False)
+        codes = codes.astype(np.int64)
+
+        n_days = int(offsets.max()) + 1
+        n_recent = min(days, n_days)
+        start = n_days - n_recent
+        if len(members) * n_recent > SERIES_MATRIX_MAX_CELLS:
+            raise ValueError(
+                f"{dim_col} has too many members ({len(members):,}) for a daily matrix"
+            )
+
+        recent = offsets >= start
+        flat = np.bincount(
+            codes[recent] * n_recent + (offsets[recent] - start),
+            weights=sales[recent],
+            minlength=len(members) * n_recent,
+        )
+
+        # Days with no sales are zeros: they add to the day count only
+        past = offsets < n_days - split
+        pair, pairs = pd.factorize(codes[past] * n_days + offsets[past])
+        day_totals = np.bincount(pair, weights=sales[past], minlength=len(pairs))
+        history = {
+            "days": max(0, n_days - split),
+            "sum": np.bincount(codes[past], weights=sales[past], minlength=len(members)),
+            "sum_sq": np.bincount(pairs // n_days, weights=day_totals * day_totals, minlength=len(members)),
+        }
+
+        values = flat.reshape(len(members), n_recent)
+        return pd.Index(members, name=dim_col), _calendar(first + start, n_recent), values, history
+
+    if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+    if dim_col not in df.columns:
+        raise KeyError(f"Column not found: {dim_col}")
+
+    return _store.get(df, ("window", date_col, sales_col, dim_col, days, split), build)
+
+
+@timed("aggregation")
+def metric_matrix(df: pd.DataFrame, date_col: str, metrics) -> tuple:
+    """
+    Daily totals of several numeric metrics at once.
+
+    Returns (metrics Index, dates DatetimeIndex, values ndarray of shape
+    [len(metrics), len(dates)]). Cached like daily_series.
+    """
+    metrics = tuple(m for m in metrics if m in df.columns) if df is not None else ()
+
+    def build():
+        if not metrics:
+            raise ValueError("No numeric metrics to aggregate")
+
+        dates = to_datetime_fast(df[date_col])
+        if getattr(dates.dt, "tz", None) is not None:
+            dates = dates.dt.tz_localize(None)
+
+        valid = dates.notna().to_numpy()
+        if not valid.any():
+            raise ValueError("No valid dates")
+
+        days = dates.to_numpy()[valid].astype("datetime64[D]").astype(np.int64)
+        first = days.min()
+        offsets = days - first
+        n_days = int(offsets.max()) + 1
+
+        values = np.vstack([
+            np.bincount(
+                offsets,
+                weights=np.nan_to_num(numeric_column(df, m).to_numpy(dtype=np.float64)[valid]),
+                minlength=n_days,
+            )
+            for m in metrics
+        ])
+
+        return pd.Index(metrics), _calendar(first, n_days), values
+
+    if df is None or df.empty:
+        raise ValueError("Dataset is empty")
+    if date_col not in df.columns:
+        raise KeyError("Required columns missing")
+
+    return _store.get(df, ("metrics", date_col, metrics), build)
@@ -0,0 +1,113 @@
+# utils/sketches.py
+# -------------------------------------------------
+# Mergeable Streaming Sketches (chunked profiling)
+# -------------------------------------------------
+#
+# HyperLogLog   -> approximate distinct counts
+# QuantileSketch -> bottom-k uniform sample for approximate quantiles
+#
+# Both are updated chunk by chunk and can be merged, so a profile of a
+# large frame never needs more than one chunk in memory.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import HLL_PRECISION, QUANTILE_SKETCH_SIZE
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """Vectorized 64-bit hashes of non-null values."""
+    values = values.dropna()
+    try:
+        hashed = pd.util.hash_pandas_object(values, index=False)
+    except TypeError:
+        # Mixed / unhashable object columns
+        hashed = pd.util.hash_pandas_object(values.astype(str), index=False)
+    return hashed.to_numpy(dtype=np.uint64)
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Exact bit length of uint64 values (0 -> 0)."""
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(hi > 0, np.frexp(hi)[1] + 32, np.frexp(lo)[1])
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit hashes."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+
+        width = 64 - self.p
+        idx = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+        rank = (width - _bit_length(rest) + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            raw = m * np.log(m / zeros)
+
+        return int(round(raw))
+
+
+class QuantileSketch:
+    """
+    Bottom-k sample: every value gets a random priority and the k lowest
+    priorities are kept, which is a uniform sample of everything seen.
+    """
+
+    def __init__(self, size: int = QUANTILE_SKETCH_SIZE, seed: int = 0):
+        self.size = size
+        self.count = 0
+        self.values = np.empty(0, dtype=np.float64)
+        self.keys = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.count += len(values)
+        self._keep(
+            np.concatenate([self.values, values]),
+            np.concatenate([self.keys, self._rng.random(len(values))]),
+        )
+
+    def merge(self, other: "QuantileSketch"):
+        self.count += other.count
+        self._keep(
+            np.concatenate([self.values, other.values]),
+            np.concatenate([self.keys, other.keys]),
+        )
+
+    def _keep(self, values: np.ndarray, keys: np.ndarray):
+        if len(values) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            values, keys = values[keep], keys[keep]
+        self.values, self.keys = values, keys
+
+    def quantiles(self, qs) -> list:
+        if len(self.values) == 0:
+            return [None] * len(qs)
+        return [float(v) for v in np.quantile(self.values, qs)]
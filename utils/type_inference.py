@@ -0,0 +1,136 @@
+# utils/type_inference.py
+# -------------------------------------------------
+# Cheap Column Type Inference (date columns)
+# -------------------------------------------------
+#
+# A few hundred sampled values per text column are tested against a
+# short list of explicit date formats. Only columns whose sample hit
+# rate clears DATE_MIN_HIT_RATE are treated as dates, and they are then
+# parsed with the detected `format=` (see utils/date_normalizer.py).
+# Results are cached per dataset fingerprint, in memory and alongside
+# the cached dataset.
+# -------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from config import DATE_MIN_HIT_RATE, DATE_SAMPLE_SIZE, DEFAULT_DATE_FORMAT
+from utils.dataset_cache import dataset_fingerprint, dataset_meta, load_artifact, memoize_per_dataset, save_artifact
+from utils.instrumentation import timed
+
+# Tried in order; ties in hit rate go to the earlier format
+DATE_FORMATS = list(dict.fromkeys([
+    DEFAULT_DATE_FORMAT,
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d",
+    "ISO8601",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%d.%m.%Y",
+    "%d-%m-%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%d-%b-%Y",
+    "%d %b %Y",
+    "%b %d, %Y",
+]))
+
+# Column already holds datetimes (Excel / Snowflake / prepared data)
+NATIVE_DATETIME = "datetime"
+
+_formats = memoize_per_dataset("date_formats", maxsize=8)
+
+
+def _sample_values(series: pd.Series, size: int = DATE_SAMPLE_SIZE) -> pd.Series:
+    # Strided pick first, so nulls are only dropped from a small slice
+    if len(series) > size * 4:
+        series = series.iloc[np.linspace(0, len(series) - 1, size * 4, dtype=np.int64)]
+    values = series.dropna()
+    if len(values) > size:
+        values = values.iloc[np.linspace(0, len(values) - 1, size, dtype=np.int64)]
+    return values.astype(str).str.strip()
+
+
+def _parse_rate(sample: pd.Series, fmt: str) -> float:
+    try:
+        return pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+    except ValueError:
+        pass
+    try:
+        # Mixed UTC offsets only parse onto a common (UTC) timezone
+        return pd.to_datetime(sample, format=fmt, errors="coerce", utc=True).notna().mean()
+    except ValueError:
+        return 0.0
+
+
+def detect_date_format(series: pd.Series) -> str | None:
+    """
+    Explicit date format for `series` (or NATIVE_DATETIME), or None when
+    fewer than DATE_MIN_HIT_RATE of the sampled values parse.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return NATIVE_DATETIME
+
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return None
+
+    sample = _sample_values(series)
+    if sample.empty:
+        return None
+
+    # Free text (names, codes without digits, long descriptions) is rejected cheaply
+    lengths = sample.str.len()
+    plausible = sample.str.contains(r"\d", regex=True) & lengths.between(6, 30)
+    if plausible.mean() < DATE_MIN_HIT_RATE:
+        return None
+
+    best, best_rate = None, 0.0
+    for fmt in DATE_FORMATS:
+        rate = _parse_rate(sample, fmt)
+        if rate > best_rate:
+            best, best_rate = fmt, rate
+        if rate == 1.0:
+            break
+
+    return best if best_rate >= DATE_MIN_HIT_RATE else None
+
+
+@timed("column_detection")
+def infer_date_columns(df: pd.DataFrame) -> dict:
+    """
+    {column: format} for every column that holds dates, in column order.
+    Cached per dataset fingerprint.
+    """
+    if df is None or df.empty:
+        return {}
+
+    return _detect_formats(df)
+
+
+@_formats
+def _detect_formats(df: pd.DataFrame) -> dict:
+    version = dataset_fingerprint(df)
+
+    formats = None
+    try:
+        formats = load_artifact(version, "date_formats")
+    except Exception:
+        formats = None
+
+    if formats is None:
+        formats = {}
+        for col in df.columns:
+            fmt = detect_date_format(df[col])
+            if fmt:
+                formats[str(col)] = fmt
+
+        if dataset_meta(version) is not None:
+            try:
+                save_artifact(version, "date_formats", formats)
+            except Exception:
+                pass
+
+    return formats
+
@@ -6,11 +6,17 @@
 import plotly.express as px
 import pandas as pd
 
+from utils.instrumentation import timed
+from utils.ranking import group_totals, top_n as top_members
+from utils.schema_normalizer import resolve_column
+
 
 # -------------------------------------------------
 # Line Chart
 # -------------------------------------------------
+@timed("render")
 def line_sales_trend(df, date_col, sales_col, title="Sales Trend"):
+    date_col, sales_col = resolve_column(df, date_col), resolve_column(df, sales_col)
     trend = (
         df
         .groupby(date_col)[sales_col]
@@ -37,6 +43,7 @@ def line_sales_trend(df, date_col, sales_col, title="Sales Trend"):
 # -------------------------------------------------
 # Bar Chart (TOP-N SAFE)
 # -------------------------------------------------
+@timed("render")
 def bar_top(
     df: pd.DataFrame,
     group_col: str,
@@ -54,6 +61,7 @@ def bar_top(
     if df.empty:
         return px.bar(title="No data available")
 
+    group_col, value_col = resolve_column(df, group_col), resolve_column(df, value_col)
     if group_col not in df.columns or value_col not in df.columns:
         return px.bar(title="Required columns missing")
 
@@ -65,15 +73,8 @@ def bar_top(
     if top_n <= 0:
         top_n = 10
 
-    # ---------- AGGREGATION ----------
-    agg = (
-        df
-        .groupby(group_col, dropna=True)[value_col]
-        .sum()
-        .sort_values(ascending=False)
-        .head(top_n)
-        .reset_index()
-    )
+    # ---------- AGGREGATION (cached totals, partial top-N selection) ----------
+    agg = top_members(group_totals(df, group_col, value_col), top_n).reset_index()
 
     if agg.empty:
         return px.bar(title="No aggregated data")
@@ -98,7 +99,9 @@ def bar_top(
 # -------------------------------------------------
 # Heatmap
 # -------------------------------------------------
+@timed("render")
 def heatmap(df, x_col, y_col, value_col, title="Heatmap"):
+    x_col, y_col, value_col = resolve_column(df, x_col), resolve_column(df, y_col), resolve_column(df, value_col)
     pivot_df = pd.pivot_table(
         df,
         index=y_col,
@@ -121,7 +124,9 @@ def heatmap(df, x_col, y_col, value_col, title="Heatmap"):
 # -------------------------------------------------
 # Scatter
 # -------------------------------------------------
+@timed("render")
 def scatter_price_qty(df, price_col, qty_col, title="Price vs Quantity"):
+    price_col, qty_col = resolve_column(df, price_col), resolve_column(df, qty_col)
     fig = px.scatter(
         df,
         x=price_col,
@@ -135,7 +140,9 @@ def scatter_price_qty(df, price_col, qty_col, title="Price vs Quantity"):
 # -------------------------------------------------
 # Pie
 # -------------------------------------------------
+@timed("render")
 def pie_chart(df, names_col, values_col, title="Share Distribution"):
+    names_col, values_col = resolve_column(df, names_col), resolve_column(df, values_col)
     fig = px.pie(
         df,
         names=names_col,
@@ -1,16 +1,118 @@
+# utils/warehouse_metrics.py
+# -------------------------------------------------
+# Warehouse KPI Rollups (served from engine.cube.order_cube)
+# -------------------------------------------------
+#
+#   throughput    Orders / Lines / Quantity per active day
+#   fill rate     delivered quantity / ordered quantity
+#   rejections    rejected orders / orders, revenue lost
+#
+# Any level of warehouse × day × SKU is a sum over the cube's additive
+# measures; order counts switch to the per-item counts whenever the item
+# (SKU) dimension is part of the rollup. Without a cube (no date or
+# order-state column) warehouse_kpis() falls back to a grouped sum.
+# -------------------------------------------------
+
+import numpy as np
 import pandas as pd
 
+from engine.cube import ORDER_CUBE_MEASURES, order_cube, run_starts
+from utils.column_detector import auto_detect_columns
+from utils.numeric_coercion import numeric_column
+
+
+def warehouse_rollup(cube: pd.DataFrame, levels: list, item_col: str | None = None) -> pd.DataFrame:
+    """
+    KPIs per combination of `levels` (cube columns, may include "Date"):
+    Sales, Quantity, Lines, Orders, Rejected_Orders, Rejected_Sales,
+    Active_Days, Orders_Per_Day, Lines_Per_Order, Avg_Order_Value,
+    Fill_Rate_% and Rejection_Rate_%.
+    """
+    if cube is None or cube.empty:
+        return pd.DataFrame()
+
+    measures = [m for m in ORDER_CUBE_MEASURES if m in cube.columns]
+    daily_levels = list(dict.fromkeys(levels + ["Date"]))
+
+    daily = cube.groupby(daily_levels, observed=True, sort=False)[measures].sum()
+
+    if "Date" in levels:
+        rollup = daily.assign(Active_Days=1)
+    else:
+        rollup = (
+            daily.reset_index()
+            .groupby(levels, observed=True, sort=False)
+            .agg(**{m: (m, "sum") for m in measures}, Active_Days=("Date", "size"))
+        )
+
+    if item_col and item_col in levels:
+        rollup["Orders"] = rollup["Orders_With_Item"]
+        rollup["Rejected_Orders"] = rollup["Rejected_Orders_With_Item"]
+    rollup = rollup.drop(columns=["Orders_With_Item", "Rejected_Orders_With_Item"], errors="ignore")
+
+    orders = rollup["Orders"].to_numpy(dtype=np.float64)
+    quantity = rollup["Quantity"].to_numpy(dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rollup["Orders_Per_Day"] = orders / rollup["Active_Days"].to_numpy()
+        rollup["Lines_Per_Order"] = np.where(orders > 0, rollup["Lines"] / orders, np.nan)
+        rollup["Avg_Order_Value"] = np.where(orders > 0, rollup["Sales"] / orders, np.nan)
+        rollup["Fill_Rate_%"] = np.where(quantity > 0, rollup["Delivered_Quantity"] / quantity * 100, np.nan)
+        rollup["Rejection_Rate_%"] = np.where(orders > 0, rollup["Rejected_Orders"] / orders * 100, 0.0)
+
+    rollup = rollup.reset_index()
+    if "Date" in levels:
+        return rollup.sort_values(levels, ignore_index=True)
+    return rollup.sort_values("Sales", ascending=False, ignore_index=True)
+
+
+def _grouped_kpis(df, warehouse_col, sales_col, qty_col, order_col=None):
+    """
+    Direct aggregation: sums plus distinct orders (lines without an
+    order id). Distinct (warehouse, order) pairs come from one lexsort
+    over factorized codes, as in the cube – no per-group nunique.
+    """
+    frame = pd.DataFrame({
+        warehouse_col: df[warehouse_col],
+        "Total_Sales": numeric_column(df, sales_col),
+        "Total_Quantity": numeric_column(df, qty_col) if qty_col in df.columns else 0.0,
+    })
+    grouped = frame.groupby(warehouse_col, observed=True, sort=False)
+    table = grouped[["Total_Sales", "Total_Quantity"]].sum()
+
+    if order_col and order_col in df.columns:
+        house, houses = pd.factorize(df[warehouse_col])
+        order, _ = pd.factorize(df[order_col])
+        keep = (house >= 0) & (order >= 0)
+        house, order = house[keep], order[keep]
+
+        sort = np.lexsort((order, house))
+        house, order = house[sort], order[sort]
+        first = run_starts([house, order])
+        table["Orders"] = pd.Series(np.bincount(house[first], minlength=len(houses)), index=houses)
+    else:
+        table["Orders"] = grouped.size()
+
+    return table.reset_index().sort_values("Total_Sales", ascending=False, ignore_index=True)
+
 
 def warehouse_kpis(df, warehouse_col, sales_col, qty_col):
+    """
+    Per-warehouse Total_Sales, Total_Quantity, distinct Orders and KPIs.
+    Without a date or order-state column (no cube) only the sums and
+    distinct order counts are returned.
+    """
     if df is None or df.empty:
         return pd.DataFrame()
 
+    cols = {**auto_detect_columns(df), "warehouse": warehouse_col, "sales": sales_col, "quantity": qty_col}
+    cube = order_cube(df, cols)
+
+    if cube.empty:
+        return _grouped_kpis(df, warehouse_col, sales_col, qty_col, cols.get("order_id")).fillna(0)
+
     return (
-        df.groupby(warehouse_col, as_index=False)
-        .agg(
-            Total_Sales=(sales_col, "sum"),
-            Total_Quantity=(qty_col, "sum"),
-            Orders=(sales_col, "count")
-        )
+        warehouse_rollup(cube, [warehouse_col])
+        .rename(columns={"Sales": "Total_Sales", "Quantity": "Total_Quantity"})
         .fillna(0)
     )